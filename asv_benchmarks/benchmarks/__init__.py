@@ -0,0 +1 @@
+"""Benchmark suite for scikit-cycling using ASV."""
@@ -0,0 +1,56 @@
+"""Benchmarks of the extraction of information from activities."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+from skcycling.datasets import make_activity
+from skcycling.extraction import activity_fatigue_profile
+from skcycling.extraction import activity_max_mean
+from skcycling.extraction import activity_power_profile
+from skcycling.extraction import detect_efforts
+
+
+class ActivityPowerProfile(object):
+    """Benchmark the power-profile of rides from 1 to 12 hours."""
+
+    param_names = ['duration']
+    params = [[1, 3, 6, 12]]
+    # the longest rides are slow to process, a single measure is enough
+    number = 1
+    repeat = 1
+    timeout = 3600
+
+    def setup(self, duration):
+        self.activity = make_activity('{}H'.format(duration), random_state=0)
+
+    def time_activity_power_profile(self, duration):
+        activity_power_profile(self.activity)
+
+    def peakmem_activity_power_profile(self, duration):
+        activity_power_profile(self.activity)
+
+    def time_activity_max_mean(self, duration):
+        activity_max_mean(self.activity)
+
+    def peakmem_activity_max_mean(self, duration):
+        activity_max_mean(self.activity)
+
+    def time_activity_fatigue_profile(self, duration):
+        activity_fatigue_profile(self.activity)
+
+    def peakmem_activity_fatigue_profile(self, duration):
+        activity_fatigue_profile(self.activity)
+
+
+class DetectEfforts(object):
+    """Benchmark the detection of the efforts of rides from 1 to 12 hours."""
+
+    param_names = ['duration', 'method']
+    params = [[1, 3, 6, 12], ['pelt', 'hysteresis']]
+
+    def setup(self, duration, method):
+        self.activity = make_activity('{}H'.format(duration), random_state=0)
+
+    def time_detect_efforts(self, duration, method):
+        detect_efforts(self.activity, mpa=400, method=method)
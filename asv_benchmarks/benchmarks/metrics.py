@@ -0,0 +1,100 @@
+"""Benchmarks of the metrics."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import numpy as np
+import pandas as pd
+
+from skcycling import Rider
+from skcycling.datasets import load_rider
+from skcycling.datasets import make_activity
+from skcycling.metrics import aerobic_meta_model
+from skcycling.metrics import critical_power_model
+from skcycling.metrics import intensity_factor_score
+from skcycling.metrics import normalized_power_score
+from skcycling.metrics import training_load_score
+from skcycling.metrics import training_stress_score
+from skcycling.metrics import w_prime_balance
+
+
+class ActivityMetrics(object):
+    """Benchmark the metrics computed on an activity."""
+
+    param_names = ['duration']
+    params = [[1, 6, 12]]
+
+    def setup(self, duration):
+        activity = make_activity('{}H'.format(duration), random_state=0)
+        self.activity_power = activity['power']
+        self.mpa = 400
+
+    def time_normalized_power_score(self, duration):
+        normalized_power_score(self.activity_power, self.mpa)
+
+    def peakmem_normalized_power_score(self, duration):
+        normalized_power_score(self.activity_power, self.mpa)
+
+    def time_intensity_factor_score(self, duration):
+        intensity_factor_score(self.activity_power, self.mpa)
+
+    def time_training_stress_score(self, duration):
+        training_stress_score(self.activity_power, self.mpa)
+
+    def time_training_load_score(self, duration):
+        training_load_score(self.activity_power, self.mpa)
+
+
+class WPrimeBalance(object):
+    """Benchmark the W' balance of an activity for several riders."""
+
+    param_names = ['duration', 'method', 'n_riders']
+    params = [[1, 6, 12], ['integral', 'differential'], [1, 100]]
+
+    def setup(self, duration, method, n_riders):
+        activity = make_activity('{}H'.format(duration), random_state=0)
+        self.activity_power = activity['power']
+        self.cp = np.linspace(200, 300, n_riders)
+
+    def time_w_prime_balance(self, duration, method, n_riders):
+        w_prime_balance(self.activity_power, self.cp, 20000, method=method)
+
+    def peakmem_w_prime_balance(self, duration, method, n_riders):
+        w_prime_balance(self.activity_power, self.cp, 20000, method=method)
+
+
+class AerobicMetaModel(object):
+    """Benchmark the aerobic model from the record power-profile."""
+
+    def setup(self):
+        rider = Rider.from_csv(load_rider())
+        self.record_power_profile = rider.record_power_profile()['power']
+
+    def time_aerobic_meta_model(self):
+        aerobic_meta_model(self.record_power_profile)
+
+    def peakmem_aerobic_meta_model(self):
+        aerobic_meta_model(self.record_power_profile)
+
+
+class CriticalPowerModel(object):
+    """Benchmark the critical power models fitted to many profiles."""
+
+    param_names = ['model', 'n_profiles']
+    params = [['2-parameter', '3-parameter', 'ward-smith'], [1, 100]]
+
+    def setup(self, model, n_profiles):
+        rider = Rider.from_csv(load_rider())
+        record_power = rider.record_power_profile()['power']
+        rng = np.random.RandomState(0)
+        noise = rng.normal(scale=5., size=(record_power.size, n_profiles))
+        self.record_power = pd.DataFrame(
+            record_power.values[:, np.newaxis] + noise,
+            index=record_power.index)
+
+    def time_critical_power_model(self, model, n_profiles):
+        critical_power_model(self.record_power, model)
+
+    def peakmem_critical_power_model(self, model, n_profiles):
+        critical_power_model(self.record_power, model)
@@ -0,0 +1,26 @@
+"""Benchmarks of the models."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+from skcycling.datasets import make_activity
+from skcycling.model import strava_power_model
+
+
+class StravaPowerModel(object):
+    """Benchmark the power estimated by the Strava model."""
+
+    param_names = ['duration', 'use_acceleration']
+    params = [[1, 6, 12], [False, True]]
+
+    def setup(self, duration, use_acceleration):
+        self.activity = make_activity('{}H'.format(duration), random_state=0)
+
+    def time_strava_power_model(self, duration, use_acceleration):
+        strava_power_model(self.activity, cyclist_weight=72,
+                           use_acceleration=use_acceleration)
+
+    def peakmem_strava_power_model(self, duration, use_acceleration):
+        strava_power_model(self.activity, cyclist_weight=72,
+                           use_acceleration=use_acceleration)
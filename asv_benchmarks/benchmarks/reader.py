@@ -0,0 +1,31 @@
+"""Benchmarks of the readers of the activity files."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+from skcycling.datasets import load_fit
+from skcycling.io import bikeread
+from skcycling.io.fit import load_power_from_fit
+
+
+class FitReader(object):
+    """Benchmark the reading of the FIT files of the datasets."""
+
+    param_names = ['file_idx']
+    params = [[0, 1, 2]]
+
+    def setup(self, file_idx):
+        self.filename = load_fit()[file_idx]
+
+    def time_load_power_from_fit(self, file_idx):
+        load_power_from_fit(self.filename)
+
+    def peakmem_load_power_from_fit(self, file_idx):
+        load_power_from_fit(self.filename)
+
+    def time_bikeread(self, file_idx):
+        bikeread(self.filename)
+
+    def peakmem_bikeread(self, file_idx):
+        bikeread(self.filename)
@@ -0,0 +1,114 @@
+"""Benchmarks of the management of the activities of a rider."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import os
+import shutil
+import tempfile
+
+from skcycling import Rider
+from skcycling.datasets import load_rider
+from skcycling.datasets import make_fit_archive
+from skcycling.datasets import make_rider
+
+N_ACTIVITIES = [10, 100, 1000]
+DTYPES = ['float64', 'float32']
+
+
+class RiderAddActivities(object):
+    """Benchmark the addition of an archive of 10 min activities."""
+
+    param_names = ['n_files']
+    params = [N_ACTIVITIES]
+    number = 1
+    repeat = 1
+    timeout = 3600
+
+    def setup(self, n_files):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filenames = make_fit_archive(self.tmp_dir, n_activities=n_files,
+                                          duration='10min', random_state=0)
+
+    def teardown(self, n_files):
+        shutil.rmtree(self.tmp_dir)
+
+    def time_add_activities(self, n_files):
+        Rider().add_activities(self.filenames)
+
+    def peakmem_add_activities(self, n_files):
+        Rider().add_activities(self.filenames)
+
+
+class RiderPowerProfile(object):
+    """Benchmark the queries and the edition of the rider power-profile."""
+
+    # delete_activities modifies the rider: it is loaded before each measure
+    number = 1
+
+    def setup(self):
+        self.rider = Rider.from_csv(load_rider())
+
+    def time_record_power_profile(self):
+        self.rider.record_power_profile()
+
+    def peakmem_record_power_profile(self):
+        self.rider.record_power_profile()
+
+    def time_record_power_profile_range(self):
+        self.rider.record_power_profile(range_dates=('07 May 2014',
+                                                     '11 May 2014'),
+                                        columns=['power'])
+
+    def time_delete_activities(self):
+        self.rider.delete_activities('07 May 2014')
+
+    def time_delete_activities_range(self):
+        self.rider.delete_activities(('07 May 2014', '11 May 2014'))
+
+
+class RiderLargeArchive(object):
+    """Benchmark the queries on riders with many activities."""
+
+    param_names = ['n_activities', 'dtype']
+    params = [N_ACTIVITIES, DTYPES]
+    timeout = 3600
+
+    def setup_cache(self):
+        return {(n_activities, dtype): make_rider(n_activities=n_activities,
+                                                  duration='10min',
+                                                  random_state=0, dtype=dtype)
+                for n_activities in N_ACTIVITIES
+                for dtype in DTYPES}
+
+    def time_record_power_profile(self, riders, n_activities, dtype):
+        riders[n_activities, dtype].record_power_profile()
+
+    def peakmem_record_power_profile(self, riders, n_activities, dtype):
+        riders[n_activities, dtype].record_power_profile()
+
+    def mem_power_profile(self, riders, n_activities, dtype):
+        return riders[n_activities, dtype].power_profile_
+
+
+class RiderIO(object):
+    """Benchmark the dump and load of a rider."""
+
+    def setup(self):
+        self.rider = Rider.from_csv(load_rider())
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, 'rider.csv')
+        self.rider.to_csv(self.filename)
+
+    def teardown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def time_to_csv(self):
+        self.rider.to_csv(self.filename)
+
+    def time_from_csv(self):
+        Rider.from_csv(self.filename)
+
+    def peakmem_from_csv(self):
+        Rider.from_csv(self.filename)
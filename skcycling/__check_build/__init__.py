@@ -4,6 +4,7 @@ compile package properly,
 This code was adapted from scikit-learn's check_build utility.
 """
 import os
+import warnings
 
 PACKAGE_NAME = 'skcycling'
 
@@ -27,12 +28,14 @@ It seems that the {package} has not been built correctly.
 If you have installed {package} from source, please do not forget
 to build the package before using it: run `python setup.py install`
 in the source directory.
-{msg}"""
+{msg}
+The pure NumPy implementation of the kernels will be used instead."""
 
 
 def raise_build_error(e):
-    # Raise a comprehensible error and list the contents of the
-    # directory to help debugging on the mailing list.
+    # Warn with a comprehensible message and list the contents of the
+    # directory to help debugging on the mailing list. The package can still
+    # be used with the NumPy kernels.
     local_dir = os.path.split(__file__)[0]
     msg = STANDARD_MSG
     if local_dir == "megaman/__check_build":
@@ -46,11 +49,11 @@ def raise_build_error(e):
         else:
             dir_content.append(filename + '\n')
     contents = ''.join(dir_content).strip()
-    raise ImportError(ERROR_TEMPLATE.format(error=e,
-                                            local_dir=local_dir,
-                                            contents=contents,
-                                            package=PACKAGE_NAME,
-                                            msg=msg))
+    warnings.warn(ERROR_TEMPLATE.format(error=e,
+                                        local_dir=local_dir,
+                                        contents=contents,
+                                        package=PACKAGE_NAME,
+                                        msg=msg), RuntimeWarning)
 
 
 try:
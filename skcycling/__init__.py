@@ -18,4 +18,28 @@ utils
 from ._version import __version__
 
 from . import __check_build
-from .base import Rider
+from ._lazy import attach
+
+__all__ = ['Rider',
+           'datasets',
+           'extraction',
+           'io',
+           'metrics',
+           'model',
+           'utils',
+           'get_backend',
+           'get_num_threads',
+           'openmp_info',
+           'set_backend',
+           'set_num_threads',
+           '__version__']
+
+# the submodules and the Rider are imported on first use such that importing
+# skcycling does not import the heavy dependencies
+__getattr__, __dir__ = attach(
+    __name__,
+    submodules=['datasets', 'extraction', 'io', 'metrics', 'model', 'utils'],
+    submod_attrs={'base': ['Rider'],
+                  '_config': ['get_backend', 'get_num_threads',
+                              'openmp_info', 'set_backend',
+                              'set_num_threads']})
@@ -0,0 +1,237 @@
+"""Global configuration of scikit-cycling."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import importlib
+import multiprocessing
+from numbers import Integral
+
+try:
+    from ._openmp_helpers import _openmp_enabled
+    from ._openmp_helpers import _openmp_max_threads
+except ImportError:
+    # the package was not compiled: the NumPy kernels are used
+    def _openmp_enabled():
+        return False
+
+    def _openmp_max_threads():
+        return 1
+
+BACKENDS = ('auto', 'cython', 'numpy')
+
+_global_config = {'num_threads': None, 'backend': 'auto'}
+
+# whether the compiled kernels are available, checked on first use
+_CYTHON_AVAILABLE = [None]
+
+# the compiled modules imported by _get_kernels, None when they could not be
+# imported
+_CYTHON_MODULES = {}
+
+
+def _check_num_threads(num_threads):
+    if num_threads is not None and (not isinstance(num_threads, Integral) or
+                                    num_threads < 1):
+        raise ValueError('"num_threads" should be a positive integer or'
+                         ' None. Got {!r} instead.'.format(num_threads))
+    return num_threads
+
+
+def _in_worker_process():
+    """Whether the code runs in a worker of a process pool."""
+    return multiprocessing.current_process().name != 'MainProcess'
+
+
+def _effective_num_threads(num_threads=None):
+    """Resolve the number of threads used by the compiled kernels.
+
+    The number given to a function takes precedence over the one given to
+    :func:`set_num_threads`. When none of them is set, the OpenMP default is
+    used, except in the worker processes of a process pool (e.g. joblib or
+    multiprocessing) where a single thread is used to not oversubscribe the
+    cores.
+    """
+    num_threads = _check_num_threads(num_threads)
+    if num_threads is None:
+        num_threads = _global_config['num_threads']
+    if num_threads is None:
+        if _in_worker_process():
+            return 1
+        return _openmp_max_threads()
+    return num_threads
+
+
+def set_num_threads(num_threads=None):
+    """Set the number of threads used by the compiled kernels.
+
+    The kernels computing the power-profile and the sliding maximum of the
+    :class:`Rider` are parallelized with OpenMP. The number of threads can
+    also be given to each function with a ``num_threads`` argument, which
+    takes precedence over this setting.
+
+    Read more in the :ref:`User Guide <num_threads>`.
+
+    Parameters
+    ----------
+    num_threads : int or None, default=None
+        The number of threads. If None, the number of threads given by OpenMP
+        (i.e. the ``OMP_NUM_THREADS`` environment variable or the number of
+        cores) is used, except in the worker processes of a process pool where
+        a single thread is used.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> import skcycling
+    >>> skcycling.set_num_threads(2)
+    >>> skcycling.get_num_threads()
+    2
+    >>> skcycling.set_num_threads(None)
+
+    """
+    _global_config['num_threads'] = _check_num_threads(num_threads)
+
+
+def get_num_threads():
+    """Get the number of threads used by the compiled kernels.
+
+    Read more in the :ref:`User Guide <num_threads>`.
+
+    Returns
+    -------
+    num_threads : int
+        The number of threads used when no ``num_threads`` is given to a
+        function.
+
+    """
+    return _effective_num_threads()
+
+
+def _cython_available():
+    """Whether the compiled kernels can be imported."""
+    try:
+        from .extraction import _power_profile  # noqa
+    except ImportError:
+        return False
+    return True
+
+
+def set_backend(backend='auto'):
+    """Set the implementation of the kernels computing the power-profile.
+
+    The kernels are compiled with Cython. A NumPy implementation, giving the
+    same results, is used when the compiled extension is not available (e.g.
+    the package could not be built) or when it is requested.
+
+    Read more in the :ref:`User Guide <num_threads>`.
+
+    Parameters
+    ----------
+    backend : str, {'auto', 'cython', 'numpy'}, default='auto'
+        The implementation of the kernels. ``'auto'`` uses the compiled
+        kernels when they are available and the NumPy kernels otherwise.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> import skcycling
+    >>> skcycling.set_backend('numpy')
+    >>> skcycling.get_backend()
+    'numpy'
+    >>> skcycling.set_backend('auto')
+
+    """
+    if backend not in BACKENDS:
+        raise ValueError('"backend" should be one of {}. Got {!r} instead.'
+                         .format(BACKENDS, backend))
+    if backend == 'cython' and not _cython_available():
+        raise ImportError('The compiled kernels are not available. Build the'
+                          ' package or use the "numpy" backend.')
+    _global_config['backend'] = backend
+
+
+def get_backend():
+    """Get the implementation of the kernels computing the power-profile.
+
+    Read more in the :ref:`User Guide <num_threads>`.
+
+    Returns
+    -------
+    backend : str, {'cython', 'numpy'}
+        The implementation currently used.
+
+    """
+    backend = _global_config['backend']
+    if backend == 'auto':
+        # the availability of the extension does not change: it is checked
+        # once to not try to import it at each call
+        if _CYTHON_AVAILABLE[0] is None:
+            _CYTHON_AVAILABLE[0] = _cython_available()
+        return 'cython' if _CYTHON_AVAILABLE[0] else 'numpy'
+    return backend
+
+
+def _get_kernels(module='extraction._power_profile'):
+    """Get the module implementing the kernels of the current backend.
+
+    The NumPy implementation of the compiled module ``module`` is the module
+    of the same name with the suffix ``_numpy``. The availability of each
+    compiled module is checked on first use: with the ``'auto'`` backend, an
+    extension which could not be built falls back to its NumPy
+    implementation while the other extensions are still used.
+    """
+    if get_backend() == 'cython':
+        if module not in _CYTHON_MODULES:
+            try:
+                _CYTHON_MODULES[module] = importlib.import_module(
+                    '.' + module, package=__package__)
+            except ImportError:
+                _CYTHON_MODULES[module] = None
+        kernels = _CYTHON_MODULES[module]
+        if kernels is not None:
+            return kernels
+        if _global_config['backend'] == 'cython':
+            raise ImportError('The compiled module {!r} is not available.'
+                              ' Build the package or use the "numpy"'
+                              ' backend.'.format(module))
+    return importlib.import_module('.' + module + '_numpy',
+                                   package=__package__)
+
+
+def openmp_info():
+    """Report how the compiled kernels are parallelized.
+
+    Read more in the :ref:`User Guide <num_threads>`.
+
+    Returns
+    -------
+    info : dict
+        A dictionary containing the implementation of the kernels
+        (``'backend'``, see :func:`get_backend`), whether the extensions were
+        compiled with OpenMP (``'openmp_enabled'``), the default number of
+        threads of OpenMP (``'openmp_max_threads'``), the number of threads
+        set with :func:`set_num_threads` (``'num_threads_set'``), and the
+        number of threads currently used by the kernels (``'num_threads'``).
+
+    Examples
+    --------
+    >>> import skcycling
+    >>> info = skcycling.openmp_info()
+    >>> sorted(info)  # doctest: +NORMALIZE_WHITESPACE
+    ['backend', 'num_threads', 'num_threads_set', 'openmp_enabled',
+     'openmp_max_threads']
+
+    """
+    return {'backend': get_backend(),
+            'openmp_enabled': bool(_openmp_enabled()),
+            'openmp_max_threads': _openmp_max_threads(),
+            'num_threads_set': _global_config['num_threads'],
+            'num_threads': get_num_threads()}
@@ -0,0 +1,98 @@
+"""Lazy loading of the submodules and of the attributes of a package."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import importlib
+import sys
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Module type resolving the missing attributes with ``__getattr__``.
+
+    Python < 3.7 does not call the ``__getattr__`` and ``__dir__`` functions
+    defined in a module (PEP 562). The class of the package is replaced by
+    this one to emulate it.
+    """
+
+    def __getattr__(self, name):
+        try:
+            module_getattr = self.__dict__['__getattr__']
+        except KeyError:
+            raise AttributeError('module {!r} has no attribute {!r}'
+                                 .format(self.__name__, name))
+        return module_getattr(name)
+
+    def __dir__(self):
+        return self.__dict__['__dir__']()
+
+
+def attach(package_name, submodules=(), submod_attrs=None):
+    """Load the submodules and the attributes of a package on first use.
+
+    The returned functions should be assigned to ``__getattr__`` and
+    ``__dir__`` in the package ``__init__``::
+
+        __getattr__, __dir__ = attach(
+            __name__, submodules=['power'],
+            submod_attrs={'power': ['strava_power_model']})
+
+    Parameters
+    ----------
+    package_name : str
+        The name of the package, i.e. ``__name__``.
+
+    submodules : list of str, default=()
+        The submodules imported when they are accessed as an attribute of the
+        package.
+
+    submod_attrs : dict or None, default=None
+        For each submodule, the list of attributes which are exposed by the
+        package and imported from the submodule on first access.
+
+    Returns
+    -------
+    __getattr__ : callable
+        The function resolving the lazy attributes.
+
+    __dir__ : callable
+        The function listing the attributes of the package, including the
+        attributes which are not loaded yet.
+
+    """
+    submodules = set(submodules)
+    submod_attrs = submod_attrs or {}
+    attr_to_submodule = {attr: submodule
+                         for submodule, attrs in submod_attrs.items()
+                         for attr in attrs}
+    lazy_names = submodules.union(attr_to_submodule)
+
+    def __getattr__(name):
+        if name in submodules:
+            return importlib.import_module(
+                '{}.{}'.format(package_name, name))
+        elif name in attr_to_submodule:
+            submodule = importlib.import_module(
+                '{}.{}'.format(package_name, attr_to_submodule[name]))
+            attr = getattr(submodule, name)
+            # bind the attribute such that it is directly found next time
+            setattr(sys.modules[package_name], name, attr)
+            return attr
+        raise AttributeError('module {!r} has no attribute {!r}'
+                             .format(package_name, name))
+
+    def __dir__():
+        return sorted(lazy_names.union(vars(sys.modules[package_name])))
+
+    if sys.version_info < (3, 7):
+        package = sys.modules[package_name]
+        try:
+            package.__class__ = _LazyModule
+        except TypeError:
+            # the class of a module cannot be changed with Python 2: the
+            # attributes are imported eagerly
+            for name in lazy_names:
+                setattr(package, name, __getattr__(name))
+    return __getattr__, __dir__
@@ -0,0 +1,31 @@
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+cimport openmp
+
+cdef extern from *:
+    """
+    #ifdef _OPENMP
+    #define SKCYCLING_OPENMP_ENABLED 1
+    #else
+    #define SKCYCLING_OPENMP_ENABLED 0
+    #endif
+    """
+    bint SKCYCLING_OPENMP_ENABLED
+
+
+cpdef bint _openmp_enabled():
+    """Whether the extensions were compiled with OpenMP support."""
+    return SKCYCLING_OPENMP_ENABLED
+
+
+cpdef int _openmp_max_threads():
+    """The number of threads used by default by OpenMP.
+
+    It is given by the ``OMP_NUM_THREADS`` environment variable or by the
+    number of cores. It is 1 when OpenMP is not available.
+    """
+    if SKCYCLING_OPENMP_ENABLED:
+        return openmp.omp_get_max_threads()
+    return 1
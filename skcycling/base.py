@@ -7,9 +7,116 @@
 import numpy as np
 import pandas as pd
 
+from ._config import _effective_num_threads
+from ._config import _get_kernels
+from .extraction import activity_distance_profile
+from .extraction import activity_fatigue_profile
 from .extraction import activity_power_profile
+from .extraction.power_profile import _as_floating
 from .io import bikeread
+from .metrics import intensity_factor_score
+from .metrics import normalized_power_score
+from .metrics import training_load_score
+from .metrics import training_stress_score
+from .metrics.power_profile import SAMPLING_WKO
+from .metrics.power_profile import _aerobic_meta_model_batch
 from .utils import validate_filenames
+from .utils.validation import check_dtype
+from .utils.instrumentation import _stage
+
+ACTIVITY_METRICS = ('duration', 'work', 'normalized-power',
+                    'intensity-factor', 'training-stress-score',
+                    'training-load-score')
+
+TRAINING_LOAD_METRICS = ('training-stress-score', 'training-load-score')
+
+
+def _sort_activities(power_profile):
+    """Sort the activities of a power-profile in chronological order."""
+    dates = power_profile.columns.values.astype('datetime64[ns]')
+    order = np.argsort(dates, kind='mergesort')
+    return power_profile.iloc[:, order], dates[order]
+
+
+def _rolling_window_ends(dates, step):
+    """Compute the labels and the (excluded) ends of rolling periods."""
+    if step is None:
+        labels = pd.DatetimeIndex(dates)
+        return labels, labels + pd.Timedelta(1, unit='ns')
+    labels = pd.date_range(pd.Timestamp(dates[0]).normalize(),
+                           pd.Timestamp(dates[-1]).normalize(),
+                           freq=step)
+    return labels, labels + pd.Timedelta(days=1)
+
+
+def _take_argmax(data, argmax):
+    """Gather the values of each row of data given the column indices."""
+    return np.where(argmax >= 0,
+                    data[np.arange(data.shape[0]), argmax],
+                    np.nan)
+
+
+def _activity_metrics(activity, mpa=None):
+    """Compute the summary metrics of an activity.
+
+    The metrics requiring the maximum power aerobic are set to NaN when
+    ``mpa`` is None.
+    """
+    activity_power = activity['power']
+    metrics = {'duration': (activity.index[-1] - activity.index[0] +
+                            pd.Timedelta(seconds=1)).total_seconds(),
+               'work': activity_power.sum() / 1000}
+    if mpa is not None:
+        metrics.update({
+            'normalized-power': normalized_power_score(activity_power, mpa),
+            'intensity-factor': intensity_factor_score(activity_power, mpa),
+            'training-stress-score': training_stress_score(activity_power,
+                                                           mpa),
+            'training-load-score': training_load_score(activity_power, mpa)})
+    return pd.Series(metrics, index=ACTIVITY_METRICS,
+                     name=pd.Timestamp(activity.index[0]))
+
+
+def _read_activity(filename, mpa, compute_metrics, num_threads,
+                   dtype=np.float64, compute_distance_profile=False,
+                   compute_fatigue_profile=False):
+    """Read an activity and compute its power-profile, its metrics, its
+    distance-profile, and its fatigue profile."""
+    activity = bikeread(filename, dtype=dtype)
+    power_profile = activity_power_profile(activity, num_threads=num_threads,
+                                           dtype=dtype)
+    metrics, distance_profile, fatigue_profile = None, None, None
+    if compute_metrics:
+        with _stage('rider.activity_metrics') as stage:
+            metrics = _activity_metrics(activity, mpa)
+            stage.record(metrics)
+    if compute_distance_profile:
+        distance_profile = activity_distance_profile(activity)
+    if compute_fatigue_profile:
+        # stored as the power-profile: the work thresholds are the first level
+        # of the index and the activity is the name
+        fatigue_profile = activity_fatigue_profile(
+            activity, num_threads=num_threads).unstack().rename(
+                power_profile.name)
+    return power_profile, metrics, distance_profile, fatigue_profile
+
+
+def _mask_dates(dates, range_dates):
+    """Select the dates within a range, the last day being included."""
+    if range_dates is None:
+        return np.ones_like(dates, dtype=bool)
+    return np.bitwise_and(
+        dates >= range_dates[0],
+        dates <= pd.Timestamp(range_dates[1]) + pd.DateOffset(1))
+
+
+def _exponentially_weighted_load(load, period, initial=0.):
+    """Solve ``y[t] = y[t - 1] + (load[t] - y[t - 1]) / period`` at once."""
+    # imported here to not import scipy.signal with skcycling
+    from scipy.signal import lfilter
+    alpha = 1. / period
+    return lfilter([alpha], [1., alpha - 1.], load,
+                   zi=[(1. - alpha) * initial])[0]
 
 
 class Rider(object):
@@ -22,7 +129,25 @@ class Rider(object):
     Parameters
     ----------
     n_jobs : int, (default=1)
-        The number of workers to use for the different processing.
+        The number of processes used to read the activities in
+        :meth:`add_activities`. The compiled kernels use a single thread in
+        these processes, unless ``num_threads`` is given.
+
+    mpa : float or None, (default=None)
+        Maximum power aerobic of the rider used to compute the metrics of the
+        activities (e.g. training load) when they are added. If None, these
+        metrics are not computed.
+
+    num_threads : int or None, (default=None)
+        The number of OpenMP threads used by the compiled kernels. By default,
+        the number of threads set with :func:`skcycling.set_num_threads` is
+        used.
+
+    dtype : {np.float32, np.float64}, (default=np.float64)
+        The dtype in which the activities are read and the power-profile is
+        stored. ``np.float32`` halves the memory of the rider; the means are
+        still accumulated in double precision such that the power-profile
+        only differs by a relative error of about ``1e-7``.
 
     Attributes
     ----------
@@ -30,13 +155,48 @@ class Rider(object):
         DataFrame containing all information regarding the power-profile of a
         rider for each ride.
 
+    activity_metrics_ : DataFrame or None
+        DataFrame containing the summary metrics of each ride: the duration
+        (in seconds), the work (in kJ), the normalized power, the intensity
+        factor, the training stress score, and the training load score. The
+        metrics depending on the maximum power aerobic are NaN when ``mpa``
+        was not given when adding the ride. Computed when the rides are added
+        with ``compute_metrics=True``.
+
+    distance_profile_ : DataFrame or None
+        DataFrame containing the best time over every 100 meters for each
+        ride (see :func:`skcycling.extraction.activity_distance_profile`),
+        computed when the rides are added with
+        ``compute_distance_profile=True``. It is stored and loaded with the
+        parameter ``filename_distance_profile`` of :meth:`Rider.to_csv` and
+        :meth:`Rider.from_csv`.
+
+    fatigue_profile_ : DataFrame or None
+        DataFrame containing the maximum mean power after every 500 kJ of work
+        for each ride (see
+        :func:`skcycling.extraction.activity_fatigue_profile`), indexed by the
+        work threshold and the duration, computed when the rides are added
+        with ``compute_fatigue_profile=True``. It is stored and loaded with
+        the parameter ``filename_fatigue_profile`` of :meth:`Rider.to_csv`
+        and :meth:`Rider.from_csv`.
+
     """
 
-    def __init__(self, n_jobs=1):
+    def __init__(self, n_jobs=1, mpa=None, num_threads=None,
+                 dtype=np.float64):
         self.n_jobs = n_jobs
+        self.mpa = mpa
+        self.num_threads = num_threads
+        self.dtype = dtype
         self.power_profile_ = None
-
-    def add_activities(self, filenames):
+        self.activity_metrics_ = None
+        self.distance_profile_ = None
+        self.fatigue_profile_ = None
+        self._pmc_cache = {}
+
+    def add_activities(self, filenames, compute_metrics=False,
+                       compute_distance_profile=False,
+                       compute_fatigue_profile=False):
         """Compute the power-profile for each activity and add it to the
         current power-profile.
 
@@ -46,6 +206,20 @@ class Rider(object):
             A string a list of string to the file to read. You can use
             wildcards to automatically check several files.
 
+        compute_metrics : bool, default=False
+            Whether to compute the summary metrics of each activity, stored
+            in ``activity_metrics_``, while the activity is loaded. They are
+            required by :meth:`Rider.performance_management_chart`.
+
+        compute_distance_profile : bool, default=False
+            Whether to compute the best time over distances of each activity,
+            stored in ``distance_profile_``, while the activity is loaded.
+
+        compute_fatigue_profile : bool, default=False
+            Whether to compute the maximum mean power after some work of each
+            activity, stored in ``fatigue_profile_``, while the activity is
+            loaded.
+
         Returns
         -------
         None
@@ -66,14 +240,48 @@ class Rider(object):
 
         """
         filenames = validate_filenames(filenames)
-        activities_pp = [activity_power_profile(bikeread(f))
-                         for f in filenames]
-        activities_pp = pd.concat(activities_pp, axis=1)
+        dtype = check_dtype(self.dtype)
+        if self.n_jobs == 1:
+            activities_data = [
+                _read_activity(f, self.mpa, compute_metrics, self.num_threads,
+                               dtype, compute_distance_profile,
+                               compute_fatigue_profile)
+                for f in filenames]
+        else:
+            # imported here to not import joblib with skcycling
+            from joblib import Parallel, delayed
+            activities_data = Parallel(n_jobs=self.n_jobs)(
+                delayed(_read_activity)(f, self.mpa, compute_metrics,
+                                        self.num_threads, dtype,
+                                        compute_distance_profile,
+                                        compute_fatigue_profile)
+                for f in filenames)
+        activities_pp, activities_metrics, activities_dp, activities_fp = zip(
+            *activities_data)
+        activities_metrics = ([] if not compute_metrics
+                              else list(activities_metrics))
+        activities_dp = ([] if not compute_distance_profile
+                         else list(activities_dp))
+        activities_fp = ([] if not compute_fatigue_profile
+                         else list(activities_fp))
+        self._add_activities_data(list(activities_pp), activities_metrics,
+                                  activities_dp, activities_fp)
+
+    def _add_activities_data(self, activities_pp, activities_metrics,
+                             activities_dp=None, activities_fp=None):
+        """Store the power-profile, the metrics, the distance-profile, and the
+        fatigue profile of new activities."""
+        with _stage('rider.concat') as stage:
+            activities_pp = pd.concat(activities_pp, axis=1).astype(
+                check_dtype(self.dtype), copy=False)
+            stage.record(activities_pp)
 
         if self.power_profile_ is not None:
             try:
-                self.power_profile_ = self.power_profile_.join(activities_pp,
-                                                               how='outer')
+                with _stage('rider.join') as stage:
+                    self.power_profile_ = self.power_profile_.join(
+                        activities_pp, how='outer')
+                    stage.record(self.power_profile_)
             except ValueError as e:
                 if 'columns overlap but no suffix specified' in e.args[0]:
                     raise ValueError('One of the activity was already added'
@@ -84,6 +292,30 @@ class Rider(object):
         else:
             self.power_profile_ = activities_pp
 
+        if activities_metrics:
+            activities_metrics = pd.DataFrame(activities_metrics)
+            self.activity_metrics_ = pd.concat(
+                [self.activity_metrics_, activities_metrics]).sort_index()
+            self._invalidate_performance_management(
+                activities_metrics.index.min())
+
+        if activities_dp:
+            activities_dp = pd.concat(activities_dp, axis=1)
+            if self.distance_profile_ is None:
+                self.distance_profile_ = activities_dp
+            else:
+                self.distance_profile_ = self.distance_profile_.join(
+                    activities_dp, how='outer')
+
+        if activities_fp:
+            activities_fp = pd.concat(activities_fp, axis=1).astype(
+                check_dtype(self.dtype), copy=False)
+            if self.fatigue_profile_ is None:
+                self.fatigue_profile_ = activities_fp
+            else:
+                self.fatigue_profile_ = self.fatigue_profile_.join(
+                    activities_fp, how='outer')
+
     def delete_activities(self, dates, time_comparison=False):
         """Delete the activities power-profile from some specific dates.
 
@@ -150,9 +382,21 @@ class Rider(object):
             mask_date = _strict_comparison(self.power_profile_.columns, dates,
                                            time_comparison)
 
+        deleted_dates = self.power_profile_.columns[mask_date]
         mask_date = np.bitwise_not(mask_date)
         self.power_profile_ = self.power_profile_.loc[:, mask_date]
 
+        if self.activity_metrics_ is not None and deleted_dates.size:
+            self.activity_metrics_ = self.activity_metrics_.drop(
+                deleted_dates, errors='ignore')
+            self._invalidate_performance_management(deleted_dates.min())
+        if self.distance_profile_ is not None:
+            self.distance_profile_ = self.distance_profile_.drop(
+                deleted_dates, axis=1, errors='ignore')
+        if self.fatigue_profile_ is not None:
+            self.fatigue_profile_ = self.fatigue_profile_.drop(
+                deleted_dates, axis=1, errors='ignore')
+
     def record_power_profile(self, range_dates=None, columns=None):
         """Compute the record power-profile.
 
@@ -200,34 +444,337 @@ class Rider(object):
         00:00:05   63.200000  552.60
 
         """
-        if range_dates is None:
-            mask_date = np.ones_like(self.power_profile_.columns,
-                                     dtype=bool)
-        else:
-            mask_date = np.bitwise_and(
-                self.power_profile_.columns >= range_dates[0],
-                self.power_profile_.columns <= pd.Timestamp(range_dates[1]) +
-                pd.DateOffset(1))
+        mask_date = _mask_dates(self.power_profile_.columns, range_dates)
 
         if columns is None:
             columns = self.power_profile_.index.levels[0]
 
-        pp_idxmax = (self.power_profile_.loc['power']
-                                        .loc[:, mask_date]
-                                        .idxmax(axis=1)
-                                        .dropna())
-        rpp = {}
+        with _stage('rider.record_power_profile') as stage:
+            pp_idxmax = (self.power_profile_.loc['power']
+                                            .loc[:, mask_date]
+                                            .idxmax(axis=1)
+                                            .dropna())
+            rpp = {}
+            for dt in columns:
+                data = self.power_profile_.loc[dt].loc[:, mask_date]
+                rpp[dt] = pd.Series(
+                    [data.loc[date_idx]
+                     for date_idx in pp_idxmax.iteritems()],
+                    index=data.index[:pp_idxmax.size])
+            rpp = pd.DataFrame(rpp)
+            stage.record(rpp)
+
+        return rpp
+
+    def record_distance_profile(self, range_dates=None):
+        """Compute the best time over distances among the activities.
+
+        Parameters
+        ----------
+        range_dates : tuple of datetime-like or str, optional
+            The start and end date to consider when computing the record. By
+            default, all activities will be used.
+
+        Returns
+        -------
+        record_distance_profile : Series
+            The best time for each distance, in meters, taken between the
+            range of dates.
+
+        Examples
+        --------
+        >>> from skcycling import Rider
+        >>> from skcycling.datasets import load_fit
+        >>> rider = Rider()
+        >>> rider.add_activities(load_fit()[:2], compute_distance_profile=True)
+        >>> rider.record_distance_profile().loc[[1000., 10000.]]
+        1000.0    00:01:13
+        10000.0   00:17:32
+        dtype: timedelta64[ns]
+
+        """
+        if self.distance_profile_ is None:
+            raise ValueError('The distance-profile of the activities is not'
+                             ' available. Add the activities with'
+                             ' "compute_distance_profile=True".')
+        mask_date = _mask_dates(self.distance_profile_.columns, range_dates)
+        return self.distance_profile_.loc[:, mask_date].min(axis=1)
+
+    def record_fatigue_profile(self, range_dates=None):
+        """Compute the best power after some amount of work among the
+        activities.
+
+        Parameters
+        ----------
+        range_dates : tuple of datetime-like or str, optional
+            The start and end date to consider when computing the record. By
+            default, all activities will be used.
+
+        Returns
+        -------
+        record_fatigue_profile : DataFrame
+            The maximum mean power indexed by the durations and with a column
+            for each work threshold, in kJ, taken between the range of dates.
+
+        Examples
+        --------
+        >>> from skcycling import Rider
+        >>> from skcycling.datasets import load_fit
+        >>> rider = Rider()
+        >>> rider.add_activities(load_fit()[:2], compute_fatigue_profile=True)
+        >>> record = rider.record_fatigue_profile()
+        >>> record.loc['00:05:00', [0., 500.]].round(2).tolist()
+        [290.88, 179.01]
+
+        """
+        if self.fatigue_profile_ is None:
+            raise ValueError('The fatigue profile of the activities is not'
+                             ' available. Add the activities with'
+                             ' "compute_fatigue_profile=True".')
+        mask_date = _mask_dates(self.fatigue_profile_.columns, range_dates)
+        return (self.fatigue_profile_.loc[:, mask_date].max(axis=1)
+                                     .unstack(level=0))
+
+    def aerobic_model_timeline(self, window='42D', step='7D',
+                               time_samples=None):
+        """Compute the aerobic metabolism model over rolling periods.
+
+        For each period, the record power-profile is computed from the
+        activities of the period and the aerobic metabolism model is fitted
+        (see :func:`skcycling.metrics.aerobic_meta_model`). The record
+        power-profiles of all periods are obtained with a single sliding
+        maximum over the activities and all the models are fitted at once.
+
+        Parameters
+        ----------
+        window : Timedelta, timedelta, or str, default='42D'
+            The length of the period used to compute each record
+            power-profile.
+
+        step : str or DateOffset, default='7D'
+            The frequency at which the periods are ending.
+
+        time_samples : TimedeltaIndex or None, optional
+            The time samples of the record power-profile to take into account.
+            If None, the sampling of the method of Pinot et al. is applied,
+            which is equivalent to the sampling from WKO+. The time samples
+            should be multiple of a second.
+
+        Returns
+        -------
+        timeline : DataFrame
+            A DataFrame indexed by the last day of each period and containing
+            the columns ``'mpa'``, ``'t_mpa'``, and ``'aei'``. A period for
+            which the model cannot be computed will contain NaN values.
+
+        Examples
+        --------
+        >>> from skcycling import Rider
+        >>> from skcycling.datasets import load_rider
+        >>> rider = Rider.from_csv(load_rider())
+        >>> timeline = rider.aerobic_model_timeline(window='42D', step='7D')
+        >>> timeline.columns.tolist()
+        ['mpa', 't_mpa', 'aei']
+
+        """
+        if time_samples is None:
+            time_samples = SAMPLING_WKO.copy()
+        window = pd.Timedelta(window)
+
+        power_profile, dates = _sort_activities(self.power_profile_)
+        power = power_profile.loc['power']
+        days, window_ends = _rolling_window_ends(dates, step)
+
+        # the duration of each activity is tracked as an additional row such
+        # that the duration of the record power-profile is computed with the
+        # same sliding maximum.
+        data = np.vstack([power.reindex(time_samples).values,
+                          power.count().values])
+        data = np.ascontiguousarray(data, dtype=np.float64)
+        argmax = _get_kernels()._sliding_window_argmax(
+            data, dates.view(np.int64), window_ends.asi8, window.value,
+            _effective_num_threads(self.num_threads))
+        record = _take_argmax(data, argmax)
+        max_duration = pd.to_timedelta(record[:, -1], unit='s').values
+        mpa, t_mpa, aei = _aerobic_meta_model_batch(
+            record[:, :-1], max_duration, time_samples)
+
+        return pd.DataFrame({'mpa': mpa, 't_mpa': t_mpa, 'aei': aei},
+                            index=days, columns=['mpa', 't_mpa', 'aei'])
+
+    def rolling_record_power_profile(self, window='90D', step='1D',
+                                     columns=None):
+        """Compute the record power-profile over rolling periods.
+
+        The activities are swept in chronological order while keeping, for
+        each duration, a monotonic deque of the best efforts of the current
+        period. All the record power-profiles are therefore obtained in a
+        single pass, in a time linear with the number of activities times the
+        number of durations.
+
+        Parameters
+        ----------
+        window : Timedelta, timedelta, or str, default='90D'
+            The length of the period used to compute each record
+            power-profile.
+
+        step : str, DateOffset, or None, default='1D'
+            The frequency at which the periods are ending. If None, a period
+            will end with each activity (included).
+
+        columns : array-like or None, optional
+            Name of data field to return. By default, all available data will
+            be returned.
+
+        Returns
+        -------
+        rolling_record_power_profile : DataFrame
+            The record power-profiles organized as ``power_profile_``: the
+            columns correspond to the end of each period (the day or the date
+            of the activity) instead of the activities.
+
+        Examples
+        --------
+        >>> from skcycling import Rider
+        >>> from skcycling.datasets import load_rider
+        >>> rider = Rider.from_csv(load_rider())
+        >>> rrpp = rider.rolling_record_power_profile(window='90D', step=None,
+        ...                                           columns=['power'])
+        >>> rrpp.loc['power'].iloc[:5, 1]
+        00:00:01    717.00
+        00:00:02    717.00
+        00:00:03    590.00
+        00:00:04    552.25
+        00:00:05    552.60
+        Name: 2014-05-11 09:39:38, dtype: float64
+
+        """
+        window = pd.Timedelta(window)
+        power_profile, dates = _sort_activities(self.power_profile_)
+        labels, window_ends = _rolling_window_ends(dates, step)
+
+        if columns is None:
+            columns = power_profile.index.levels[0]
+
+        power = power_profile.loc['power']
+        argmax = _get_kernels()._sliding_window_argmax(
+            np.ascontiguousarray(_as_floating(power.values, np.float64)),
+            dates.view(np.int64), window_ends.asi8, window.value,
+            _effective_num_threads(self.num_threads))
+
+        rrpp = {}
         for dt in columns:
-            data = self.power_profile_.loc[dt].loc[:, mask_date]
-            rpp[dt] = pd.Series(
-                [data.loc[date_idx]
-                 for date_idx in pp_idxmax.iteritems()],
-                index=data.index[:pp_idxmax.size])
+            data = power_profile.loc[dt].reindex(power.index).values
+            rrpp[dt] = pd.DataFrame(_take_argmax(data, argmax).T,
+                                    index=power.index, columns=labels)
+
+        return pd.concat(rrpp)
+
+    def performance_management_chart(self, metric='training-stress-score',
+                                     ctl_period=42, atl_period=7,
+                                     end_date=None):
+        """Compute the performance management chart of the rider.
+
+        The training load of the activities is aggregated by day. The chronic
+        training load (CTL, fitness) and the acute training load (ATL,
+        fatigue) are exponentially weighted averages of the daily load and the
+        training stress balance (TSB, form) is the difference between the CTL
+        and the ATL of the previous day.
+
+        The chart is cached and only the days following an added or removed
+        activity are recomputed.
+
+        Parameters
+        ----------
+        metric : str, default='training-stress-score'
+            The training load metric to use. Either
+            ``'training-stress-score'`` or ``'training-load-score'``.
+
+        ctl_period : int, default=42
+            The time constant, in days, of the chronic training load.
+
+        atl_period : int, default=7
+            The time constant, in days, of the acute training load.
+
+        end_date : datetime-like, str, or None, optional
+            The last day of the chart. By default, the chart stops with the
+            last activity.
 
-        return pd.DataFrame(rpp)
+        Returns
+        -------
+        chart : DataFrame
+            A DataFrame indexed by day with the columns ``'ctl'``, ``'atl'``,
+            and ``'tsb'``.
+
+        References
+        ----------
+        .. [1] Allen, H., and A. Coggan. "Training and racing with a power
+           meter." VeloPress, 2012.
+
+        Examples
+        --------
+        >>> from skcycling.datasets import load_fit
+        >>> from skcycling import Rider
+        >>> rider = Rider(mpa=400)
+        >>> rider.add_activities(load_fit()[:1], compute_metrics=True)
+        >>> chart = rider.performance_management_chart()
+        >>> print(chart.round(2))  # doctest: +NORMALIZE_WHITESPACE
+                     ctl    atl  tsb
+        2014-05-07  0.77  4.63  0.0
+
+        """
+        if metric not in TRAINING_LOAD_METRICS:
+            raise ValueError('"metric" should be one of {}. Got {!r}'
+                             ' instead.'.format(TRAINING_LOAD_METRICS,
+                                                metric))
+        if (self.activity_metrics_ is None or
+                self.activity_metrics_[metric].isnull().all()):
+            raise ValueError('The training load of the activities is not'
+                             ' available. Set the "mpa" of the rider before'
+                             ' to add the activities with'
+                             ' "compute_metrics=True".')
+
+        daily_load = (self.activity_metrics_[metric]
+                      .groupby(self.activity_metrics_.index.normalize())
+                      .sum())
+        last_day = daily_load.index.max()
+        if end_date is not None:
+            last_day = max(last_day, pd.Timestamp(end_date).normalize())
+
+        key = (metric, ctl_period, atl_period)
+        chart = self._pmc_cache.get(key)
+        if chart is None or chart.empty:
+            chart = pd.DataFrame(columns=['ctl', 'atl'], dtype=np.float64)
+            first_day, initial = daily_load.index.min(), (0., 0.)
+        else:
+            first_day = chart.index[-1] + pd.Timedelta(days=1)
+            initial = chart.iloc[-1].values
+
+        days = pd.date_range(first_day, last_day, freq='D')
+        if days.size:
+            load = daily_load.reindex(days, fill_value=0.).values
+            chart = pd.concat([chart, pd.DataFrame(
+                {'ctl': _exponentially_weighted_load(load, ctl_period,
+                                                     initial[0]),
+                 'atl': _exponentially_weighted_load(load, atl_period,
+                                                     initial[1])},
+                index=days, columns=['ctl', 'atl'])])
+            self._pmc_cache[key] = chart
+
+        chart = chart.loc[:last_day].copy()
+        chart['tsb'] = (chart['ctl'] - chart['atl']).shift(1).fillna(0.)
+        return chart
+
+    def _invalidate_performance_management(self, date):
+        """Drop the cached chart from the day of the given date."""
+        date = pd.Timestamp(date).normalize()
+        for key, chart in self._pmc_cache.items():
+            self._pmc_cache[key] = chart.loc[chart.index < date]
 
     @classmethod
-    def from_csv(cls, filename, n_jobs=1):
+    def from_csv(cls, filename, n_jobs=1, filename_metrics=None,
+                 dtype=np.float64, filename_distance_profile=None,
+                 filename_fatigue_profile=None):
         """Load rider information from a CSV file.
 
         Parameters
@@ -238,6 +785,24 @@ class Rider(object):
         n_jobs : int, (default=1)
             The number of workers to use for the different processing.
 
+        filename_metrics : str or None, optional
+            The path to the CSV file containing the metrics of the activities
+            (see :meth:`Rider.to_csv`). By default, the metrics are not
+            loaded.
+
+        dtype : {np.float32, np.float64}, (default=np.float64)
+            The dtype in which the power-profile is stored.
+
+        filename_distance_profile : str or None, optional
+            The path to the CSV file containing the distance-profile of the
+            activities (see :meth:`Rider.to_csv`). By default, the
+            distance-profile is not loaded.
+
+        filename_fatigue_profile : str or None, optional
+            The path to the CSV file containing the fatigue profile of the
+            activities (see :meth:`Rider.to_csv`). By default, the fatigue
+            profile is not loaded.
+
         Returns
         -------
         rider : skcycling.Rider
@@ -266,17 +831,42 @@ class Rider(object):
                 00:00:05            61.000000
 
         """
+        dtype = check_dtype(dtype)
         df = pd.read_csv(filename, index_col=[0, 1])
+        df = df.astype(dtype, copy=False)
         df.columns = pd.to_datetime(df.columns)
         df.index = pd.MultiIndex(levels=[df.index.levels[0],
                                          pd.to_timedelta(df.index.levels[1])],
                                  labels=df.index.labels,
                                  name=[None, None])
-        rider = cls(n_jobs=n_jobs)
+        rider = cls(n_jobs=n_jobs, dtype=dtype)
         rider.power_profile_ = df
+        if filename_metrics is not None:
+            rider.activity_metrics_ = pd.read_csv(filename_metrics,
+                                                  index_col=0,
+                                                  parse_dates=True)
+            rider.activity_metrics_.index.name = None
+        if filename_distance_profile is not None:
+            distance_profile = pd.read_csv(filename_distance_profile,
+                                           index_col=0)
+            distance_profile.columns = pd.to_datetime(
+                distance_profile.columns)
+            distance_profile.index.name = None
+            rider.distance_profile_ = distance_profile.apply(pd.to_timedelta)
+        if filename_fatigue_profile is not None:
+            fatigue_profile = pd.read_csv(filename_fatigue_profile,
+                                          index_col=[0, 1])
+            fatigue_profile = fatigue_profile.astype(dtype, copy=False)
+            fatigue_profile.columns = pd.to_datetime(fatigue_profile.columns)
+            fatigue_profile.index = pd.MultiIndex.from_arrays(
+                [fatigue_profile.index.get_level_values(0),
+                 pd.to_timedelta(fatigue_profile.index.get_level_values(1))],
+                names=['work', None])
+            rider.fatigue_profile_ = fatigue_profile
         return rider
 
-    def to_csv(self, filename):
+    def to_csv(self, filename, filename_metrics=None,
+               filename_distance_profile=None, filename_fatigue_profile=None):
         """Drop the rider information into a CSV file.
 
         Parameters
@@ -284,6 +874,20 @@ class Rider(object):
         filename : str
             The path to the CSV file.
 
+        filename_metrics : str or None, optional
+            The path to the CSV file in which the metrics of the activities
+            will be stored. By default, the metrics are not stored.
+
+        filename_distance_profile : str or None, optional
+            The path to the CSV file in which the distance-profile of the
+            activities will be stored. By default, the distance-profile is not
+            stored.
+
+        filename_fatigue_profile : str or None, optional
+            The path to the CSV file in which the fatigue profile of the
+            activities will be stored. By default, the fatigue profile is not
+            stored.
+
         Returns
         -------
         None
@@ -306,6 +910,27 @@ class Rider(object):
 
         """
         self.power_profile_.to_csv(filename, date_format='%Y-%m-%d %H:%M:%S')
+        if filename_metrics is not None:
+            if self.activity_metrics_ is None:
+                raise ValueError('The metrics of the activities are not'
+                                 ' available. Add the activities with'
+                                 ' "compute_metrics=True".')
+            self.activity_metrics_.to_csv(filename_metrics,
+                                          date_format='%Y-%m-%d %H:%M:%S')
+        if filename_distance_profile is not None:
+            if self.distance_profile_ is None:
+                raise ValueError('The distance-profile of the activities is'
+                                 ' not available. Add the activities with'
+                                 ' "compute_distance_profile=True".')
+            self.distance_profile_.to_csv(filename_distance_profile,
+                                          date_format='%Y-%m-%d %H:%M:%S')
+        if filename_fatigue_profile is not None:
+            if self.fatigue_profile_ is None:
+                raise ValueError('The fatigue profile of the activities is'
+                                 ' not available. Add the activities with'
+                                 ' "compute_fatigue_profile=True".')
+            self.fatigue_profile_.to_csv(filename_fatigue_profile,
+                                         date_format='%Y-%m-%d %H:%M:%S')
 
     def __repr__(self):
         return 'RIDER INFORMATION:\n power-profile:\n {}'.format(
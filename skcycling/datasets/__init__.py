@@ -9,8 +9,18 @@ The :mod:`skcycling.datasets` module includes utilities to load datasets.
 from os import listdir
 from os.path import dirname, join
 
+from .._lazy import attach
+
 __all__ = ['load_fit',
-           'load_rider']
+           'load_rider',
+           'make_activity',
+           'make_fit_archive',
+           'make_rider']
+
+__getattr__, __dir__ = attach(
+    __name__,
+    submod_attrs={'samples_generator': ['make_activity', 'make_fit_archive',
+                                        'make_rider']})
 
 
 def load_fit(returned_type='list_file', set_data='normal'):
@@ -0,0 +1,299 @@
+"""Generate synthetic activities and riders."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+from __future__ import division
+
+import os
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy.signal import lfilter
+from sklearn.utils import check_random_state
+
+from ..base import Rider
+from ..base import _activity_metrics
+from ..extraction import activity_power_profile
+from ..io.fit import save_power_to_fit
+from ..model.power import _power_coefficients
+from ..model.simulation import _steady_state_speed
+
+ACTIVITY_COLUMNS = ('elevation', 'cadence', 'distance', 'heart-rate',
+                    'power', 'speed')
+
+
+def _smooth_noise(rng, n_samples, time_constant, scale):
+    """Generate a stationary first-order auto-regressive noise.
+
+    The noise has a standard deviation ``scale`` and a correlation decaying
+    with ``time_constant`` samples.
+    """
+    alpha = np.exp(-1. / time_constant)
+    innovation = rng.normal(scale=scale * np.sqrt(1 - alpha ** 2),
+                            size=n_samples)
+    # draw the initial state from the stationary distribution
+    innovation[0] /= np.sqrt(1 - alpha ** 2)
+    return lfilter([1], [1, -alpha], innovation)
+
+
+def _first_order_response(signal, time_constant, initial):
+    """Low-pass filter a signal as a first-order system."""
+    alpha = np.exp(-1. / time_constant)
+    return lfilter([1 - alpha], [1, -alpha], signal,
+                   zi=[alpha * initial])[0]
+
+
+def make_activity(duration='1H', start='2018-01-01 10:00:00', mpa=400.,
+                  cyclist_weight=70., random_state=None):
+    """Generate a synthetic activity sampled at 1 Hz.
+
+    The terrain is a random succession of climbs and descents. The power
+    follows the terrain with random efforts and is null in the steep
+    descents. The speed is the steady-state speed of the Strava power model
+    reached with some inertia, the cadence decreases in the climbs, and the
+    heart-rate follows the power with a delay.
+
+    Read more in the :ref:`User Guide <synthetic_datasets>`.
+
+    Parameters
+    ----------
+    duration : Timedelta, timedelta, or str, default='1H'
+        The duration of the activity.
+
+    start : datetime-like or str, default='2018-01-01 10:00:00'
+        The date and time of the start of the activity.
+
+    mpa : float, default=400.
+        The maximum aerobic power of the cyclist in watts.
+
+    cyclist_weight : float, default=70.
+        The cyclist weight in kg.
+
+    random_state : int, RandomState instance or None, default=None
+        The seed of the pseudo random number generator.
+
+    Returns
+    -------
+    activity : DataFrame
+        The activity with the same columns as the activities read with
+        :func:`skcycling.io.bikeread`.
+
+    Examples
+    --------
+    >>> from skcycling.datasets import make_activity
+    >>> activity = make_activity(duration='10H', random_state=0)
+    >>> activity.shape
+    (36000, 6)
+
+    """
+    rng = check_random_state(random_state)
+    n_samples = int(pd.Timedelta(duration).total_seconds())
+    if n_samples < 1:
+        raise ValueError('The duration of the activity should be at least a'
+                         ' second. Got {} instead.'.format(duration))
+
+    # terrain: smooth elevation profile. The vertical speed is imposed such
+    # that the elevation does not drift, even during long activities.
+    terrain = _smooth_noise(rng, n_samples, 1800, 100)
+    elevation = 100 + _first_order_response(terrain, 60, terrain[0])
+    vertical_speed = np.ediff1d(elevation, to_begin=0)
+
+    # power: endurance pace adapted to the terrain, random efforts, and
+    # coasting in the descents
+    intensity = (0.55 + np.clip(vertical_speed, -0.3, 0.3) +
+                 _smooth_noise(rng, n_samples, 5, 0.08))
+    n_efforts = rng.poisson(n_samples / 1200)
+    effort_duration = np.exp(rng.uniform(np.log(10), np.log(600),
+                                         size=n_efforts)).astype(int)
+    effort_start = rng.randint(n_samples, size=n_efforts)
+    # the shortest efforts are the hardest
+    effort_intensity = 1.6 - 0.12 * np.log(effort_duration)
+    for start_idx, length, effort in zip(effort_start, effort_duration,
+                                         effort_intensity):
+        intensity[start_idx:start_idx + length] = np.maximum(
+            intensity[start_idx:start_idx + length], effort)
+    power = np.clip(intensity * mpa, 0, 2000)
+    power[vertical_speed < -0.25] = 0
+
+    # speed: steady-state speed of the physical model with some inertia. The
+    # power developed by the cyclist should be enough to keep moving in the
+    # steepest climbs.
+    coef_roll_res, coef_wind, coef_gravity = _power_coefficients(
+        cyclist_weight, 8., 0.0045, 101325., 15., 1., 0.32,
+        use_acceleration=False)[0]
+    power = np.round(np.maximum(power, coef_gravity * vertical_speed + 30))
+    steady_speed = _steady_state_speed(
+        coef_wind, coef_roll_res, power - coef_gravity * vertical_speed)
+    speed = _first_order_response(steady_speed, 10, steady_speed[0])
+    distance = np.cumsum(speed)
+
+    # cadence: lower in the climbs and null when not pedaling
+    cadence = np.clip(90 - 40 * np.clip(vertical_speed, 0, None) +
+                      _smooth_noise(rng, n_samples, 10, 3), 40, 130)
+    cadence[power == 0] = 0
+
+    # heart-rate: delayed response to the power with a cardiac drift
+    hr_rest, hr_max = 60., 190.
+    steady_hr = hr_rest + (hr_max - hr_rest) * np.clip(
+        0.35 + 0.5 * power / mpa, 0, 1)
+    heart_rate = (_first_order_response(steady_hr, 40, hr_rest) +
+                  np.arange(n_samples) / 1200 +
+                  rng.normal(scale=1, size=n_samples))
+    heart_rate = np.round(np.clip(heart_rate, hr_rest, hr_max))
+
+    index = pd.date_range(start, periods=n_samples, freq='s')
+    return pd.DataFrame({'elevation': elevation,
+                         'cadence': np.round(cadence),
+                         'distance': distance,
+                         'heart-rate': heart_rate,
+                         'power': power,
+                         'speed': speed},
+                        index=index, columns=ACTIVITY_COLUMNS)
+
+
+def _activities_seed(n_activities, start, frequency, random_state):
+    """Generate the start and the seed of each activity."""
+    rng = check_random_state(random_state)
+    starts = pd.date_range(start, periods=n_activities, freq=frequency)
+    seeds = rng.randint(np.iinfo(np.int32).max, size=n_activities)
+    return starts, seeds
+
+
+def _save_activity(directory, start, seed, duration, mpa):
+    activity = make_activity(duration=duration, start=start, mpa=mpa,
+                             random_state=seed)
+    filename = os.path.join(directory,
+                            start.strftime('%Y-%m-%d-%H-%M-%S.fit'))
+    return save_power_to_fit(activity, filename)
+
+
+def make_fit_archive(directory, n_activities=10, duration='1H',
+                     start='2018-01-01 10:00:00', frequency='1D', mpa=400.,
+                     random_state=None, n_jobs=1):
+    """Generate synthetic activities and save them as FIT files.
+
+    Read more in the :ref:`User Guide <synthetic_datasets>`.
+
+    Parameters
+    ----------
+    directory : str
+        The directory in which the FIT files are written. The name of each
+        file is given by the start of the activity.
+
+    n_activities : int, default=10
+        The number of activities to generate.
+
+    duration : Timedelta, timedelta, or str, default='1H'
+        The duration of each activity.
+
+    start : datetime-like or str, default='2018-01-01 10:00:00'
+        The start of the first activity.
+
+    frequency : str or DateOffset, default='1D'
+        The time between the start of two successive activities.
+
+    mpa : float, default=400.
+        The maximum aerobic power of the cyclist in watts.
+
+    random_state : int, RandomState instance or None, default=None
+        The seed of the pseudo random number generator.
+
+    n_jobs : int, default=1
+        The number of workers generating the activities.
+
+    Returns
+    -------
+    filenames : list of str
+        The sorted list of the FIT files.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> from skcycling.datasets import make_fit_archive
+    >>> from skcycling.io import bikeread
+    >>> filenames = make_fit_archive(tempfile.mkdtemp(), n_activities=3,
+    ...                              duration='10min', random_state=0)
+    >>> activity = bikeread(filenames[0])
+
+    """
+    starts, seeds = _activities_seed(n_activities, start, frequency,
+                                     random_state)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    filenames = Parallel(n_jobs=n_jobs)(
+        delayed(_save_activity)(directory, activity_start, seed, duration,
+                                mpa)
+        for activity_start, seed in zip(starts, seeds))
+    return sorted(filenames)
+
+
+def _activity_data(start, seed, duration, mpa, dtype):
+    activity = make_activity(duration=duration, start=start, mpa=mpa,
+                             random_state=seed)
+    return (activity_power_profile(activity, dtype=dtype),
+            _activity_metrics(activity, mpa))
+
+
+def make_rider(n_activities=10, duration='1H', start='2018-01-01 10:00:00',
+               frequency='1D', mpa=400., random_state=None, n_jobs=1,
+               dtype=np.float64):
+    """Generate a rider with synthetic activities.
+
+    The activities are generated as in :func:`make_activity` and directly
+    added to the rider without being written on the disk.
+
+    Read more in the :ref:`User Guide <synthetic_datasets>`.
+
+    Parameters
+    ----------
+    n_activities : int, default=10
+        The number of activities of the rider.
+
+    duration : Timedelta, timedelta, or str, default='1H'
+        The duration of each activity.
+
+    start : datetime-like or str, default='2018-01-01 10:00:00'
+        The start of the first activity.
+
+    frequency : str or DateOffset, default='1D'
+        The time between the start of two successive activities.
+
+    mpa : float, default=400.
+        The maximum aerobic power of the rider in watts, used to compute the
+        metrics of the activities.
+
+    random_state : int, RandomState instance or None, default=None
+        The seed of the pseudo random number generator.
+
+    n_jobs : int, default=1
+        The number of workers generating the activities.
+
+    dtype : {np.float32, np.float64}, default=np.float64
+        The dtype in which the power-profile of the rider is stored.
+
+    Returns
+    -------
+    rider : Rider
+        The rider with the power-profile and the metrics of the activities.
+
+    Examples
+    --------
+    >>> from skcycling.datasets import make_rider
+    >>> rider = make_rider(n_activities=5, duration='10min', random_state=0)
+    >>> rider.power_profile_.shape
+    (3594, 5)
+
+    """
+    starts, seeds = _activities_seed(n_activities, start, frequency,
+                                     random_state)
+    activities_data = Parallel(n_jobs=n_jobs)(
+        delayed(_activity_data)(activity_start, seed, duration, mpa, dtype)
+        for activity_start, seed in zip(starts, seeds))
+    activities_pp, activities_metrics = zip(*activities_data)
+
+    rider = Rider(n_jobs=n_jobs, mpa=mpa, dtype=dtype)
+    rider._add_activities_data(list(activities_pp), list(activities_metrics))
+    return rider
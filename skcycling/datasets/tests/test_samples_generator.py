@@ -0,0 +1,61 @@
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import os
+
+import pytest
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose
+
+from skcycling.datasets import make_activity
+from skcycling.datasets import make_fit_archive
+from skcycling.datasets import make_rider
+from skcycling.io import bikeread
+
+
+def test_make_activity():
+    activity = make_activity(duration='2H', start='2018-03-01 08:00:00',
+                             random_state=0)
+    assert activity.shape == (7200, 6)
+    assert activity.index[0] == pd.Timestamp('2018-03-01 08:00:00')
+    assert (activity.index.to_series().diff().dropna() ==
+            pd.Timedelta(seconds=1)).all()
+    assert activity.notnull().all().all()
+    assert (activity['power'] >= 0).all()
+    assert (activity['speed'] > 0).all()
+    assert (np.diff(activity['distance']) > 0).all()
+    # the cyclist does not pedal when the power is null
+    assert (activity.loc[activity['power'] == 0, 'cadence'] == 0).all()
+
+    assert_allclose(make_activity(duration='2H', start='2018-03-01 08:00:00',
+                                  random_state=0), activity)
+
+
+def test_make_activity_error():
+    with pytest.raises(ValueError, match="at least a second"):
+        make_activity(duration='0s')
+
+
+def test_make_fit_archive(tmpdir):
+    directory = str(tmpdir.join('archive'))
+    filenames = make_fit_archive(directory, n_activities=3, duration='5min',
+                                 frequency='12H', random_state=0)
+    assert [os.path.basename(f) for f in filenames] == [
+        '2018-01-01-10-00-00.fit', '2018-01-01-22-00-00.fit',
+        '2018-01-02-10-00-00.fit']
+
+    activity = bikeread(filenames[1])
+    assert activity.shape == (300, 6)
+    assert activity.index[0] == pd.Timestamp('2018-01-01 22:00:00')
+
+
+def test_make_rider():
+    rider = make_rider(n_activities=4, duration='5min', frequency='2D',
+                       random_state=0)
+    assert rider.power_profile_.shape[1] == 4
+    assert rider.activity_metrics_.shape[0] == 4
+    assert list(rider.power_profile_.columns) == list(
+        pd.date_range('2018-01-01 10:00:00', periods=4, freq='2D'))
@@ -7,16 +7,32 @@ information from cycling data.
 #          Cedric Lemaitre
 # License: BSD 3 clause
 
-from .gradient import acceleration
-from .gradient import gradient_activity
-from .gradient import gradient_elevation
-from .gradient import gradient_heart_rate
-
-from .power_profile import activity_power_profile
-
+from .._lazy import attach
 
 __all__ = ['acceleration',
+           'detect_climbs',
+           'detect_efforts',
+           'extract_channels',
            'gradient_activity',
            'gradient_elevation',
            'gradient_heart_rate',
+           'total_ascent',
+           'vam',
+           'activity_best_efforts',
+           'activity_distance_profile',
+           'activity_fatigue_profile',
+           'activity_max_mean',
            'activity_power_profile']
+
+__getattr__, __dir__ = attach(
+    __name__,
+    submod_attrs={'climb': ['detect_climbs', 'total_ascent', 'vam'],
+                  'distance_profile': ['activity_distance_profile'],
+                  'effort': ['detect_efforts'],
+                  'gradient': ['acceleration', 'extract_channels',
+                               'gradient_activity', 'gradient_elevation',
+                               'gradient_heart_rate'],
+                  'power_profile': ['activity_best_efforts',
+                                    'activity_fatigue_profile',
+                                    'activity_max_mean',
+                                    'activity_power_profile']})
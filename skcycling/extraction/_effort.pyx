@@ -0,0 +1,86 @@
+#cython: cdivision=True
+#cython: boundscheck=False
+#cython: nonecheck=False
+#cython: wraparound=False
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import numpy as np
+
+
+cpdef _pelt(double[:] cumsum, double[:] cumsum_squared, double penalty,
+            Py_ssize_t min_size):
+    """Segment a signal in pieces of constant mean with PELT.
+
+    The cost of a segment is its sum of squared deviations to its mean,
+    obtained in constant time from the cumulative sums of the signal and of
+    its square. The last change-points which cannot be optimal anymore are
+    pruned, such that the cost is linear with the number of samples when the
+    number of segments grows with the length of the signal.
+
+    Parameters
+    ----------
+    cumsum : ndarray, shape (n_samples + 1,)
+        The cumulative sum of the signal, starting with 0.
+
+    cumsum_squared : ndarray, shape (n_samples + 1,)
+        The cumulative sum of the square of the signal, starting with 0.
+
+    penalty : double
+        The penalty added for each segment.
+
+    min_size : int
+        The minimum number of samples of a segment.
+
+    Returns
+    -------
+    ends : ndarray, shape (n_segments,)
+        The end (excluded) of each segment. The last end is ``n_samples``.
+
+    """
+    cdef:
+        Py_ssize_t n_samples = cumsum.shape[0] - 1
+        double[::1] best_cost = np.full(n_samples + 1, np.inf)
+        Py_ssize_t[::1] last_change = np.zeros(n_samples + 1, dtype=np.intp)
+        Py_ssize_t[::1] candidates = np.empty(n_samples + 1, dtype=np.intp)
+        double[::1] candidate_cost = np.empty(n_samples + 1)
+        Py_ssize_t n_candidates = 1, n_kept, idx, end, start
+        double segment_sum
+        list ends = []
+
+    with nogil:
+        best_cost[0] = -penalty
+        candidates[0] = 0
+        for end in range(min_size, n_samples + 1):
+            for idx in range(n_candidates):
+                start = candidates[idx]
+                if end - start < min_size:
+                    continue
+                segment_sum = cumsum[end] - cumsum[start]
+                candidate_cost[idx] = (
+                    best_cost[start] + cumsum_squared[end] -
+                    cumsum_squared[start] -
+                    segment_sum * segment_sum / (end - start))
+                if candidate_cost[idx] + penalty < best_cost[end]:
+                    best_cost[end] = candidate_cost[idx] + penalty
+                    last_change[end] = start
+
+            # prune the change-points which cannot be optimal anymore
+            n_kept = 0
+            for idx in range(n_candidates):
+                start = candidates[idx]
+                if (end - start < min_size or
+                        candidate_cost[idx] <= best_cost[end]):
+                    candidates[n_kept] = start
+                    n_kept = n_kept + 1
+            # the end of the segment is the start of the next candidate
+            candidates[n_kept] = end
+            n_candidates = n_kept + 1
+
+    end = n_samples
+    while end > 0:
+        ends.append(end)
+        end = last_change[end]
+    return np.array(ends[::-1], dtype=np.intp)
@@ -0,0 +1,66 @@
+"""NumPy implementation of the kernel of the effort detection.
+
+This function is used when the compiled extension is not available. It has
+the same signature and gives the same results as the function of
+``_effort.pyx``.
+"""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+from __future__ import division
+
+import numpy as np
+
+
+def _pelt(cumsum, cumsum_squared, penalty, min_size):
+    """Segment a signal in pieces of constant mean with PELT.
+
+    Parameters
+    ----------
+    cumsum : ndarray, shape (n_samples + 1,)
+        The cumulative sum of the signal, starting with 0.
+
+    cumsum_squared : ndarray, shape (n_samples + 1,)
+        The cumulative sum of the square of the signal, starting with 0.
+
+    penalty : float
+        The penalty added for each segment.
+
+    min_size : int
+        The minimum number of samples of a segment.
+
+    Returns
+    -------
+    ends : ndarray, shape (n_segments,)
+        The end (excluded) of each segment. The last end is ``n_samples``.
+
+    """
+    n_samples = cumsum.shape[0] - 1
+    best_cost = np.full(n_samples + 1, np.inf)
+    best_cost[0] = -penalty
+    last_change = np.zeros(n_samples + 1, dtype=np.intp)
+    candidates = np.array([0], dtype=np.intp)
+    for end in range(min_size, n_samples + 1):
+        valid = end - candidates >= min_size
+        start = candidates[valid]
+        segment_sum = cumsum[end] - cumsum[start]
+        cost = (best_cost[start] + cumsum_squared[end] -
+                cumsum_squared[start] - segment_sum ** 2 / (end - start))
+        if cost.size:
+            # the first minimum as the compiled kernel
+            idx_min = np.argmin(cost)
+            best_cost[end] = cost[idx_min] + penalty
+            last_change[end] = start[idx_min]
+        # prune the change-points which cannot be optimal anymore
+        keep = ~valid
+        keep[valid] = cost <= best_cost[end]
+        candidates = np.append(candidates[keep], end)
+
+    ends = []
+    end = n_samples
+    while end > 0:
+        ends.append(end)
+        end = last_change[end]
+    return np.array(ends[::-1], dtype=np.intp)
@@ -6,9 +6,26 @@ from cython cimport floating, integral
 
 
 cpdef (double, Py_ssize_t) max_mean_power_interval(
-    floating[:] activity_power, Py_ssize_t time_interval) nogil
+    floating[:] activity_power, Py_ssize_t time_interval,
+    int num_threads=*) nogil
 
 
 cpdef _associated_data_power_profile(floating[:] data,
                                      integral[:] pp_index,
-                                     integral[:] duration)
+                                     integral[:] duration,
+                                     int num_threads=*)
+
+
+cpdef _sliding_window_argmax(floating[:, :] data,
+                             long long[:] dates,
+                             long long[:] window_ends,
+                             long long window,
+                             int num_threads=*)
+
+
+cpdef _max_mean_channels(floating[:, :] data, integral[:] duration,
+                         int num_threads=*)
+
+
+cpdef _fatigue_power_profile(floating[:] power, double[:] work_thresholds,
+                             integral[:] duration, int num_threads=*)
@@ -14,7 +14,8 @@ import numpy as np
 
 
 cpdef (double, Py_ssize_t) max_mean_power_interval(
-    floating[:] activity_power, Py_ssize_t time_interval) nogil:
+    floating[:] activity_power, Py_ssize_t time_interval,
+    int num_threads=1) nogil:
     """Compute the maximum power delivered for a specific amount of time.
 
     Parameters
@@ -25,6 +26,9 @@ cpdef (double, Py_ssize_t) max_mean_power_interval(
     time_interval : int
         The time interval for which we compute the mean power.
 
+    num_threads : int, default=1
+        The number of OpenMP threads.
+
     Returns
     -------
     max_mean : double
@@ -34,15 +38,16 @@ cpdef (double, Py_ssize_t) max_mean_power_interval(
 
     cdef:
         Py_ssize_t n_element = activity_power.shape[0]
-        Py_ssize_t idx_element, idx_interval, idx_max_mean,
+        Py_ssize_t idx_element, idx_interval
         double acc
         double* acc_arr = <double*>malloc((n_element - time_interval) *
                                            sizeof(double))
         # double[:] acc_arr = np.empty((n_element - time_interval,))
         Py_ssize_t idx_acc_arr
         double max_mean = 0.0
+        Py_ssize_t idx_max_mean = 0
 
-    with parallel():
+    with parallel(num_threads=num_threads):
         for idx_element in prange(n_element - time_interval):
             acc = 0.0
             for idx_interval in range(time_interval):
@@ -59,7 +64,8 @@ cpdef (double, Py_ssize_t) max_mean_power_interval(
 
 cpdef _associated_data_power_profile(floating[:] data,
                                      integral[:] pp_index,
-                                     integral[:] duration):
+                                     integral[:] duration,
+                                     int num_threads=1):
     """Compute the mean of the complementary data of the power-profile.
 
     Parameters
@@ -74,6 +80,9 @@ cpdef _associated_data_power_profile(floating[:] data,
     duration : ndarray, shape (max_duration,)
         An array containing the duration (idx/integrer).
 
+    num_threads : int, default=1
+        The number of OpenMP threads.
+
     Returns
     -------
     complement_data : ndarray, shape (max_duration)
@@ -86,7 +95,7 @@ cpdef _associated_data_power_profile(floating[:] data,
         double[:] output = np.empty((pp_index.shape[0],))
         double acc
 
-    with nogil, parallel():
+    with nogil, parallel(num_threads=num_threads):
         for i in prange(pp_index.shape[0]):
             time_interval = duration[i]
             data_idx = pp_index[i]
@@ -96,3 +105,265 @@ cpdef _associated_data_power_profile(floating[:] data,
             output[i] = acc / time_interval
 
     return np.array(output)
+
+
+cpdef _sliding_window_argmax(floating[:, :] data,
+                             long long[:] dates,
+                             long long[:] window_ends,
+                             long long window,
+                             int num_threads=1):
+    """Find the position of the maximum of each row within sliding windows.
+
+    A monotonic deque is maintained for each row while sweeping the columns in
+    chronological order. Each column is pushed and popped at most once, such
+    that the cost is linear in the number of rows times the number of
+    columns.
+
+    Parameters
+    ----------
+    data : ndarray, shape (n_rows, n_columns)
+        The data from which to find the maximum. NaN values are ignored.
+
+    dates : ndarray, shape (n_columns,)
+        The sorted dates (as integers) associated with each column.
+
+    window_ends : ndarray, shape (n_windows,)
+        The sorted end date (excluded) of each window.
+
+    window : int
+        The length of the windows. A window ``k`` contains the columns for
+        which ``window_ends[k] - window <= dates < window_ends[k]``.
+
+    num_threads : int, default=1
+        The number of OpenMP threads.
+
+    Returns
+    -------
+    argmax : ndarray, shape (n_windows, n_rows)
+        The column index of the maximum for each window and each row. -1 is
+        returned when a window does not contain any valid data. The first
+        column is returned in case of ties.
+
+    """
+    cdef:
+        Py_ssize_t n_rows = data.shape[0]
+        Py_ssize_t n_columns = data.shape[1]
+        Py_ssize_t n_windows = window_ends.shape[0]
+        Py_ssize_t[:, :] argmax = np.empty((n_windows, n_rows),
+                                           dtype=np.intp)
+        Py_ssize_t row, idx_window, idx_column, head, tail
+        Py_ssize_t* deque
+
+    with nogil, parallel(num_threads=num_threads):
+        deque = <Py_ssize_t*>malloc(n_columns * sizeof(Py_ssize_t))
+        for row in prange(n_rows):
+            head = 0
+            tail = 0
+            idx_column = 0
+            for idx_window in range(n_windows):
+                # push the columns entering the window
+                while (idx_column < n_columns and
+                       dates[idx_column] < window_ends[idx_window]):
+                    if data[row, idx_column] == data[row, idx_column]:
+                        # keep the earlier columns in case of ties
+                        while (tail > head and
+                               data[row, deque[tail - 1]] <
+                               data[row, idx_column]):
+                            tail = tail - 1
+                        deque[tail] = idx_column
+                        tail = tail + 1
+                    idx_column = idx_column + 1
+                # pop the columns leaving the window
+                while (tail > head and dates[deque[head]] <
+                       window_ends[idx_window] - window):
+                    head = head + 1
+                if tail > head:
+                    argmax[idx_window, row] = deque[head]
+                else:
+                    argmax[idx_window, row] = -1
+        free(deque)
+
+    return np.asarray(argmax)
+
+
+cpdef _max_mean_channels(floating[:, :] data, integral[:] duration,
+                         int num_threads=1):
+    """Compute the maximum mean of several channels for several durations.
+
+    The cumulative sum of each channel is computed once and shared by all the
+    durations, such that the cost is linear in the number of channels times
+    the number of samples for each duration.
+
+    Parameters
+    ----------
+    data : ndarray, shape (n_channels, n_samples)
+        The data of each channel. The windows containing NaN values are
+        ignored.
+
+    duration : ndarray, shape (n_durations,)
+        The durations (as a number of samples) of the windows.
+
+    num_threads : int, default=1
+        The number of OpenMP threads.
+
+    Returns
+    -------
+    max_mean : ndarray, shape (n_durations, n_channels)
+        The maximum mean of each channel for each duration. NaN is returned
+        when no window is valid.
+
+    idx_max_mean : ndarray, shape (n_durations, n_channels)
+        The start of the window of the maximum. -1 is returned when no window
+        is valid.
+
+    """
+    cdef:
+        Py_ssize_t n_channels = data.shape[0]
+        Py_ssize_t n_samples = data.shape[1]
+        Py_ssize_t n_durations = duration.shape[0]
+        double[:, ::1] cumsum = np.zeros((n_channels, n_samples + 1))
+        Py_ssize_t[:, ::1] missing = np.zeros((n_channels, n_samples + 1),
+                                              dtype=np.intp)
+        double[:, ::1] max_mean = np.full((n_durations, n_channels), np.nan)
+        Py_ssize_t[:, ::1] idx_max_mean = np.full((n_durations, n_channels),
+                                                  -1, dtype=np.intp)
+        Py_ssize_t channel, idx_sample, idx_duration, time_interval, idx_max
+        double acc, acc_max
+
+    with nogil, parallel(num_threads=num_threads):
+        for channel in prange(n_channels):
+            for idx_sample in range(n_samples):
+                if data[channel, idx_sample] == data[channel, idx_sample]:
+                    cumsum[channel, idx_sample + 1] = (
+                        cumsum[channel, idx_sample] +
+                        data[channel, idx_sample])
+                    missing[channel, idx_sample + 1] = (
+                        missing[channel, idx_sample])
+                else:
+                    cumsum[channel, idx_sample + 1] = (
+                        cumsum[channel, idx_sample])
+                    missing[channel, idx_sample + 1] = (
+                        missing[channel, idx_sample] + 1)
+
+    with nogil, parallel(num_threads=num_threads):
+        for idx_duration in prange(n_durations, schedule='dynamic'):
+            time_interval = duration[idx_duration]
+            for channel in range(n_channels):
+                idx_max = -1
+                acc_max = 0.0
+                # same windows as max_mean_power_interval
+                for idx_sample in range(n_samples - time_interval):
+                    if (missing[channel, idx_sample + time_interval] !=
+                            missing[channel, idx_sample]):
+                        continue
+                    acc = (cumsum[channel, idx_sample + time_interval] -
+                           cumsum[channel, idx_sample])
+                    if idx_max == -1 or acc > acc_max:
+                        acc_max = acc
+                        idx_max = idx_sample
+                if idx_max != -1:
+                    max_mean[idx_duration, channel] = acc_max / time_interval
+                    idx_max_mean[idx_duration, channel] = idx_max
+
+    return np.asarray(max_mean), np.asarray(idx_max_mean)
+
+
+cpdef _fatigue_power_profile(floating[:] power, double[:] work_thresholds,
+                             integral[:] duration, int num_threads=1):
+    """Compute the maximum mean power of the windows starting after some work.
+
+    The cumulative sum of the power, which is also the cumulative work at
+    1 Hz, is computed once. For each duration, the windows are swept
+    backward while keeping the best window found so far, such that the best
+    window starting after each threshold is found in a single pass.
+
+    Parameters
+    ----------
+    power : ndarray, shape (n_samples,)
+        The power of the activity sampled at 1 Hz. The windows containing NaN
+        values are ignored and the NaN values do not contribute to the work.
+
+    work_thresholds : ndarray, shape (n_thresholds,)
+        The work, in joules, which should be done before the start of the
+        windows.
+
+    duration : ndarray, shape (n_durations,)
+        The durations (as a number of samples) of the windows.
+
+    num_threads : int, default=1
+        The number of OpenMP threads.
+
+    Returns
+    -------
+    max_mean : ndarray, shape (n_durations, n_thresholds)
+        The maximum mean power for each duration and each threshold. NaN is
+        returned when no window is valid.
+
+    idx_max_mean : ndarray, shape (n_durations, n_thresholds)
+        The start of the window of the maximum. -1 is returned when no window
+        is valid.
+
+    """
+    cdef:
+        Py_ssize_t n_samples = power.shape[0]
+        Py_ssize_t n_thresholds = work_thresholds.shape[0]
+        Py_ssize_t n_durations = duration.shape[0]
+        double[::1] cumsum = np.zeros(n_samples + 1)
+        Py_ssize_t[::1] missing = np.zeros(n_samples + 1, dtype=np.intp)
+        double[:, ::1] max_mean = np.full((n_durations, n_thresholds),
+                                          np.nan)
+        Py_ssize_t[:, ::1] idx_max_mean = np.full(
+            (n_durations, n_thresholds), -1, dtype=np.intp)
+        Py_ssize_t[::1] start, order
+        Py_ssize_t idx_sample, idx_duration, time_interval, idx_max
+        Py_ssize_t idx_order, threshold
+        double acc, acc_max
+
+    with nogil:
+        for idx_sample in range(n_samples):
+            if power[idx_sample] == power[idx_sample]:
+                cumsum[idx_sample + 1] = cumsum[idx_sample] + power[idx_sample]
+                missing[idx_sample + 1] = missing[idx_sample]
+            else:
+                cumsum[idx_sample + 1] = cumsum[idx_sample]
+                missing[idx_sample + 1] = missing[idx_sample] + 1
+
+    # first window start for which the work done before reaches each
+    # threshold, visited from the last one during the backward sweep
+    start = np.searchsorted(np.asarray(cumsum), np.asarray(work_thresholds),
+                            side='left').astype(np.intp)
+    order = np.argsort(-np.asarray(start), kind='mergesort').astype(np.intp)
+
+    with nogil, parallel(num_threads=num_threads):
+        for idx_duration in prange(n_durations, schedule='dynamic'):
+            time_interval = duration[idx_duration]
+            idx_max = -1
+            acc_max = 0.0
+            idx_order = 0
+            # same windows as max_mean_power_interval
+            idx_sample = n_samples - time_interval - 1
+            while idx_sample >= -1:
+                # the best window is the best one starting after the
+                # threshold of the windows not yet visited
+                while (idx_order < n_thresholds and
+                       (idx_sample == -1 or
+                        start[order[idx_order]] > idx_sample)):
+                    threshold = order[idx_order]
+                    if idx_max != -1:
+                        max_mean[idx_duration, threshold] = (
+                            acc_max / time_interval)
+                        idx_max_mean[idx_duration, threshold] = idx_max
+                    idx_order = idx_order + 1
+                if idx_sample == -1:
+                    break
+                if (missing[idx_sample + time_interval] ==
+                        missing[idx_sample]):
+                    acc = (cumsum[idx_sample + time_interval] -
+                           cumsum[idx_sample])
+                    # the earliest window is kept in case of ties
+                    if idx_max == -1 or acc >= acc_max:
+                        acc_max = acc
+                        idx_max = idx_sample
+                idx_sample = idx_sample - 1
+
+    return np.asarray(max_mean), np.asarray(idx_max_mean)
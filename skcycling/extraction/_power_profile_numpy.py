@@ -0,0 +1,271 @@
+"""NumPy implementation of the kernels of the power-profile.
+
+These functions are used when the compiled extension is not available. They
+have the same signature and give the same results as the functions of
+``_power_profile.pyx``. The ``num_threads`` argument is ignored.
+"""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+from __future__ import division
+
+import numpy as np
+
+
+def _window_sums(data, time_interval, n_windows):
+    """Sum of the ``n_windows`` first sliding windows of ``time_interval``.
+
+    A window containing a NaN value gives NaN, as when summing the window
+    directly, while the NaN values do not propagate to the next windows as
+    they would with a naive cumulative sum.
+    """
+    data = np.asarray(data, dtype=np.float64)
+    missing = np.isnan(data)
+    cumsum = np.concatenate(([0.], np.cumsum(np.where(missing, 0., data))))
+    sums = (cumsum[time_interval:time_interval + n_windows] -
+            cumsum[:n_windows])
+    if missing.any():
+        count = np.concatenate(([0], np.cumsum(missing)))
+        sums[count[time_interval:time_interval + n_windows] !=
+             count[:n_windows]] = np.nan
+    return sums
+
+
+def max_mean_power_interval(activity_power, time_interval, num_threads=1):
+    """Compute the maximum power delivered for a specific amount of time.
+
+    Parameters
+    ----------
+    activity_power : ndarray, shape (n_samples,)
+        The power data of the activity.
+
+    time_interval : int
+        The time interval for which we compute the mean power.
+
+    num_threads : int, default=1
+        Ignored.
+
+    Returns
+    -------
+    max_mean : double
+        The maximum power delivered for a specific amount of time.
+
+    idx_max_mean : int
+        The start of the window of the maximum.
+
+    """
+    n_windows = activity_power.shape[0] - time_interval
+    if n_windows <= 0:
+        return 0., 0
+    sums = _window_sums(activity_power, time_interval, n_windows)
+    # the windows which are not strictly positive or contain NaN values are
+    # never selected
+    with np.errstate(invalid='ignore'):
+        sums[~(sums > 0)] = 0.
+    idx_max_mean = int(np.argmax(sums))
+    return sums[idx_max_mean] / time_interval, idx_max_mean
+
+
+def _associated_data_power_profile(data, pp_index, duration, num_threads=1):
+    """Compute the mean of the complementary data of the power-profile.
+
+    Parameters
+    ----------
+    data : ndarray, shape (n_samples,)
+        The complementary data to use.
+
+    pp_index : ndarray, shape (max_duration,)
+        The indices of the maximum for a specific duration found when computing
+        the power-profile.
+
+    duration : ndarray, shape (max_duration,)
+        An array containing the duration (idx/integrer).
+
+    num_threads : int, default=1
+        Ignored.
+
+    Returns
+    -------
+    complement_data : ndarray, shape (max_duration)
+        The mean of the complementary data of the power-profile for each
+        duration.
+
+    """
+    data = np.asarray(data, dtype=np.float64)
+    pp_index = np.asarray(pp_index)
+    duration = np.asarray(duration)
+    missing = np.isnan(data)
+    cumsum = np.concatenate(([0.], np.cumsum(np.where(missing, 0., data))))
+    end = pp_index + duration
+    output = (cumsum[end] - cumsum[pp_index]) / duration
+    if missing.any():
+        count = np.concatenate(([0], np.cumsum(missing)))
+        output[count[end] != count[pp_index]] = np.nan
+    return output
+
+
+def _sliding_window_argmax(data, dates, window_ends, window, num_threads=1):
+    """Find the position of the maximum of each row within sliding windows.
+
+    The maximum of each window is searched directly, such that the cost is
+    proportional to the total number of columns in the windows.
+
+    Parameters
+    ----------
+    data : ndarray, shape (n_rows, n_columns)
+        The data from which to find the maximum. NaN values are ignored.
+
+    dates : ndarray, shape (n_columns,)
+        The sorted dates (as integers) associated with each column.
+
+    window_ends : ndarray, shape (n_windows,)
+        The sorted end date (excluded) of each window.
+
+    window : int
+        The length of the windows. A window ``k`` contains the columns for
+        which ``window_ends[k] - window <= dates < window_ends[k]``.
+
+    num_threads : int, default=1
+        Ignored.
+
+    Returns
+    -------
+    argmax : ndarray, shape (n_windows, n_rows)
+        The column index of the maximum for each window and each row. -1 is
+        returned when a window does not contain any valid data. The first
+        column is returned in case of ties.
+
+    """
+    data = np.where(np.isnan(data), -np.inf, data)
+    window_ends = np.asarray(window_ends)
+    starts = np.searchsorted(dates, window_ends - window, side='left')
+    ends = np.searchsorted(dates, window_ends, side='left')
+    argmax = np.full((window_ends.shape[0], data.shape[0]), -1,
+                     dtype=np.intp)
+    for idx_window, (start, end) in enumerate(zip(starts, ends)):
+        if end <= start:
+            continue
+        window_data = data[:, start:end]
+        idx_max = np.argmax(window_data, axis=1)
+        valid = np.isfinite(window_data[np.arange(data.shape[0]), idx_max])
+        argmax[idx_window, valid] = start + idx_max[valid]
+    return argmax
+
+
+def _max_mean_channels(data, duration, num_threads=1):
+    """Compute the maximum mean of several channels for several durations.
+
+    Parameters
+    ----------
+    data : ndarray, shape (n_channels, n_samples)
+        The data of each channel. The windows containing NaN values are
+        ignored.
+
+    duration : ndarray, shape (n_durations,)
+        The durations (as a number of samples) of the windows.
+
+    num_threads : int, default=1
+        Ignored.
+
+    Returns
+    -------
+    max_mean : ndarray, shape (n_durations, n_channels)
+        The maximum mean of each channel for each duration. NaN is returned
+        when no window is valid.
+
+    idx_max_mean : ndarray, shape (n_durations, n_channels)
+        The start of the window of the maximum. -1 is returned when no window
+        is valid.
+
+    """
+    data = np.asarray(data, dtype=np.float64)
+    n_channels, n_samples = data.shape
+    missing = np.isnan(data)
+    zeros = np.zeros((n_channels, 1))
+    cumsum = np.hstack((zeros, np.cumsum(np.where(missing, 0., data),
+                                         axis=1)))
+    count = np.hstack((zeros, np.cumsum(missing, axis=1)))
+    max_mean = np.full((len(duration), n_channels), np.nan)
+    idx_max_mean = np.full((len(duration), n_channels), -1, dtype=np.intp)
+    channels = np.arange(n_channels)
+    for idx_duration, time_interval in enumerate(duration):
+        # same windows as max_mean_power_interval
+        n_windows = n_samples - time_interval
+        if n_windows <= 0:
+            continue
+        sums = (cumsum[:, time_interval:time_interval + n_windows] -
+                cumsum[:, :n_windows])
+        sums[count[:, time_interval:time_interval + n_windows] !=
+             count[:, :n_windows]] = -np.inf
+        idx_max = np.argmax(sums, axis=1)
+        valid = sums[channels, idx_max] > -np.inf
+        max_mean[idx_duration, valid] = (sums[channels, idx_max][valid] /
+                                         time_interval)
+        idx_max_mean[idx_duration, valid] = idx_max[valid]
+    return max_mean, idx_max_mean
+
+
+def _fatigue_power_profile(power, work_thresholds, duration, num_threads=1):
+    """Compute the maximum mean power of the windows starting after some work.
+
+    Parameters
+    ----------
+    power : ndarray, shape (n_samples,)
+        The power of the activity sampled at 1 Hz. The windows containing NaN
+        values are ignored and the NaN values do not contribute to the work.
+
+    work_thresholds : ndarray, shape (n_thresholds,)
+        The work, in joules, which should be done before the start of the
+        windows.
+
+    duration : ndarray, shape (n_durations,)
+        The durations (as a number of samples) of the windows.
+
+    num_threads : int, default=1
+        Ignored.
+
+    Returns
+    -------
+    max_mean : ndarray, shape (n_durations, n_thresholds)
+        The maximum mean power for each duration and each threshold. NaN is
+        returned when no window is valid.
+
+    idx_max_mean : ndarray, shape (n_durations, n_thresholds)
+        The start of the window of the maximum. -1 is returned when no window
+        is valid.
+
+    """
+    power = np.asarray(power, dtype=np.float64)
+    n_samples = power.shape[0]
+    cumsum = np.concatenate(([0.], np.cumsum(np.nan_to_num(power))))
+    start = np.searchsorted(cumsum, work_thresholds, side='left')
+    max_mean = np.full((len(duration), len(work_thresholds)), np.nan)
+    idx_max_mean = np.full((len(duration), len(work_thresholds)), -1,
+                           dtype=np.intp)
+    for idx_duration, time_interval in enumerate(duration):
+        # same windows as max_mean_power_interval
+        n_windows = n_samples - time_interval
+        if n_windows <= 0:
+            continue
+        sums = _window_sums(power, time_interval, n_windows)
+        sums[np.isnan(sums)] = -np.inf
+        # maximum of the windows starting at or after each sample: the
+        # running maximum of the reversed sums, updated on ties to keep the
+        # earliest window
+        reversed_sums = sums[::-1]
+        running_max = np.maximum.accumulate(reversed_sums)
+        updated = np.ones(n_windows, dtype=bool)
+        updated[1:] = reversed_sums[1:] >= running_max[:-1]
+        idx_running_max = np.maximum.accumulate(
+            np.where(updated, np.arange(n_windows), 0))
+        suffix_max = running_max[::-1]
+        suffix_argmax = n_windows - 1 - idx_running_max[::-1]
+
+        valid = start < n_windows
+        valid[valid] = suffix_max[start[valid]] > -np.inf
+        max_mean[idx_duration, valid] = (suffix_max[start[valid]] /
+                                         time_interval)
+        idx_max_mean[idx_duration, valid] = suffix_argmax[start[valid]]
+    return max_mean, idx_max_mean
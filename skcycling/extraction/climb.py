@@ -0,0 +1,206 @@
+"""Function to extract information about the climbs of an activity."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+from __future__ import division
+
+import numpy as np
+import pandas as pd
+
+from ..exceptions import MissingDataError
+from .gradient import _smooth_elevation
+
+CLIMB_FIELDS = ('start', 'end', 'distance', 'ascent', 'gradient', 'duration',
+                'vam')
+
+
+def _check_elevation_data(activity):
+    if not {'elevation', 'distance'}.issubset(activity.columns):
+        raise MissingDataError('To extract the climbs, elevation and distance'
+                               ' data are required. Got {} fields.'
+                               .format(activity.columns))
+
+
+def total_ascent(activity, smooth='savgol', window_length=100.):
+    """Compute the total ascent of an activity.
+
+    The total ascent is the sum of the positive elevation differences, once
+    the elevation has been smoothed in the distance domain.
+
+    Read more in the :ref:`User Guide <climb>`.
+
+    Parameters
+    ----------
+    activity : DataFrame
+        The activity containing elevation and distance information.
+
+    smooth : str, {'savgol', 'median'} or None, default='savgol'
+        The filter used to smooth the elevation. If None, the raw elevation
+        is used. ``'savgol'`` falls back to ``'median'`` when the window or
+        the course is shorter than about 2 meters. Refer to
+        :func:`gradient_elevation` for more details.
+
+    window_length : float, default=100.
+        The length in meters of the smoothing window.
+
+    Returns
+    -------
+    ascent : float
+        The total ascent in meters.
+
+    Examples
+    --------
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.io import bikeread
+    >>> from skcycling.extraction import total_ascent
+    >>> ride = bikeread(load_fit()[0])
+    >>> ascent = total_ascent(ride)
+
+    """
+    _check_elevation_data(activity)
+    if smooth is None:
+        elevation = activity['elevation'].values
+    else:
+        elevation = _smooth_elevation(activity, smooth, window_length)[0]
+    diff_elevation = np.diff(elevation[np.isfinite(elevation)])
+    return float(diff_elevation[diff_elevation > 0].sum())
+
+
+def vam(activity, periods=60, smooth='savgol', window_length=100.):
+    """Compute the VAM (i.e. velocita ascensionale media) of an activity.
+
+    The VAM is the rate of ascent in meters per hour, computed over a sliding
+    window from the smoothed elevation.
+
+    Read more in the :ref:`User Guide <climb>`.
+
+    Parameters
+    ----------
+    activity : DataFrame
+        The activity containing elevation and distance information. The index
+        should contain the time of the samples.
+
+    periods : int, default=60
+        Periods to shift to compute the rate of ascent.
+
+    smooth : str, {'savgol', 'median'} or None, default='savgol'
+        The filter used to smooth the elevation. If None, the raw elevation
+        is used. ``'savgol'`` falls back to ``'median'`` when the window or
+        the course is shorter than about 2 meters. Refer to
+        :func:`gradient_elevation` for more details.
+
+    window_length : float, default=100.
+        The length in meters of the smoothing window.
+
+    Returns
+    -------
+    vam : Series
+        The rate of ascent in m.h^-1. It is negative during the descents.
+
+    Examples
+    --------
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.io import bikeread
+    >>> from skcycling.extraction import vam
+    >>> ride = bikeread(load_fit()[0])
+    >>> ride_vam = vam(ride, periods=300)
+
+    """
+    _check_elevation_data(activity)
+    if smooth is None:
+        elevation = activity['elevation']
+    else:
+        elevation = pd.Series(
+            _smooth_elevation(activity, smooth, window_length)[0],
+            index=activity.index)
+    diff_time = (activity.index.to_series().diff(periods=periods)
+                 .dt.total_seconds())
+    return elevation.diff(periods=periods) / diff_time * 3600
+
+
+def detect_climbs(activity, min_gradient=0.03, min_distance=500.,
+                  max_gap=100., smooth='savgol', window_length=100.):
+    """Detect the climbs of an activity.
+
+    A climb is a continuous segment in which the smoothed elevation gradient
+    is at least ``min_gradient``. The segments separated by less than
+    ``max_gap`` meters are merged and the climbs shorter than
+    ``min_distance`` are discarded.
+
+    Read more in the :ref:`User Guide <climb>`.
+
+    Parameters
+    ----------
+    activity : DataFrame
+        The activity containing elevation and distance information. The index
+        should contain the time of the samples.
+
+    min_gradient : float, default=0.03
+        The minimum gradient (grade) of a climb.
+
+    min_distance : float, default=500.
+        The minimum length of a climb in meters.
+
+    max_gap : float, default=100.
+        The maximum length in meters of a flatter section in a climb.
+
+    smooth : str, {'savgol', 'median'}, default='savgol'
+        The filter used to smooth the elevation. ``'savgol'`` falls back to
+        ``'median'`` when the window or the course is shorter than about 2
+        meters. Refer to :func:`gradient_elevation` for more details.
+
+    window_length : float, default=100.
+        The length in meters of the smoothing window.
+
+    Returns
+    -------
+    climbs : DataFrame, shape (n_climbs, 7)
+        The climbs found. The columns contain the time of the start and the
+        end of the climb, the distance in meters, the ascent in meters, the
+        average gradient, the duration, and the VAM in m.h^-1.
+
+    Examples
+    --------
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.io import bikeread
+    >>> from skcycling.extraction import detect_climbs
+    >>> ride = bikeread(load_fit()[0])
+    >>> climbs = detect_climbs(ride)
+
+    """
+    _check_elevation_data(activity)
+    elevation, gradient = _smooth_elevation(activity, smooth, window_length)
+    distance = activity['distance'].values
+
+    with np.errstate(invalid='ignore'):
+        climbing = gradient >= min_gradient
+    edges = np.diff(np.concatenate(([0], climbing.view(np.int8), [0])))
+    start = np.flatnonzero(edges == 1)
+    end = np.flatnonzero(edges == -1) - 1
+
+    # merge the segments separated by a short flatter section
+    if start.size:
+        keep = np.concatenate(
+            ([True], distance[start[1:]] - distance[end[:-1]] > max_gap))
+        start = start[keep]
+        end = end[np.concatenate((keep[1:], [True]))]
+
+    climb_distance = distance[end] - distance[start]
+    keep = climb_distance >= min_distance
+    start, end, climb_distance = start[keep], end[keep], climb_distance[keep]
+
+    ascent = elevation[end] - elevation[start]
+    duration = activity.index[end] - activity.index[start]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        climb_vam = ascent / duration.total_seconds().values * 3600
+    climbs = pd.DataFrame({'start': activity.index[start],
+                           'end': activity.index[end],
+                           'distance': climb_distance,
+                           'ascent': ascent,
+                           'gradient': ascent / climb_distance,
+                           'duration': duration,
+                           'vam': climb_vam},
+                          columns=CLIMB_FIELDS)
+    return climbs
@@ -0,0 +1,96 @@
+"""Extraction of the best times over distances."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import numpy as np
+import pandas as pd
+
+from ..utils.instrumentation import _stage
+
+DISTANCE_STEP = 100.
+
+
+def _cumulative_distance(activity):
+    """Get the time (in ns) and the non-decreasing distance of an activity.
+
+    The samples without distance are dropped and the small decreases of the
+    distance due to the GPS are removed.
+    """
+    if 'distance' not in activity.columns:
+        raise ValueError('The activity should contain a "distance" column.')
+    distance = activity['distance'].values.astype(np.float64)
+    valid = ~np.isnan(distance)
+    times = activity.index.values[valid].view(np.int64)
+    return times, np.maximum.accumulate(distance[valid])
+
+
+def activity_distance_profile(activity, distances=None):
+    """Compute the best time over different distances for an activity.
+
+    For each distance, the best time is the minimum elapsed time between two
+    samples of the activity separated by at least this distance. For each
+    sample, the first sample reaching the distance is found with a binary
+    search on the cumulative distance, such that the cost for a distance is
+    linear with the number of samples (up to a logarithmic factor).
+
+    Read more in the :ref:`User Guide <activity_distance_profile>`.
+
+    Parameters
+    ----------
+    activity : DataFrame
+        A pandas DataFrame with at least a ``'distance'`` column containing
+        the cumulative distance in meters and the indices are the information
+        about time. The activity can be read with
+        :func:`skcycling.io.bikeread`.
+
+    distances : array-like or None, default=None
+        The distances in meters for which the best time is computed. By
+        default, every 100 meters up to the distance of the activity. The
+        distances which are longer than the activity are set to NaT.
+
+    Returns
+    -------
+    distance_profile : Series
+        A pandas Series indexed by the distances and containing the best
+        times.
+
+    Examples
+    --------
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.io import bikeread
+    >>> from skcycling.extraction import activity_distance_profile
+    >>> ride = bikeread(load_fit()[0])
+    >>> distance_profile = activity_distance_profile(
+    ...     ride, distances=[1000, 5000, 10000])
+    >>> distance_profile  # doctest: +NORMALIZE_WHITESPACE
+    1000.0    00:01:30
+    5000.0    00:08:41
+    10000.0   00:17:32
+    Name: 2014-05-07 12:26:22, dtype: timedelta64[ns]
+
+    """
+    times, distance = _cumulative_distance(activity)
+    if distances is None:
+        total_distance = distance[-1] - distance[0] if distance.size else 0.
+        distances = np.arange(1, int(total_distance // DISTANCE_STEP) + 1,
+                              dtype=np.float64) * DISTANCE_STEP
+    distances = np.asarray(distances, dtype=np.float64)
+
+    best_times = np.full(distances.shape, np.iinfo(np.int64).min,
+                         dtype=np.int64)
+    with _stage('extraction.distance_profile') as stage:
+        for idx_distance, window_distance in enumerate(distances):
+            # first sample which is at least at window_distance of each sample
+            end = np.searchsorted(distance, distance + window_distance,
+                                  side='left')
+            valid = end < distance.size
+            if valid.any():
+                best_times[idx_distance] = np.min(
+                    times[end[valid]] - times[valid])
+        distance_profile = pd.Series(
+            pd.to_timedelta(best_times), index=pd.Index(distances),
+            name=pd.Timestamp(activity.index[0]))
+        stage.record(distance_profile)
+    return distance_profile
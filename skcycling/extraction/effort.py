@@ -0,0 +1,214 @@
+"""Detection of the efforts of an activity."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+from __future__ import division
+
+import numpy as np
+import pandas as pd
+
+from .._config import _get_kernels
+from ..exceptions import MissingDataError
+from ..utils.instrumentation import _stage
+from .power_profile import _check_duration
+
+EFFORT_FIELDS = ('start', 'end', 'duration', 'power', 'work')
+
+EFFORT_METHODS = ('pelt', 'hysteresis')
+
+# the minimum number of samples of the segments found by PELT
+PELT_MIN_SIZE = 5
+
+
+def _noise_variance(power):
+    """Robust estimate of the variance of the noise of the power.
+
+    The standard deviation is estimated from the median absolute deviation of
+    the first differences, which is not affected by the changes of intensity.
+    """
+    diff = np.diff(power)
+    if not diff.size:
+        return 0.
+    mad = np.median(np.abs(diff - np.median(diff)))
+    return (mad / 0.6745) ** 2 / 2
+
+
+def _segments_above(above):
+    """Start and end (excluded) of the runs of True values."""
+    edges = np.diff(np.concatenate(([0], above.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _pelt_efforts(cumsum, cumsum_squared, threshold, penalty):
+    """Efforts as the segments of constant power above the threshold."""
+    ends = _get_kernels('extraction._effort')._pelt(
+        cumsum, cumsum_squared, penalty, PELT_MIN_SIZE)
+    starts = np.concatenate(([0], ends[:-1]))
+    segment_power = (cumsum[ends] - cumsum[starts]) / (ends - starts)
+    # the consecutive segments above the threshold form a single effort
+    return _segments_above(np.repeat(segment_power >= threshold,
+                                     ends - starts))
+
+
+def _hysteresis_efforts(cumsum, high_threshold, low_threshold, window_width):
+    """Efforts starting when the smoothed power reaches the high threshold and
+    ending when it goes below the low threshold."""
+    n_samples = cumsum.size - 1
+    # centered rolling mean obtained from the cumulative sum
+    samples = np.arange(n_samples)
+    window_start = np.clip(samples - window_width // 2, 0, n_samples)
+    window_end = np.clip(samples - window_width // 2 + window_width, 0,
+                         n_samples)
+    smooth_power = ((cumsum[window_end] - cumsum[window_start]) /
+                    (window_end - window_start))
+
+    starts, ends = _segments_above(smooth_power >= low_threshold)
+    idx_high = np.flatnonzero(smooth_power >= high_threshold)
+    # an effort starts at the first sample above the high threshold of each
+    # run above the low threshold
+    first_high = np.searchsorted(idx_high, starts)
+    valid = first_high < idx_high.size
+    valid[valid] = idx_high[first_high[valid]] < ends[valid]
+    return idx_high[first_high[valid]], ends[valid]
+
+
+def detect_efforts(activity, mpa, method='pelt', intensity=0.75,
+                   hysteresis=0.1, min_duration=30, max_gap=10, penalty=None,
+                   window_width=30):
+    """Detect the efforts of an activity.
+
+    An effort is a period during which the power is above a threshold
+    relative to the maximum power aerobic. Two methods are available:
+
+    * ``'pelt'``: the power is segmented in pieces of constant power with the
+      Pruned Exact Linear Time (PELT) change-point method [1]_ and the
+      consecutive segments with a mean power above the threshold form the
+      efforts. The cost of each segment is obtained in constant time from the
+      cumulative sums of the power and of its square, such that the
+      segmentation is linear with the duration of the activity;
+    * ``'hysteresis'``: an effort starts when the power, smoothed with a
+      rolling mean, reaches the threshold and ends when it goes below the
+      threshold minus ``hysteresis``.
+
+    In both cases, the efforts separated by less than ``max_gap`` are merged
+    and the efforts shorter than ``min_duration`` are discarded. The missing
+    power is considered as 0 W.
+
+    Read more in the :ref:`User Guide <efforts>`.
+
+    Parameters
+    ----------
+    activity : DataFrame
+        A pandas DataFrame with at least a ``'power'`` column and the indices
+        are the information about time, sampled at 1 Hz. The activity can be
+        read with :func:`skcycling.io.bikeread`.
+
+    mpa : float
+        Maximum power aerobic. Use :func:`skcycling.metrics.ftp2mpa` if you
+        use the functional threshold power metric.
+
+    method : str, {'pelt', 'hysteresis'}, default='pelt'
+        The method used to detect the efforts.
+
+    intensity : float, default=0.75
+        The threshold of the efforts as a ratio of the maximum power aerobic.
+        The default is the lower bound of the I4 zone of the ESIE scale (i.e.
+        about the functional threshold power).
+
+    hysteresis : float, default=0.1
+        The ratio of the maximum power aerobic below the threshold at which an
+        effort ends with ``method='hysteresis'``.
+
+    min_duration : Timedelta, timedelta, int, or str, default=30
+        The minimum duration of an effort. An integer represents seconds.
+
+    max_gap : Timedelta, timedelta, int, or str, default=10
+        The maximum duration of a recovery within an effort. An integer
+        represents seconds.
+
+    penalty : float or None, default=None
+        The penalty, in W^2, added for each segment with ``method='pelt'``.
+        The larger the penalty, the fewer the segments. By default, the
+        penalty is ``4 * sigma ** 2 * log(n_samples)`` where ``sigma`` is a
+        robust estimate of the standard deviation of the noise of the power.
+
+    window_width : int, default=30
+        The width, in samples, of the rolling mean smoothing the power with
+        ``method='hysteresis'``.
+
+    Returns
+    -------
+    efforts : DataFrame, shape (n_efforts, 5)
+        The efforts found. The columns contain the time of the start and the
+        end (excluded) of the effort, the duration, the mean power in watts,
+        and the work in kJ.
+
+    References
+    ----------
+    .. [1] Killick, R., P. Fearnhead, and I. A. Eckley. "Optimal detection of
+       changepoints with a linear computational cost." Journal of the
+       American Statistical Association 107.500 (2012): 1590-1598.
+
+    Examples
+    --------
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.io import bikeread
+    >>> from skcycling.extraction import detect_efforts
+    >>> ride = bikeread(load_fit()[0])
+    >>> efforts = detect_efforts(ride, mpa=300)
+    >>> efforts[['start', 'duration', 'power']]
+                    start duration       power
+    0 2014-05-07 12:28:56 00:01:10  286.942857
+    1 2014-05-07 12:39:31 00:00:39  331.102564
+    2 2014-05-07 12:46:29 00:00:32  233.375000
+    3 2014-05-07 12:49:10 00:00:32  266.375000
+    4 2014-05-07 12:54:21 00:01:30  267.555556
+
+    """
+    if 'power' not in activity.columns:
+        raise MissingDataError('To detect the efforts, power data are'
+                               ' required. Got {} fields.'
+                               .format(activity.columns))
+    if method not in EFFORT_METHODS:
+        raise ValueError('"method" should be one of {}. Got {!r} instead.'
+                         .format(EFFORT_METHODS, method))
+    min_duration = int(_check_duration(min_duration).total_seconds())
+    max_gap = int(_check_duration(max_gap).total_seconds())
+
+    power = np.nan_to_num(activity['power'].values.astype(np.float64))
+    with _stage('extraction.efforts') as stage:
+        # the cumulative sums are shared by the segmentation and the summary
+        # of the efforts
+        cumsum = np.concatenate(([0.], np.cumsum(power)))
+        if method == 'pelt':
+            if penalty is None:
+                penalty = (4 * _noise_variance(power) *
+                           np.log(max(power.size, 2)))
+            cumsum_squared = np.concatenate(([0.], np.cumsum(power ** 2)))
+            starts, ends = _pelt_efforts(cumsum, cumsum_squared,
+                                         intensity * mpa, float(penalty))
+        else:
+            starts, ends = _hysteresis_efforts(
+                cumsum, intensity * mpa, (intensity - hysteresis) * mpa,
+                window_width)
+
+        # merge the efforts separated by a short recovery
+        if starts.size:
+            keep = np.concatenate(([True], starts[1:] - ends[:-1] > max_gap))
+            starts = starts[keep]
+            ends = ends[np.concatenate((keep[1:], [True]))]
+        keep = ends - starts >= min_duration
+        starts, ends = starts[keep], ends[keep]
+
+        duration = pd.to_timedelta(ends - starts, unit='s')
+        work = cumsum[ends] - cumsum[starts]
+        efforts = pd.DataFrame({'start': activity.index[starts],
+                                'end': activity.index[starts] + duration,
+                                'duration': duration,
+                                'power': work / (ends - starts),
+                                'work': work / 1000.},
+                               columns=EFFORT_FIELDS)
+        stage.record(efforts)
+    return efforts
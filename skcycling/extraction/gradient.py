@@ -8,10 +8,24 @@ from __future__ import division
 
 from collections import Iterable
 
+import numpy as np
 import pandas as pd
 
 from ..exceptions import MissingDataError
 
+GRADIENT_OUTPUTS = ('frame', 'array')
+
+SMOOTH_METHODS = ('savgol', 'median')
+
+# channels derived by extract_channels and the data required to compute them
+CHANNELS = ('acceleration', 'gradient-elevation', 'gradient-heart-rate')
+CHANNELS_DATA = {'acceleration': ('speed',),
+                 'gradient-elevation': ('elevation', 'distance'),
+                 'gradient-heart-rate': ('heart-rate',)}
+# spacing in meters of the distance grid on which the elevation is smoothed
+DISTANCE_STEP = 1.
+SAVGOL_POLYORDER = 2
+
 
 def acceleration(activity, periods=5, append=True):
     """Compute the acceleration (i.e. speed gradient).
@@ -28,13 +42,14 @@ def acceleration(activity, periods=5, append=True):
 
     append : bool, optional
         Whether to append the acceleration to the original activity (default)
-        or to only return the acceleration as a Series.
+        or to only return the acceleration as a Series. The original activity
+        is not modified: a new DataFrame sharing its data is returned.
 
     Returns
     -------
     data : DataFrame or Series
-        The original activity with an additional column containing the
-        acceleration or a single Series containing the acceleration.
+        The activity with an additional column containing the acceleration or
+        a single Series containing the acceleration.
 
     Examples
     --------
@@ -53,13 +68,95 @@ def acceleration(activity, periods=5, append=True):
     acceleration = activity['speed'].diff(periods=periods) / periods
 
     if append:
+        activity = activity.copy(deep=False)
         activity['acceleration'] = acceleration
         return activity
     else:
         return acceleration
 
 
-def gradient_elevation(activity, periods=5, append=True):
+def _smooth_elevation(activity, smooth, window_length):
+    """Smooth the elevation in the distance domain.
+
+    The elevation is interpolated on a regular distance grid, smoothed with
+    a Savitzky-Golay or a median filter, and interpolated back at each
+    sample. Therefore, the smoothing does not depend on the speed and the
+    samples without any progression do not lead to infinite gradients.
+
+    Parameters
+    ----------
+    activity : DataFrame
+        The activity containing elevation and distance information.
+
+    smooth : str, {'savgol', 'median'}
+        The filter used to smooth the elevation. The median filter is used
+        when the window is too short to fit the Savitzky-Golay filter.
+
+    window_length : float
+        The length of the window of the filter in meters.
+
+    Returns
+    -------
+    elevation : ndarray, shape (n_samples,)
+        The smoothed elevation.
+
+    gradient : ndarray, shape (n_samples,)
+        The gradient of the smoothed elevation.
+
+    """
+    if smooth not in SMOOTH_METHODS:
+        raise ValueError('"smooth" should be one of {}. Got {!r} instead.'
+                         .format(SMOOTH_METHODS, smooth))
+    if window_length <= 0:
+        raise ValueError('"window_length" should be strictly positive. Got'
+                         ' {} instead.'.format(window_length))
+
+    distance = activity['distance'].values.astype(np.float64)
+    elevation = activity['elevation'].values.astype(np.float64)
+    elevation_smooth = np.full(distance.shape, np.nan)
+    gradient = np.full(distance.shape, np.nan)
+    mask_samples = np.bitwise_and(np.isfinite(distance),
+                                  np.isfinite(elevation))
+    if np.count_nonzero(mask_samples) < 2:
+        return elevation_smooth, gradient
+
+    # the distance is cumulative and should never decrease
+    distance = np.maximum.accumulate(distance[mask_samples])
+    elevation = elevation[mask_samples]
+    grid = np.arange(distance[0], distance[-1] + DISTANCE_STEP,
+                     DISTANCE_STEP)
+    elevation_grid = np.interp(grid, distance, elevation)
+
+    # odd number of grid points in the window, at most the size of the grid
+    n_window = int(window_length / DISTANCE_STEP) // 2 * 2 + 1
+    n_window = min(n_window, grid.size - (1 - grid.size % 2))
+    # the Savitzky-Golay filter cannot be fitted on a window shorter than
+    # its polynomial order, the median filter is used instead
+    # imported here since scipy.signal is slow to import
+    if smooth == 'savgol' and n_window > SAVGOL_POLYORDER:
+        from scipy.signal import savgol_filter
+        elevation_grid_smooth = savgol_filter(
+            elevation_grid, n_window, SAVGOL_POLYORDER)
+        gradient_grid = savgol_filter(
+            elevation_grid, n_window, SAVGOL_POLYORDER, deriv=1,
+            delta=DISTANCE_STEP)
+    else:
+        from scipy.ndimage import median_filter, uniform_filter1d
+        elevation_grid_smooth = median_filter(
+            elevation_grid, size=n_window, mode='nearest')
+        gradient_grid = uniform_filter1d(
+            np.gradient(elevation_grid_smooth, DISTANCE_STEP)
+            if grid.size > 1 else np.zeros(grid.size),
+            size=n_window, mode='nearest')
+
+    elevation_smooth[mask_samples] = np.interp(distance, grid,
+                                               elevation_grid_smooth)
+    gradient[mask_samples] = np.interp(distance, grid, gradient_grid)
+    return elevation_smooth, gradient
+
+
+def gradient_elevation(activity, periods=5, append=True, smooth=None,
+                       window_length=100.):
     """Compute the elevation gradient.
 
     Read more in the :ref:`User Guide <gradient>`.
@@ -74,14 +171,35 @@ def gradient_elevation(activity, periods=5, append=True):
 
     append : bool, optional
         Whether to append the elevation gradient to the original activity
-        (default) or to only return the elevation gradient as a Series.
+        (default) or to only return the elevation gradient as a Series. The
+        original activity is not modified: a new DataFrame sharing its data
+        is returned.
+
+    smooth : str, {'savgol', 'median'} or None, default=None
+        The filter used to smooth the elevation before computing the
+        gradient. The elevation is smoothed in the distance domain such that
+        the samples without progression do not lead to infinite gradients:
+
+        * ``None``: the gradient is computed from the raw elevation with
+          ``periods``.
+        * ``'savgol'``: the gradient is the derivative of a Savitzky-Golay
+          filter of the elevation. The filter needs at least 3 points of the
+          1 meter distance grid: with a ``window_length`` below 2 meters or a
+          course shorter than about 2 meters, the ``'median'`` filter is used
+          instead.
+        * ``'median'``: the elevation is smoothed with a median filter,
+          robust to the spikes, and the gradient is averaged over the
+          window.
+
+    window_length : float, default=100.
+        The length in meters of the smoothing window. Only used when
+        ``smooth`` is not None.
 
     Returns
     -------
     data : DataFrame or Series
-        The original activity with an additional column containing the
-        elevation gradient or a single Series containing the elevation
-        gradient.
+        The activity with an additional column containing the elevation
+        gradient or a single Series containing the elevation gradient.
 
     Examples
     --------
@@ -90,6 +208,7 @@ def gradient_elevation(activity, periods=5, append=True):
     >>> from skcycling.extraction import gradient_elevation
     >>> ride = bikeread(load_fit()[0])
     >>> new_ride = gradient_elevation(ride)
+    >>> new_ride = gradient_elevation(ride, smooth='savgol')
 
     """
     if not {'elevation', 'distance'}.issubset(activity.columns):
@@ -97,11 +216,17 @@ def gradient_elevation(activity, periods=5, append=True):
                                'and distance data are required. Got {} fields.'
                                .format(activity.columns))
 
-    diff_elevation = activity['elevation'].diff(periods=periods)
-    diff_distance = activity['distance'].diff(periods=periods)
-    gradient_elevation = diff_elevation / diff_distance
+    if smooth is None:
+        diff_elevation = activity['elevation'].diff(periods=periods)
+        diff_distance = activity['distance'].diff(periods=periods)
+        gradient_elevation = diff_elevation / diff_distance
+    else:
+        gradient_elevation = pd.Series(
+            _smooth_elevation(activity, smooth, window_length)[1],
+            index=activity.index)
 
     if append:
+        activity = activity.copy(deep=False)
         activity['gradient-elevation'] = gradient_elevation
         return activity
     else:
@@ -123,14 +248,15 @@ def gradient_heart_rate(activity, periods=5, append=True):
 
     append : bool, optional
         Whether to append the heart-rate gradient to the original activity
-        (default) or to only return the heart-rate gradient as a Series.
+        (default) or to only return the heart-rate gradient as a Series. The
+        original activity is not modified: a new DataFrame sharing its data
+        is returned.
 
     Returns
     -------
     data : DataFrame or Series
-        The original activity with an additional column containing the
-        heart-rate gradient or a single Series containing the heart-rate
-        gradient.
+        The activity with an additional column containing the heart-rate
+        gradient or a single Series containing the heart-rate gradient.
 
     Examples
     --------
@@ -154,15 +280,63 @@ def gradient_heart_rate(activity, periods=5, append=True):
     gradient_heart_rate = activity['heart-rate'].diff(periods=periods)
 
     if append:
+        activity = activity.copy(deep=False)
         activity['gradient-heart-rate'] = gradient_heart_rate
         return activity
     else:
         return gradient_heart_rate
 
 
-def gradient_activity(activity, periods=1, append=True, columns=None):
+def _diff(values, periods, out):
+    """Compute ``values[t] - values[t - periods]`` into ``out``.
+
+    The first ``periods`` samples (or the last ones for negative periods) are
+    set to NaN as in :meth:`pandas.DataFrame.diff`.
+
+    """
+    n_samples = values.shape[0]
+    if abs(periods) >= n_samples:
+        out.fill(np.nan)
+    elif periods >= 0:
+        out[:periods] = np.nan
+        np.subtract(values[periods:], values[:n_samples - periods],
+                    out=out[periods:])
+    else:
+        out[periods:] = np.nan
+        np.subtract(values[:periods], values[-periods:], out=out[:periods])
+    return out
+
+
+def _gradient_buffer(data, periods, buffer, offset=0):
+    """Fill a buffer with the gradients of the data for several periods.
+
+    Parameters
+    ----------
+    data : ndarray, shape (n_samples, n_columns)
+        The data to differentiate.
+
+    periods : list of int
+        The periods to shift to compute the gradients.
+
+    buffer : ndarray, shape (n_samples, n_slots, n_columns)
+        The buffer in which the gradient computed with ``periods[k]`` is
+        written in the slot ``offset + k``.
+
+    offset : int, default=0
+        The slot of the first gradient.
+
+    """
+    for slot, period in enumerate(periods, start=offset):
+        _diff(data, period, buffer[:, slot, :])
+
+
+def gradient_activity(activity, periods=1, append=True, columns=None,
+                      output='frame'):
     """Compute the gradient for all given columns.
 
+    The gradients of all the periods are computed in a single preallocated
+    buffer without copying the activity for each period.
+
     Read more in the :ref:`User Guide <gradient>`.
 
     Parameters
@@ -175,15 +349,25 @@ def gradient_activity(activity, periods=1, append=True, columns=None):
         several gradient will be computed.
 
     append : bool, optional
-        Whether to append the gradients to the original activity.
+        Whether to append the gradients to the original activity. Only used
+        when ``output='frame'``.
 
     columns : list, optional
         The name of the columns to use to compute the gradient. By default, all
         the columns are used.
 
+    output : str, {'frame', 'array'}, default='frame'
+        The type of the output:
+
+        * ``'frame'``: a DataFrame whose columns are indexed by the period
+          (``'gradient_{period}'``) and the name of the original column. The
+          DataFrame is a view on the buffer of the gradients.
+        * ``'array'``: the buffer of the gradients as an array of shape
+          (n_periods, n_samples, n_columns).
+
     Returns
     -------
-    gradient : DataFrame
+    gradient : DataFrame or ndarray, shape (n_periods, n_samples, n_columns)
         The computed gradient from the activity.
 
     Examples
@@ -192,24 +376,177 @@ def gradient_activity(activity, periods=1, append=True, columns=None):
     >>> from skcycling.io import bikeread
     >>> from skcycling.extraction import gradient_activity
     >>> ride = bikeread(load_fit()[0], drop_nan='columns')
-    >>> new_ride = acceleration(ride)
+    >>> new_ride = gradient_activity(ride, periods=range(1, 61))
+    >>> gradient = gradient_activity(ride, periods=range(1, 61),
+    ...                              output='array')
+    >>> gradient.shape
+    (60, 2257, 5)
 
     """
+    if output not in GRADIENT_OUTPUTS:
+        raise ValueError('"output" should be one of {}. Got {!r} instead.'
+                         .format(GRADIENT_OUTPUTS, output))
+
     if columns is not None:
         data = activity[columns]
     else:
         data = activity
 
     if isinstance(periods, Iterable):
-        gradient = [data.diff(periods=p) for p in periods]
-        gradient_name = ['gradient_{}'.format(p) for p in periods]
+        periods = [int(p) for p in periods]
     else:
-        gradient = [data.diff(periods=periods)]
-        gradient_name = ['gradient_{}'.format(periods)]
+        periods = [int(periods)]
+    gradient_name = ['gradient_{}'.format(p) for p in periods]
+
+    # the original data are stored in the buffer as well when they correspond
+    # to the whole activity such that the output does not need to be copied
+    store_original = (output == 'frame' and append and columns is None and
+                      all(dtype == np.float64 for dtype in activity.dtypes))
+    offset = 1 if store_original else 0
+    values = data.values.astype(np.float64, copy=False)
+    n_samples, n_columns = values.shape
+
+    # the samples are the slowest varying dimension such that the buffer can
+    # be seen as a 2-D array (n_samples, n_slots * n_columns) by the DataFrame
+    buffer = np.empty((n_samples, offset + len(periods), n_columns))
+    if store_original:
+        buffer[:, 0, :] = values
+    _gradient_buffer(values, periods, buffer, offset=offset)
+
+    if output == 'array':
+        return buffer.transpose(1, 0, 2)
+
+    if store_original:
+        gradient_name = ['original'] + gradient_name
+    gradient = pd.DataFrame(
+        buffer.reshape(n_samples, -1), index=data.index,
+        columns=pd.MultiIndex.from_product([gradient_name, data.columns]),
+        copy=False)
 
-    if append:
+    if append and not store_original:
         # prepend the original information
-        gradient = [activity] + gradient
-        gradient_name = ['original'] + gradient_name
+        original = pd.concat([activity], axis=1, keys=['original'])
+        return pd.concat([original, gradient], axis=1)
+
+    return gradient
+
+
+def _compute_channel(activity, channel, periods, out, smooth, window_length):
+    """Compute a derived channel of an activity into ``out``."""
+    if channel == 'acceleration':
+        _diff(activity['speed'].values, periods, out)
+        out /= periods
+    elif channel == 'gradient-elevation':
+        if smooth is None:
+            _diff(activity['elevation'].values, periods, out)
+            diff_distance = _diff(activity['distance'].values, periods,
+                                  np.empty(out.shape))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out /= diff_distance
+        else:
+            out[:] = _smooth_elevation(activity, smooth, window_length)[1]
+    else:
+        _diff(activity['heart-rate'].values, periods, out)
+    return out
+
+
+def extract_channels(activity, channels=None, periods=5, append=True,
+                     out=None, smooth=None, window_length=100.):
+    """Compute several derived channels of an activity in a single pass.
+
+    The channels are computed from the arrays of the activity which is never
+    modified nor copied. They can be written in a buffer given by the caller
+    to avoid any allocation.
+
+    Read more in the :ref:`User Guide <gradient>`.
+
+    Parameters
+    ----------
+    activity : DataFrame
+        The activity containing the data required by the channels.
+
+    channels : list of str or None, default=None
+        The channels to compute among ``'acceleration'``,
+        ``'gradient-elevation'``, and ``'gradient-heart-rate'``. By default,
+        all the channels which can be computed from the activity are
+        computed.
+
+    periods : int, default=5
+        Periods to shift to compute the channels.
+
+    append : bool, default=True
+        Whether to return a new DataFrame sharing the data of the activity
+        with the additional channels, or a DataFrame containing only the
+        channels. Not used when ``out`` is given.
+
+    out : ndarray, shape (n_samples, n_channels) or None, default=None
+        The buffer in which the channels are written, in the order of
+        ``channels``.
+
+    smooth : str, {'savgol', 'median'} or None, default=None
+        The filter used to smooth the elevation before computing the
+        gradient. Refer to :func:`gradient_elevation` for more details.
+
+    window_length : float, default=100.
+        The length in meters of the smoothing window. Only used when
+        ``smooth`` is not None.
+
+    Returns
+    -------
+    data : DataFrame or ndarray, shape (n_samples, n_channels)
+        The activity with the additional channels, the channels only, or the
+        buffer ``out`` when given.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.io import bikeread
+    >>> from skcycling.extraction import extract_channels
+    >>> ride = bikeread(load_fit()[0])
+    >>> new_ride = extract_channels(
+    ...     ride, channels=['acceleration', 'gradient-elevation'])
+    >>> buffer = np.empty((ride.shape[0], 2))
+    >>> buffer = extract_channels(
+    ...     ride, channels=['acceleration', 'gradient-elevation'],
+    ...     out=buffer)
 
-    return pd.concat(gradient, axis=1, keys=gradient_name)
+    """
+    if channels is None:
+        channels = [channel for channel in CHANNELS
+                    if set(CHANNELS_DATA[channel]).issubset(activity.columns)]
+    else:
+        channels = list(channels)
+        for channel in channels:
+            if channel not in CHANNELS:
+                raise ValueError('The channels should be some of {}. Got'
+                                 ' {!r} instead.'.format(CHANNELS, channel))
+            if not set(CHANNELS_DATA[channel]).issubset(activity.columns):
+                raise MissingDataError(
+                    'To compute the {} channel, {} data are required. Got {}'
+                    ' fields.'.format(channel,
+                                      ' and '.join(CHANNELS_DATA[channel]),
+                                      activity.columns))
+
+    n_samples = activity.shape[0]
+    if out is not None:
+        if out.shape != (n_samples, len(channels)):
+            raise ValueError('"out" should be of shape {}. Got {} instead.'
+                             .format((n_samples, len(channels)), out.shape))
+        buffer = out.T
+    else:
+        buffer = np.empty((len(channels), n_samples))
+
+    for channel, channel_buffer in zip(channels, buffer):
+        _compute_channel(activity, channel, periods, channel_buffer, smooth,
+                         window_length)
+
+    if out is not None:
+        return out
+    if not append:
+        return pd.DataFrame(buffer.T, index=activity.index, columns=channels,
+                            copy=False)
+    activity = activity.copy(deep=False)
+    for channel, channel_buffer in zip(channels, buffer):
+        activity[channel] = channel_buffer
+    return activity
@@ -10,11 +10,41 @@ from numbers import Integral
 import numpy as np
 import pandas as pd
 
-from ._power_profile import max_mean_power_interval
-from ._power_profile import _associated_data_power_profile
+from .._config import _effective_num_threads
+from .._config import _get_kernels
+from ..utils.instrumentation import _stage
+from ..utils.validation import FLOATING_DTYPES
+from ..utils.validation import check_dtype
+from ._power_profile_numpy import _associated_data_power_profile
+from ._power_profile_numpy import _window_sums
 
+BEST_EFFORTS_DURATIONS = ('1min', '5min', '20min')
 
-def activity_power_profile(activity, max_duration=None):
+FATIGUE_WORK_THRESHOLDS = (0., 500., 1000., 1500., 2000., 2500., 3000.)
+
+
+def _check_duration(duration):
+    """Convert a duration to a Timedelta. An integer represents seconds."""
+    if isinstance(duration, Integral):
+        return pd.Timedelta(seconds=duration)
+    return pd.Timedelta(duration)
+
+
+def _as_floating(values, dtype):
+    """Convert the values which are not supported by the kernels.
+
+    The kernels accept single and double precision and always accumulate in
+    double precision. The other dtypes (e.g. the integer power of a FIT file)
+    are converted to ``dtype``.
+    """
+    values = np.asarray(values)
+    if values.dtype.name not in FLOATING_DTYPES:
+        values = values.astype(dtype)
+    return values
+
+
+def activity_power_profile(activity, max_duration=None, num_threads=None,
+                           dtype=None):
     """Compute the power profile for an activity.
 
     Read more in the :ref:`User Guide <activity_power_profile>`.
@@ -31,6 +61,17 @@ def activity_power_profile(activity, max_duration=None):
         default, it will be computed for the duration of the activity. An
         integer represents seconds.
 
+    num_threads : int or None, default=None
+        The number of OpenMP threads used by the kernels. By default, the
+        number of threads set with :func:`skcycling.set_num_threads` is used.
+
+    dtype : {np.float32, np.float64} or None, default=None
+        The dtype of the power-profile. The means are accumulated in double
+        precision whatever the dtype; ``np.float32`` only rounds the result
+        to a relative precision of about ``1e-7``. By default, ``np.float32``
+        is used when the power of the activity is stored in single precision
+        and ``np.float64`` otherwise.
+
     Returns
     -------
     power_profile : Series
@@ -59,10 +100,8 @@ def activity_power_profile(activity, max_duration=None):
     """
     if max_duration is None:
         max_duration = pd.Timedelta(seconds=activity.shape[0])
-    elif isinstance(max_duration, Integral):
-        max_duration = pd.Timedelta(seconds=max_duration)
     else:
-        max_duration = pd.Timedelta(max_duration)
+        max_duration = _check_duration(max_duration)
 
     max_duration = min(
         max_duration,
@@ -70,13 +109,23 @@ def activity_power_profile(activity, max_duration=None):
 
     activity_power = activity['power']
     activity_complement = activity.drop(['power'], axis=1)
+    if dtype is None:
+        dtype = (np.float32 if activity_power.dtype == np.float32
+                 else np.float64)
+    dtype = check_dtype(dtype)
+    num_threads = _effective_num_threads(num_threads)
+    kernels = _get_kernels()
+    power_values = _as_floating(activity_power.values, dtype)
 
     # use the threading backend since we release the GIL.
-    power_profile, power_profile_idx = zip(
-        *[max_mean_power_interval(activity_power.values, duration)
-          for duration in range(1, max_duration.seconds)])
-    power_profile = np.array(power_profile)
-    power_profile_idx = np.array(power_profile_idx)
+    with _stage('extraction.power_profile') as stage:
+        power_profile, power_profile_idx = zip(
+            *[kernels.max_mean_power_interval(power_values, duration,
+                                              num_threads)
+              for duration in range(1, max_duration.seconds)])
+        power_profile = np.array(power_profile, dtype=dtype)
+        power_profile_idx = np.array(power_profile_idx)
+        stage.record(power_profile)
 
     series_index = pd.timedelta_range(
         "00:00:01", timedelta(seconds=max_duration.seconds - 1), freq='s')
@@ -85,16 +134,284 @@ def activity_power_profile(activity, max_duration=None):
     # if some additional data are available, we will add them as them on the
     # side of the power-profile.
     if not activity_complement.empty:
-        complement_data = {col: pd.Series(
-            _associated_data_power_profile(activity_complement[col].values,
-                                           power_profile_idx,
-                                           np.arange(1, max_duration.seconds,
-                                                     dtype=int)),
-            index=series_index, name=series_name)
-                           for col in activity_complement.columns}
-        complement_data['power'] = pd.Series(power_profile, index=series_index,
-                                             name=series_name)
-        return pd.concat(complement_data)
+        with _stage('extraction.complementary_data') as stage:
+            complement_data = {col: pd.Series(
+                kernels._associated_data_power_profile(
+                    _as_floating(activity_complement[col].values, dtype),
+                    power_profile_idx,
+                    np.arange(1, max_duration.seconds, dtype=int),
+                    num_threads).astype(dtype, copy=False),
+                index=series_index, name=series_name)
+                               for col in activity_complement.columns}
+            complement_data['power'] = pd.Series(
+                power_profile, index=series_index, name=series_name)
+            power_profile = pd.concat(complement_data)
+            stage.record(power_profile)
+        return power_profile
 
     else:
         return pd.Series(power_profile, index=series_index, name=series_name)
+
+
+def activity_best_efforts(activity, durations=BEST_EFFORTS_DURATIONS,
+                          n_efforts=5):
+    """Find the best non-overlapping efforts of an activity.
+
+    For each duration, the efforts are the windows with the highest mean power
+    such that no two windows overlap: the best effort is the maximum of the
+    power-profile for this duration and the next efforts are searched
+    outside of the windows already selected. The mean power of all windows is
+    obtained with a cumulative sum such that finding several efforts costs
+    about the same as finding the best one.
+
+    Read more in the :ref:`User Guide <activity_power_profile>`.
+
+    Parameters
+    ----------
+    activity : DataFrame
+        A pandas DataFrame with at least a ``'power'`` column and the indices
+        are the information about time, sampled at 1 Hz. The activity can be
+        read with :func:`skcycling.io.bikeread`.
+
+    durations : list of Timedelta, timedelta, int, or str, \
+default=('1min', '5min', '20min')
+        The durations of the efforts. An integer represents seconds.
+
+    n_efforts : int, default=5
+        The maximum number of efforts to find for each duration. Less efforts
+        are returned when the activity is too short or when the power is
+        missing.
+
+    Returns
+    -------
+    efforts : DataFrame
+        The efforts indexed by the duration and the rank of the effort (1 for
+        the best effort). The columns contain the time of the start and the
+        end (excluded) of the window, the mean power, and the mean of the
+        other columns of the activity over the window.
+
+    Examples
+    --------
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.io import bikeread
+    >>> from skcycling.extraction import activity_best_efforts
+    >>> ride = bikeread(load_fit()[0])
+    >>> efforts = activity_best_efforts(ride, durations=['5min'], n_efforts=3)
+    >>> efforts['power'].round(1)  # doctest: +NORMALIZE_WHITESPACE
+    duration  rank
+    00:05:00  1       225.2
+              2       216.8
+              3       202.9
+    Name: power, dtype: float64
+
+    """
+    if not isinstance(n_efforts, Integral) or n_efforts < 1:
+        raise ValueError('"n_efforts" should be a positive integer. Got {!r}'
+                         ' instead.'.format(n_efforts))
+    durations = [_check_duration(duration) for duration in durations]
+    if any(duration.total_seconds() < 1 for duration in durations):
+        raise ValueError('The durations should be at least one second. Got'
+                         ' {!r} instead.'.format(durations))
+
+    power = activity['power'].values
+    channels = [col for col in activity.columns if col != 'power']
+    n_samples = power.shape[0]
+
+    index, starts, window_lengths = [], [], []
+    with _stage('extraction.best_efforts') as stage:
+        for duration in durations:
+            window_length = int(duration.total_seconds())
+            # same windows as the power-profile kernels, such that the best
+            # effort is the maximum of the power-profile
+            n_windows = n_samples - window_length
+            if n_windows <= 0:
+                continue
+            sums = _window_sums(power, window_length, n_windows)
+            # the windows which are not strictly positive or contain NaN
+            # values are never selected
+            with np.errstate(invalid='ignore'):
+                sums[~(sums > 0)] = -np.inf
+            for rank in range(1, n_efforts + 1):
+                start = int(np.argmax(sums))
+                if sums[start] == -np.inf:
+                    break
+                index.append((duration, rank))
+                starts.append(start)
+                window_lengths.append(window_length)
+                # exclude the windows overlapping the selected one
+                sums[max(start - window_length + 1, 0):
+                     start + window_length] = -np.inf
+
+        starts = np.array(starts, dtype=np.intp)
+        window_lengths = np.array(window_lengths, dtype=np.intp)
+        efforts = {col: _associated_data_power_profile(
+            activity[col].values, starts, window_lengths)
+            for col in ['power'] + channels}
+        efforts['start'] = activity.index[starts]
+        efforts['end'] = activity.index[starts] + pd.to_timedelta(
+            window_lengths, unit='s')
+        efforts = pd.DataFrame(
+            efforts, columns=['start', 'end', 'power'] + channels,
+            index=pd.MultiIndex.from_tuples(index,
+                                            names=['duration', 'rank']))
+        stage.record(efforts)
+    return efforts
+
+
+def activity_max_mean(activity, columns=None, max_duration=None,
+                      num_threads=None):
+    """Compute the maximum mean of several channels of an activity.
+
+    For each channel (e.g. power, heart-rate, cadence, or speed) and each
+    duration, the maximum mean is the highest mean of the channel sustained
+    during this duration, e.g. the peak heart-rate over 20 minutes. Contrary
+    to :func:`activity_power_profile` in which the other channels are
+    averaged over the best power window, each channel has its own best
+    window. All the channels are processed in a single pass sharing the
+    cumulative sums and the loop over the durations.
+
+    Read more in the :ref:`User Guide <activity_power_profile>`.
+
+    Parameters
+    ----------
+    activity : DataFrame
+        A pandas DataFrame in which the indices are the information about
+        time, sampled at 1 Hz. The activity can be read with
+        :func:`skcycling.io.bikeread`.
+
+    columns : list of str or None, default=None
+        The channels for which the maximum mean is computed. By default, all
+        the columns of the activity are used.
+
+    max_duration : Timedelta, timedelta, np.timedelta64, int, or str, optional
+        The maximum duration for which the maximum mean should be computed.
+        By default, it will be computed for the duration of the activity. An
+        integer represents seconds.
+
+    num_threads : int or None, default=None
+        The number of OpenMP threads used by the kernels. By default, the
+        number of threads set with :func:`skcycling.set_num_threads` is used.
+
+    Returns
+    -------
+    max_mean : DataFrame
+        A pandas DataFrame indexed by the durations and containing the maximum
+        mean of each channel. A duration for which all the windows of a
+        channel contain missing values is set to NaN.
+
+    Examples
+    --------
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.io import bikeread
+    >>> import pandas as pd
+    >>> from skcycling.extraction import activity_max_mean
+    >>> ride = bikeread(load_fit()[0])
+    >>> max_mean = activity_max_mean(ride, columns=['power', 'cadence'],
+    ...                              max_duration='20min')
+    >>> max_mean.loc[pd.to_timedelta(['1min', '5min', '19min'])]
+                   power    cadence
+    00:01:00  295.350000  99.433333
+    00:05:00  225.206667  90.323333
+    00:19:00  202.552632  84.151754
+
+    """
+    if columns is None:
+        columns = activity.columns.tolist()
+    if max_duration is None:
+        max_duration = pd.Timedelta(seconds=activity.shape[0])
+    else:
+        max_duration = _check_duration(max_duration)
+    max_duration = min(
+        max_duration,
+        activity.index[-1] - activity.index[0] + pd.Timedelta(seconds=1))
+    duration = np.arange(1, max_duration.seconds, dtype=np.intp)
+
+    data = np.ascontiguousarray(
+        _as_floating(activity[columns].values.T, np.float64))
+    with _stage('extraction.max_mean') as stage:
+        max_mean, _ = _get_kernels()._max_mean_channels(
+            data, duration, _effective_num_threads(num_threads))
+        max_mean = pd.DataFrame(
+            max_mean, columns=columns,
+            index=pd.to_timedelta(duration, unit='s'))
+        stage.record(max_mean)
+    return max_mean
+
+
+def activity_fatigue_profile(activity, work_thresholds=None,
+                             max_duration=None, num_threads=None):
+    """Compute the power-profile of an activity after some amount of work.
+
+    For each work threshold and each duration, the fatigue profile is the
+    maximum mean power of the windows starting once the work done since the
+    beginning of the activity reaches the threshold, e.g. the best 5 minutes
+    after 2000 kJ. The cumulative work is shared by all the thresholds and
+    all the thresholds are processed in a single pass for each duration.
+
+    Read more in the :ref:`User Guide <activity_fatigue_profile>`.
+
+    Parameters
+    ----------
+    activity : DataFrame
+        A pandas DataFrame with at least a ``'power'`` column and the indices
+        are the information about time, sampled at 1 Hz. The activity can be
+        read with :func:`skcycling.io.bikeread`.
+
+    work_thresholds : array-like or None, default=None
+        The work, in kJ, which should be done before the start of the efforts.
+        By default, every 500 kJ from 0 to 3000 kJ.
+
+    max_duration : Timedelta, timedelta, np.timedelta64, int, or str, optional
+        The maximum duration for which the fatigue profile should be computed.
+        By default, it will be computed for the duration of the activity. An
+        integer represents seconds.
+
+    num_threads : int or None, default=None
+        The number of OpenMP threads used by the kernels. By default, the
+        number of threads set with :func:`skcycling.set_num_threads` is used.
+
+    Returns
+    -------
+    fatigue_profile : DataFrame
+        A pandas DataFrame indexed by the durations and with a column for each
+        work threshold. The durations which cannot be sustained after a
+        threshold are set to NaN.
+
+    Examples
+    --------
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.io import bikeread
+    >>> import pandas as pd
+    >>> from skcycling.extraction import activity_fatigue_profile
+    >>> ride = bikeread(load_fit()[0])
+    >>> fatigue_profile = activity_fatigue_profile(
+    ...     ride, work_thresholds=[0, 100, 300], max_duration='10min')
+    >>> fatigue_profile.loc[pd.to_timedelta(['1min', '5min'])]
+    work           0.0         100.0       300.0
+    00:01:00  295.350000  289.383333  273.733333
+    00:05:00  225.206667  225.206667  213.916667
+
+    """
+    if work_thresholds is None:
+        work_thresholds = FATIGUE_WORK_THRESHOLDS
+    work_thresholds = np.asarray(work_thresholds, dtype=np.float64)
+    if max_duration is None:
+        max_duration = pd.Timedelta(seconds=activity.shape[0])
+    else:
+        max_duration = _check_duration(max_duration)
+    max_duration = min(
+        max_duration,
+        activity.index[-1] - activity.index[0] + pd.Timedelta(seconds=1))
+    duration = np.arange(1, max_duration.seconds, dtype=np.intp)
+
+    power = _as_floating(activity['power'].values, np.float64)
+    with _stage('extraction.fatigue_profile') as stage:
+        fatigue_profile, _ = _get_kernels()._fatigue_power_profile(
+            power, work_thresholds * 1000., duration,
+            _effective_num_threads(num_threads))
+        fatigue_profile = pd.DataFrame(
+            fatigue_profile,
+            columns=pd.Index(work_thresholds, name='work'),
+            index=pd.to_timedelta(duration, unit='s'))
+        stage.record(fatigue_profile)
+    return fatigue_profile
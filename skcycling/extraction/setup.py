@@ -11,6 +11,11 @@ def configuration(parent_package='', top_path=None):
                          libraries=libraries,
                          extra_compile_args=["-O3", "-fopenmp"],
                          extra_link_args=["-fopenmp"])
+    config.add_extension('_effort',
+                         sources=['_effort.c'],
+                         include_dirs=[numpy.get_include()],
+                         libraries=libraries,
+                         extra_compile_args=["-O3"])
     config.add_subpackage("tests")
 
     return config
@@ -0,0 +1,87 @@
+"""Test the climb module."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import numpy as np
+import pandas as pd
+
+import pytest
+
+from skcycling.extraction import detect_climbs
+from skcycling.extraction import total_ascent
+from skcycling.extraction import vam
+from skcycling.exceptions import MissingDataError
+
+
+def _make_activity(noise=0.):
+    # 1 km flat, 2 km at 6%, 1 km flat, 1 km at 4% and 2 km downhill at 5%
+    # ridden at 5 m.s^-1 with a stop of 1 minute at the beginning of the
+    # first climb
+    rng = np.random.RandomState(42)
+    distance = np.concatenate((np.arange(0, 1000, 5.), [1000.] * 60,
+                               np.arange(1000, 7000, 5.)))
+    gradient = np.select([distance < 1000, distance < 3000, distance < 4000,
+                          distance < 5000], [0, 0.06, 0, 0.04], -0.05)
+    elevation = 100 + np.cumsum(np.ediff1d(distance, to_begin=0) * gradient)
+    elevation += rng.normal(scale=noise, size=elevation.size)
+    index = pd.date_range('2018-01-01', periods=distance.size, freq='s')
+    return pd.DataFrame({'distance': distance, 'elevation': elevation},
+                        index=index)
+
+
+@pytest.mark.parametrize("smooth", [None, 'savgol', 'median'])
+def test_total_ascent(smooth):
+    activity = _make_activity()
+    assert total_ascent(activity, smooth=smooth) == pytest.approx(160,
+                                                                  rel=0.02)
+
+
+def test_total_ascent_noise():
+    # the noise of the elevation is removed by the smoothing
+    activity = _make_activity(noise=0.5)
+    assert total_ascent(activity, smooth=None) > 400
+    assert total_ascent(activity) == pytest.approx(160, rel=0.1)
+    assert total_ascent(activity, smooth='median') == pytest.approx(160,
+                                                                    rel=0.1)
+
+
+def test_vam():
+    activity = _make_activity()
+    activity_vam = vam(activity, periods=60)
+    assert isinstance(activity_vam, pd.Series)
+    # in the middle of the first climb at 6% and 5 m.s^-1
+    assert activity_vam.iloc[400] == pytest.approx(0.06 * 5 * 3600,
+                                                   rel=1e-2)
+    assert activity_vam.iloc[-100] == pytest.approx(-0.05 * 5 * 3600,
+                                                    rel=1e-2)
+
+
+@pytest.mark.parametrize("smooth", ['savgol', 'median'])
+def test_detect_climbs(smooth):
+    activity = _make_activity(noise=0.2)
+    climbs = detect_climbs(activity, smooth=smooth)
+    assert climbs.shape == (2, 7)
+    assert climbs['distance'].values == pytest.approx([2000, 1000], abs=100)
+    assert climbs['gradient'].values == pytest.approx([0.06, 0.04],
+                                                      abs=0.005)
+    # the stop at the beginning of the first climb is not part of the VAM
+    assert climbs['vam'].iloc[1] == pytest.approx(0.04 * 5 * 3600, rel=0.1)
+    assert climbs['vam'].iloc[0] < 0.06 * 5 * 3600
+    assert climbs['start'].iloc[1] > climbs['end'].iloc[0]
+
+    # a minimum gradient larger than the climbs does not detect anything
+    climbs = detect_climbs(activity, min_gradient=0.1, smooth=smooth)
+    assert climbs.shape == (0, 7)
+
+    # a long gap merges both climbs
+    climbs = detect_climbs(activity, max_gap=2000, smooth=smooth)
+    assert climbs.shape == (1, 7)
+
+
+@pytest.mark.parametrize("func", [total_ascent, vam, detect_climbs])
+def test_climb_error(func):
+    activity = _make_activity().drop(columns='distance')
+    with pytest.raises(MissingDataError, match='elevation and distance'):
+        func(activity)
@@ -0,0 +1,55 @@
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from skcycling.datasets import make_activity
+from skcycling.extraction import activity_distance_profile
+
+
+def _brute_force_best_time(activity, window_distance):
+    distance = activity['distance'].values
+    times = activity.index
+    best = None
+    for start in range(distance.size):
+        reached = np.flatnonzero(distance >= distance[start] +
+                                 window_distance)
+        if reached.size:
+            elapsed = times[reached[0]] - times[start]
+            best = elapsed if best is None else min(best, elapsed)
+    return pd.NaT if best is None else best
+
+
+def test_activity_distance_profile():
+    activity = make_activity(duration='10min', random_state=0)
+    distance_profile = activity_distance_profile(activity)
+    total_distance = (activity['distance'].iloc[-1] -
+                      activity['distance'].iloc[0])
+    assert distance_profile.index[0] == 100.
+    assert distance_profile.index[-1] <= total_distance
+    assert distance_profile.name == activity.index[0]
+    assert distance_profile.is_monotonic_increasing
+    for window_distance in [100., 1000., 2500.]:
+        assert (pd.Timedelta(distance_profile.loc[window_distance]) ==
+                _brute_force_best_time(activity, window_distance))
+
+
+def test_activity_distance_profile_distances():
+    activity = make_activity(duration='10min', random_state=0)
+    # the missing samples and the decrease of the distance are ignored
+    activity.iloc[100:110] = np.nan
+    activity.iloc[200, activity.columns.get_loc('distance')] -= 50.
+    distance_profile = activity_distance_profile(
+        activity, distances=[500, 1e6])
+    assert distance_profile.index.tolist() == [500., 1e6]
+    assert pd.Timedelta(distance_profile.loc[500.]) > pd.Timedelta(0)
+    assert pd.isnull(distance_profile.loc[1e6])
+
+
+def test_activity_distance_profile_error():
+    activity = make_activity(duration='10min', random_state=0)
+    with pytest.raises(ValueError, match='"distance" column'):
+        activity_distance_profile(activity.drop(columns='distance'))
@@ -0,0 +1,127 @@
+"""Test the effort detection."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_array_equal
+from pandas.testing import assert_frame_equal
+
+import pytest
+
+from skcycling import set_backend
+from skcycling.exceptions import MissingDataError
+from skcycling.extraction import detect_efforts
+from skcycling.extraction import _effort
+from skcycling.extraction import _effort_numpy
+
+
+def _make_activity(noise=20.):
+    # 10 minutes at 150 W, 3 minutes at 350 W, 2 minutes at 150 W, 1 minute
+    # at 400 W with a recovery of 5 seconds in the middle, 10 seconds at
+    # 500 W, and 5 minutes at 150 W
+    rng = np.random.RandomState(42)
+    power = np.concatenate(([150.] * 600, [350.] * 180, [150.] * 120,
+                            [400.] * 30, [150.] * 5, [400.] * 30,
+                            [150.] * 60, [500.] * 10, [150.] * 300))
+    power += rng.normal(scale=noise, size=power.size)
+    index = pd.date_range('2018-01-01', periods=power.size, freq='s')
+    return pd.DataFrame({'power': power}, index=index)
+
+
+def _optimal_partition(signal, penalty, min_size):
+    # quadratic dynamic programming without pruning
+    cumsum = np.concatenate(([0.], np.cumsum(signal)))
+    cumsum_squared = np.concatenate(([0.], np.cumsum(signal ** 2)))
+    best_cost = np.full(signal.size + 1, np.inf)
+    best_cost[0] = -penalty
+    last_change = np.zeros(signal.size + 1, dtype=int)
+    for end in range(min_size, signal.size + 1):
+        for start in range(end - min_size + 1):
+            cost = (best_cost[start] + penalty + cumsum_squared[end] -
+                    cumsum_squared[start] -
+                    (cumsum[end] - cumsum[start]) ** 2 / (end - start))
+            if cost < best_cost[end]:
+                best_cost[end], last_change[end] = cost, start
+    ends, end = [], signal.size
+    while end > 0:
+        ends.append(end)
+        end = last_change[end]
+    return ends[::-1]
+
+
+@pytest.mark.parametrize("min_size", [1, 5])
+@pytest.mark.parametrize("seed", range(3))
+def test_pelt(min_size, seed):
+    rng = np.random.RandomState(seed)
+    length = rng.randint(3, 30, size=8)
+    signal = (np.repeat(rng.randint(0, 400, size=8), length) +
+              rng.normal(scale=30, size=length.sum()))
+    cumsum = np.concatenate(([0.], np.cumsum(signal)))
+    cumsum_squared = np.concatenate(([0.], np.cumsum(signal ** 2)))
+    penalty = 2 * 30 ** 2 * np.log(signal.size)
+    expected = _optimal_partition(signal, penalty, min_size)
+    assert_array_equal(
+        _effort._pelt(cumsum, cumsum_squared, penalty, min_size), expected)
+    assert_array_equal(
+        _effort_numpy._pelt(cumsum, cumsum_squared, penalty, min_size),
+        expected)
+
+
+@pytest.mark.parametrize("method", ['pelt', 'hysteresis'])
+def test_detect_efforts(method):
+    activity = _make_activity()
+    efforts = detect_efforts(activity, mpa=400, method=method)
+    assert efforts.columns.tolist() == ['start', 'end', 'duration', 'power',
+                                        'work']
+    # the recovery of 5 seconds is merged and the effort of 10 seconds is too
+    # short
+    assert efforts.shape[0] == 2
+    expected_start = activity.index[[600, 900]]
+    expected_end = activity.index[[780, 965]]
+    tolerance = pd.Timedelta('5s' if method == 'pelt' else '20s')
+    assert np.all(np.abs(efforts['start'] - expected_start) <= tolerance)
+    assert np.all(np.abs(efforts['end'] - expected_end) <= tolerance)
+    assert_array_equal(efforts['duration'], efforts['end'] - efforts['start'])
+    assert efforts['power'].iloc[0] == pytest.approx(350, rel=0.05)
+    assert efforts['work'].values == pytest.approx(
+        (efforts['power'] * efforts['duration'].dt.total_seconds() /
+         1000).values)
+
+
+def test_detect_efforts_parameters():
+    activity = _make_activity()
+    # without merging, the second effort is split and each part is too short
+    efforts = detect_efforts(activity, mpa=400, min_duration=40, max_gap=0)
+    assert efforts.shape[0] == 1
+    efforts = detect_efforts(activity, mpa=400, min_duration=40)
+    assert efforts.shape[0] == 2
+    efforts = detect_efforts(activity, mpa=400, min_duration='5s', max_gap=0)
+    assert efforts.shape[0] == 4
+    # a threshold above all the efforts does not detect anything
+    assert detect_efforts(activity, mpa=400, intensity=1.5).empty
+    # a huge penalty gives a single segment
+    assert detect_efforts(activity, mpa=400, penalty=1e12).empty
+
+
+@pytest.mark.parametrize("method", ['pelt', 'hysteresis'])
+def test_detect_efforts_backend(method):
+    activity = _make_activity()
+    activity.iloc[650:660] = np.nan
+    expected = detect_efforts(activity, mpa=400, method=method)
+    set_backend('numpy')
+    try:
+        efforts = detect_efforts(activity, mpa=400, method=method)
+    finally:
+        set_backend('auto')
+    assert_frame_equal(efforts, expected)
+
+
+def test_detect_efforts_error():
+    activity = _make_activity()
+    with pytest.raises(ValueError, match='"method" should be one of'):
+        detect_efforts(activity, mpa=400, method='unknown')
+    with pytest.raises(MissingDataError, match='power data are required'):
+        detect_efforts(activity.rename(columns={'power': 'speed'}), mpa=400)
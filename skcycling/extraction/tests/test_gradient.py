@@ -6,13 +6,17 @@
 
 import numpy as np
 import pandas as pd
+from numpy.testing import assert_allclose
+from pandas.testing import assert_frame_equal
 
 import pytest
 
 from skcycling.extraction import acceleration
+from skcycling.extraction import extract_channels
 from skcycling.extraction import gradient_activity
 from skcycling.extraction import gradient_elevation
 from skcycling.extraction import gradient_heart_rate
+from skcycling.extraction import total_ascent
 from skcycling.exceptions import MissingDataError
 
 
@@ -99,3 +103,164 @@ def test_gradient_activity(activity, periods, append, columns, shape):
     output = gradient_activity(activity, periods=periods, append=append,
                                columns=columns)
     assert output.shape == shape
+
+
+@pytest.mark.parametrize("periods", [1, [1, 2, 5], [0, -3, 200]])
+@pytest.mark.parametrize("append", [True, False])
+@pytest.mark.parametrize("columns", [None, ['elevation']])
+def test_gradient_activity_values(periods, append, columns):
+    rng = np.random.RandomState(42)
+    activity = pd.DataFrame({'elevation': rng.random_sample(100),
+                             'distance': rng.random_sample(100),
+                             'cadence': rng.randint(0, 120, size=100)})
+    output = gradient_activity(activity, periods=periods, append=append,
+                               columns=columns)
+
+    # compare with the gradient computed by pandas
+    data = activity[columns] if columns is not None else activity
+    list_periods = periods if isinstance(periods, list) else [periods]
+    expected = [data.diff(periods=p) for p in list_periods]
+    keys = ['gradient_{}'.format(p) for p in list_periods]
+    if append:
+        expected = [activity] + expected
+        keys = ['original'] + keys
+    expected = pd.concat(expected, axis=1, keys=keys)
+    assert_frame_equal(output, expected, check_dtype=False)
+    if append:
+        assert_frame_equal(output['original'], activity)
+
+    gradient = gradient_activity(activity, periods=periods, columns=columns,
+                                 output='array')
+    assert gradient.shape == (len(list_periods),) + data.shape
+    for idx, key in enumerate(keys[-len(list_periods):]):
+        assert_allclose(gradient[idx], expected[key].values)
+
+
+def test_gradient_activity_error():
+    activity = pd.DataFrame({'elevation': np.random.random(100)})
+    with pytest.raises(ValueError, match='"output" should be one of'):
+        gradient_activity(activity, output='series')
+
+
+@pytest.mark.parametrize("smooth", ['savgol', 'median'])
+def test_gradient_elevation_smooth(smooth):
+    # constant slope of 5% with noisy elevation and a stop
+    rng = np.random.RandomState(42)
+    distance = np.concatenate((np.arange(0, 1000, 5.), [1000.] * 30,
+                               np.arange(1000, 2000, 5.)))
+    elevation = 0.05 * distance + rng.normal(scale=0.3, size=distance.size)
+    activity = pd.DataFrame({'distance': distance, 'elevation': elevation})
+
+    gradient_raw = gradient_elevation(activity, periods=1, append=False)
+    assert np.isinf(gradient_raw).any()
+
+    gradient = gradient_elevation(activity, append=False, smooth=smooth,
+                                  window_length=200.)
+    assert np.isfinite(gradient).all()
+    assert_allclose(gradient.iloc[50:-50], 0.05, atol=0.01)
+
+    activity = gradient_elevation(activity, smooth=smooth)
+    assert 'gradient-elevation' in activity.columns
+
+
+@pytest.mark.parametrize(
+    "distance, window_length",
+    [(np.arange(0, 100, 0.5), 1.), (np.linspace(0, 1, 10), 100.)])
+def test_gradient_elevation_smooth_savgol_fallback(distance, window_length):
+    # the Savitzky-Golay filter cannot be fitted on a window or a course
+    # shorter than 2 meters: the median filter is used instead
+    rng = np.random.RandomState(0)
+    activity = pd.DataFrame({'distance': distance,
+                             'elevation': rng.normal(size=distance.size)})
+    gradient = gradient_elevation(activity, append=False, smooth='savgol',
+                                  window_length=window_length)
+    assert_allclose(gradient,
+                    gradient_elevation(activity, append=False,
+                                       smooth='median',
+                                       window_length=window_length))
+    assert total_ascent(activity, window_length=window_length) == (
+        total_ascent(activity, smooth='median', window_length=window_length))
+
+
+def test_gradient_elevation_smooth_error():
+    activity = pd.DataFrame({'distance': np.arange(100.),
+                             'elevation': np.zeros(100)})
+    with pytest.raises(ValueError, match='"smooth" should be one of'):
+        gradient_elevation(activity, smooth='mean')
+    with pytest.raises(ValueError, match='strictly positive'):
+        gradient_elevation(activity, smooth='savgol', window_length=0)
+
+
+@pytest.mark.parametrize(
+    "func, columns",
+    [(acceleration, ['speed']),
+     (gradient_elevation, ['elevation', 'distance']),
+     (gradient_heart_rate, ['heart-rate'])])
+def test_gradient_append_does_not_modify_activity(func, columns):
+    activity = pd.DataFrame({col: np.random.random(100) for col in columns})
+    output = func(activity, append=True)
+    assert output.shape == (100, len(columns) + 1)
+    assert activity.columns.tolist() == columns
+    for col in columns:
+        assert np.shares_memory(output[col].values, activity[col].values)
+
+
+def _make_activity_channels():
+    rng = np.random.RandomState(42)
+    return pd.DataFrame({'speed': rng.random_sample(100),
+                         'elevation': rng.random_sample(100),
+                         'distance': np.cumsum(rng.random_sample(100)),
+                         'heart-rate': rng.randint(60, 200, size=100)})
+
+
+@pytest.mark.parametrize("smooth", [None, 'savgol'])
+@pytest.mark.parametrize("periods", [1, 5])
+def test_extract_channels(periods, smooth):
+    activity = _make_activity_channels()
+    expected = pd.DataFrame({
+        'acceleration': acceleration(activity, periods=periods,
+                                     append=False),
+        'gradient-elevation': gradient_elevation(
+            activity, periods=periods, append=False, smooth=smooth),
+        'gradient-heart-rate': gradient_heart_rate(
+            activity, periods=periods, append=False)},
+        columns=['acceleration', 'gradient-elevation',
+                 'gradient-heart-rate'])
+
+    output = extract_channels(activity, periods=periods, smooth=smooth)
+    for col in activity.columns:
+        assert np.shares_memory(output[col].values, activity[col].values)
+    assert output.columns.tolist() == (activity.columns.tolist() +
+                                       expected.columns.tolist())
+    assert_frame_equal(output[expected.columns], expected)
+    assert activity.shape == (100, 4)
+
+    output = extract_channels(activity, periods=periods, smooth=smooth,
+                              append=False)
+    assert_frame_equal(output, expected)
+
+    channels = ['gradient-heart-rate', 'acceleration']
+    buffer = np.empty((100, 2))
+    output = extract_channels(activity, channels=channels, periods=periods,
+                              out=buffer)
+    assert output is buffer
+    assert_allclose(buffer, expected[channels].values)
+
+
+def test_extract_channels_default():
+    activity = _make_activity_channels().drop(columns='heart-rate')
+    output = extract_channels(activity, append=False)
+    assert output.columns.tolist() == ['acceleration', 'gradient-elevation']
+
+
+@pytest.mark.parametrize(
+    "channels, out, err_type, err_msg",
+    [(['power'], None, ValueError, 'The channels should be some of'),
+     (['gradient-heart-rate'], None, MissingDataError,
+      'heart-rate data are required'),
+     (['acceleration'], np.empty((100, 2)), ValueError,
+      '"out" should be of shape')])
+def test_extract_channels_error(channels, out, err_type, err_msg):
+    activity = _make_activity_channels().drop(columns='heart-rate')
+    with pytest.raises(err_type, match=err_msg):
+        extract_channels(activity, channels=channels, out=out)
@@ -4,10 +4,17 @@
 
 from datetime import timedelta
 
+import numpy as np
+import pandas as pd
 import pytest
+from numpy.testing import assert_allclose
 
 from skcycling.io import bikeread
 from skcycling.datasets import load_fit
+from skcycling.datasets import make_activity
+from skcycling.extraction import activity_best_efforts
+from skcycling.extraction import activity_fatigue_profile
+from skcycling.extraction import activity_max_mean
 from skcycling.extraction import activity_power_profile
 
 
@@ -33,3 +40,152 @@ def test_activity_power_profile_max_duration_too_large():
     power_profile = activity_power_profile(activity, max_duration=1000000)
     assert power_profile.shape == (13536,)
     assert power_profile.iloc[-1] == pytest.approx(8.2117765957446736)
+
+
+def test_activity_power_profile_dtype():
+    activity = make_activity(duration='10min', random_state=0)
+    power_profile = activity_power_profile(activity)
+    power_profile_32 = activity_power_profile(activity, dtype=np.float32)
+    assert power_profile_32.dtype == np.float32
+    assert_allclose(power_profile_32, power_profile, rtol=1e-6)
+    # the dtype of the activity is kept by default
+    power_profile_32 = activity_power_profile(activity.astype(np.float32))
+    assert power_profile_32.dtype == np.float32
+    assert_allclose(power_profile_32, power_profile, rtol=1e-6)
+
+
+def test_activity_power_profile_integer_power():
+    activity = make_activity(duration='10min', random_state=0)[['power']]
+    activity_int = activity.round().astype(np.uint16)
+    power_profile = activity_power_profile(activity_int)
+    assert power_profile.dtype == np.float64
+    assert_allclose(power_profile,
+                    activity_power_profile(activity_int.astype(np.float64)))
+
+
+def test_activity_best_efforts():
+    activity = make_activity(duration='30min', random_state=0)
+    durations = ['1min', 300, pd.Timedelta('6min')]
+    efforts = activity_best_efforts(activity, durations=durations,
+                                    n_efforts=3)
+    assert efforts.columns.tolist() == (['start', 'end', 'power'] +
+                                        activity.columns.drop('power')
+                                                        .tolist())
+    power_profile = activity_power_profile(activity)
+    for duration in [pd.Timedelta(d) for d in ['1min', '5min', '6min']]:
+        duration_efforts = efforts.loc[duration]
+        assert duration_efforts.index.tolist() == [1, 2, 3]
+        # the best effort is the maximum of the power-profile
+        best = duration_efforts.iloc[0]
+        assert best['power'] == pytest.approx(
+            power_profile.loc['power'][duration])
+        assert best['cadence'] == pytest.approx(
+            power_profile.loc['cadence'][duration])
+        # the efforts are sorted, do not overlap and match the activity
+        assert duration_efforts['power'].is_monotonic_decreasing
+        assert (duration_efforts['end'] - duration_efforts['start'] ==
+                duration).all()
+        starts = duration_efforts['start'].sort_values()
+        assert (starts.diff().dropna() >= duration).all()
+        for _, effort in duration_efforts.iterrows():
+            window = activity.loc[effort['start']:
+                                  effort['end'] - pd.Timedelta(seconds=1)]
+            assert_allclose(window.mean()[activity.columns],
+                            effort[activity.columns].astype(np.float64))
+
+
+def test_activity_best_efforts_power_profile():
+    # the strongest window ends the activity, the best effort should still
+    # match the power-profile
+    activity = make_activity(duration='10min', random_state=0)[['power']]
+    activity['power'] = np.arange(activity.shape[0], dtype=np.float64)
+    durations = pd.timedelta_range('00:00:01', '00:05:00', freq='7s')
+    efforts = activity_best_efforts(activity, durations=durations,
+                                    n_efforts=1)
+    power_profile = activity_power_profile(activity)
+    assert_allclose(efforts['power'].values,
+                    power_profile[durations].values)
+
+
+def test_activity_best_efforts_missing_data():
+    activity = make_activity(duration='10min', random_state=0)[['power']]
+    activity['power'] = np.arange(activity.shape[0], dtype=np.float64)
+    activity.iloc[200:] = np.nan
+    efforts = activity_best_efforts(activity, durations=['1min', '5min'],
+                                    n_efforts=5)
+    # only 3 efforts of 1 minute fit in the valid data and all the windows
+    # of 5 minutes contain missing values
+    assert efforts.index.tolist() == [(pd.Timedelta('1min'), rank)
+                                      for rank in [1, 2, 3]]
+    assert efforts['start'].tolist() == activity.index[[140, 80, 20]].tolist()
+    assert activity_best_efforts(activity, durations=['1H']).empty
+
+
+@pytest.mark.parametrize(
+    "kwargs, msg",
+    [({'n_efforts': 0}, "positive integer"),
+     ({'durations': ['0s']}, "at least one second")])
+def test_activity_best_efforts_error(kwargs, msg):
+    activity = make_activity(duration='10min', random_state=0)
+    with pytest.raises(ValueError, match=msg):
+        activity_best_efforts(activity, **kwargs)
+
+
+@pytest.mark.parametrize("num_threads", [1, 2])
+def test_activity_max_mean(num_threads):
+    activity = make_activity(duration='10min', random_state=0)
+    activity.iloc[100:110, activity.columns.get_loc('heart-rate')] = np.nan
+    max_mean = activity_max_mean(activity, num_threads=num_threads)
+    assert max_mean.columns.tolist() == activity.columns.tolist()
+    assert max_mean.shape[0] == activity.shape[0] - 1
+    power_profile = activity_power_profile(activity)
+    assert_allclose(max_mean['power'], power_profile.loc['power'])
+    for duration in [1, 60, 300]:
+        # same windows as the power-profile: the last one is not considered
+        rolling = activity.iloc[:-1].rolling(duration).mean()
+        assert_allclose(max_mean.iloc[duration - 1], rolling.max())
+
+
+def test_activity_max_mean_columns():
+    activity = make_activity(duration='10min', random_state=0)
+    activity['temperature'] = np.nan
+    max_mean = activity_max_mean(activity,
+                                 columns=['heart-rate', 'temperature'],
+                                 max_duration='5min')
+    assert max_mean.columns.tolist() == ['heart-rate', 'temperature']
+    assert max_mean.index[-1] == pd.Timedelta('4min 59s')
+    assert max_mean['temperature'].isnull().all()
+
+
+@pytest.mark.parametrize("num_threads", [1, 2])
+def test_activity_fatigue_profile(num_threads):
+    activity = make_activity(duration='30min', random_state=0)
+    activity.iloc[400:410, activity.columns.get_loc('power')] = np.nan
+    work_thresholds = [0., 50., 100., 250., 1e6]
+    fatigue_profile = activity_fatigue_profile(
+        activity, work_thresholds=work_thresholds, num_threads=num_threads)
+    assert fatigue_profile.columns.tolist() == work_thresholds
+    assert fatigue_profile.shape[0] == activity.shape[0] - 1
+    work = np.concatenate(
+        ([0.], np.cumsum(activity['power'].fillna(0).values) / 1000.))
+    for threshold in work_thresholds[:-1]:
+        # the power-profile of the activity starting after the threshold
+        start = np.searchsorted(work, threshold)
+        expected = activity_max_mean(activity.iloc[start:],
+                                     columns=['power'])['power']
+        assert_allclose(fatigue_profile[threshold].iloc[:expected.size],
+                        expected)
+        assert fatigue_profile[threshold].iloc[expected.size:].isnull().all()
+    assert fatigue_profile[1e6].isnull().all()
+
+
+def test_activity_fatigue_profile_default():
+    activity = make_activity(duration='10min', random_state=0)
+    fatigue_profile = activity_fatigue_profile(activity,
+                                               max_duration='5min')
+    assert fatigue_profile.columns.tolist() == [0., 500., 1000., 1500.,
+                                                2000., 2500., 3000.]
+    assert fatigue_profile.index[-1] == pd.Timedelta('4min 59s')
+    assert_allclose(fatigue_profile[0.],
+                    activity_max_mean(activity, columns=['power'],
+                                      max_duration='5min')['power'])
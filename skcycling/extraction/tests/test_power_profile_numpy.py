@@ -0,0 +1,108 @@
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import pytest
+
+import numpy as np
+from numpy.testing import assert_allclose
+from numpy.testing import assert_array_equal
+
+from skcycling.extraction import _power_profile
+from skcycling.extraction import _power_profile_numpy
+
+
+def _make_power(n_samples, missing=False, seed=0):
+    rng = np.random.RandomState(seed)
+    power = rng.randint(0, 400, size=n_samples).astype(np.float64)
+    if missing:
+        power[rng.choice(n_samples, size=n_samples // 10)] = np.nan
+    return power
+
+
+@pytest.mark.parametrize("missing", [False, True])
+@pytest.mark.parametrize("time_interval", [1, 2, 10, 99, 100, 150])
+def test_max_mean_power_interval(missing, time_interval):
+    power = _make_power(100, missing=missing)
+    expected = _power_profile.max_mean_power_interval(power, time_interval)
+    max_mean, idx_max_mean = _power_profile_numpy.max_mean_power_interval(
+        power, time_interval)
+    assert max_mean == pytest.approx(expected[0])
+    assert idx_max_mean == expected[1]
+
+
+def test_max_mean_power_interval_no_positive_window():
+    power = np.zeros(10)
+    assert (_power_profile_numpy.max_mean_power_interval(power, 3) ==
+            _power_profile.max_mean_power_interval(power, 3) == (0., 0))
+
+
+@pytest.mark.parametrize("missing", [False, True])
+def test_associated_data_power_profile(missing):
+    power = _make_power(100)
+    data = _make_power(100, missing=missing, seed=1)
+    duration = np.arange(1, 100)
+    pp_index = np.array([_power_profile.max_mean_power_interval(power, d)[1]
+                         for d in duration])
+    assert_allclose(
+        _power_profile_numpy._associated_data_power_profile(data, pp_index,
+                                                            duration),
+        _power_profile._associated_data_power_profile(data, pp_index,
+                                                      duration))
+
+
+@pytest.mark.parametrize("window", [1, 3, 10])
+def test_sliding_window_argmax(window):
+    rng = np.random.RandomState(0)
+    # integer values to create ties and NaN values to create empty windows
+    data = rng.randint(0, 5, size=(4, 30)).astype(np.float64)
+    data[rng.rand(*data.shape) < 0.3] = np.nan
+    data[2] = np.nan
+    dates = np.sort(rng.choice(60, size=30, replace=False)).astype(np.int64)
+    window_ends = np.arange(-5, 70, 2, dtype=np.int64)
+    assert_array_equal(
+        _power_profile_numpy._sliding_window_argmax(data, dates, window_ends,
+                                                    window),
+        _power_profile._sliding_window_argmax(data, dates, window_ends,
+                                              window))
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_max_mean_channels(dtype):
+    data = np.vstack([_make_power(100, missing=missing, seed=seed)
+                      for seed, missing in enumerate([False, True, False])])
+    data[2] = np.nan
+    data = data.astype(dtype)
+    duration = np.arange(1, 120)
+    max_mean, idx_max_mean = _power_profile_numpy._max_mean_channels(
+        data, duration)
+    expected_max_mean, expected_idx_max_mean = (
+        _power_profile._max_mean_channels(data, duration))
+    assert_allclose(max_mean, expected_max_mean, rtol=1e-6)
+    assert_array_equal(idx_max_mean, expected_idx_max_mean)
+    # the channels without missing values match the power kernel
+    expected = [_power_profile.max_mean_power_interval(data[0], d)
+                for d in duration[:99]]
+    assert_allclose(max_mean[:99, 0], [e[0] for e in expected], rtol=1e-6)
+    assert_array_equal(idx_max_mean[:99, 0], [e[1] for e in expected])
+    assert np.isnan(max_mean[:, 2]).all()
+    assert np.isnan(max_mean[99:]).all()
+
+
+def test_fatigue_power_profile():
+    power = _make_power(200, missing=True)
+    work_thresholds = np.array([0., 5000., 1000., 1e9, 20000.])
+    duration = np.arange(1, 210)
+    max_mean, idx_max_mean = _power_profile_numpy._fatigue_power_profile(
+        power, work_thresholds, duration)
+    expected_max_mean, expected_idx_max_mean = (
+        _power_profile._fatigue_power_profile(power, work_thresholds,
+                                              duration))
+    assert_allclose(max_mean, expected_max_mean)
+    assert_array_equal(idx_max_mean, expected_idx_max_mean)
+    # without a threshold, the windows are the ones of _max_mean_channels
+    expected_max_mean, expected_idx_max_mean = (
+        _power_profile._max_mean_channels(power[np.newaxis], duration))
+    assert_allclose(max_mean[:, 0], expected_max_mean[:, 0])
+    assert_array_equal(idx_max_mean[:, 0], expected_idx_max_mean[:, 0])
+    assert np.isnan(max_mean[:, 3]).all()
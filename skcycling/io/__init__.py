@@ -6,6 +6,8 @@ The :mod:`skcycling.io` module includes utility to load data.
 #          Cedric Lemaitre
 # License: BSD 3 clause
 
-from .base import bikeread
+from .._lazy import attach
 
 __all__ = ['bikeread']
+
+__getattr__, __dir__ = attach(__name__, submod_attrs={'base': ['bikeread']})
@@ -6,12 +6,14 @@
 
 import numpy as np
 
+from ..utils.instrumentation import _stage
+from ..utils.validation import check_dtype
 from .fit import load_power_from_fit
 
 DROP_OPTIONS = ('columns', 'rows', 'both')
 
 
-def bikeread(filename, drop_nan=None):
+def bikeread(filename, drop_nan=None, fields=None, dtype=None):
     """Read power data file.
 
     Read more in the :ref:`User Guide <reader>`.
@@ -25,6 +27,15 @@ def bikeread(filename, drop_nan=None):
         Either to remove the columns/rows containing NaN values. By default,
         all data will be kept.
 
+    fields : str, list of str or None, default=None
+        The fields to load (e.g. ``['power', 'speed', 'temperature']``). By
+        default, the power, heart-rate, cadence, distance, elevation, and
+        speed are loaded.
+
+    dtype : {np.float32, np.float64} or None, default=None
+        The dtype of the columns. ``np.float32`` halves the memory of the
+        activity. By default, the data are stored as ``np.float64``.
+
     Returns
     -------
     data : DataFrame
@@ -48,7 +59,10 @@ def bikeread(filename, drop_nan=None):
         raise ValueError('"drop_nan" should be one of {}.'
                          ' Got {} instead.'.format(DROP_OPTIONS, drop_nan))
 
-    df = load_power_from_fit(filename)
+    with _stage('io.read_fit') as stage:
+        df = load_power_from_fit(filename, fields=fields,
+                                 dtype=check_dtype(dtype))
+        stage.record(df)
 
     if drop_nan is not None:
         if drop_nan == 'columns':
@@ -59,8 +73,12 @@ def bikeread(filename, drop_nan=None):
             df.dropna(axis=1, inplace=True).dropna(axis=0, inplace=True)
 
     # remove possible outliers by clipping the value
-    df[df['power'] > 2500.] = np.nan
+    if 'power' in df.columns:
+        df[df['power'] > 2500.] = np.nan
 
     # resample to have a precision of a second with additional linear
     # interpolation for missing value
-    return df.resample('s').interpolate('linear')
+    with _stage('io.resample') as stage:
+        df = df.resample('s').interpolate('linear')
+        stage.record(df)
+    return df
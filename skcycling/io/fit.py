@@ -11,11 +11,27 @@ import pandas as pd
 import numpy as np
 import six
 
-from fitparse import FitFile
+from ..utils.validation import check_dtype
 
 # 'timestamp' will be consider as the index of the DataFrame later on
 FIELDS_DATA = ('timestamp', 'power', 'heart_rate', 'cadence', 'distance',
                'altitude', 'speed')
+# name of the columns in the DataFrame differing from the FIT fields
+FIELDS_RENAME = {'heart_rate': 'heart-rate', 'altitude': 'elevation'}
+
+# encoding of the record fields written in FIT files:
+# column -> (field number, base type, numpy type, scale, offset)
+FIELDS_ENCODING = {'elevation': (2, 0x84, '<u2', 5, 500),
+                   'heart-rate': (3, 0x02, 'u1', 1, 0),
+                   'cadence': (4, 0x02, 'u1', 1, 0),
+                   'distance': (5, 0x86, '<u4', 100, 0),
+                   'speed': (6, 0x84, '<u2', 1000, 0),
+                   'power': (7, 0x84, '<u2', 1, 0),
+                   'temperature': (13, 0x01, 'i1', 1, 0)}
+FIT_EPOCH = pd.Timestamp('1989-12-31')
+FIT_MESG_FILE_ID = 0
+FIT_MESG_RECORD = 20
+FIT_FIELD_TIMESTAMP = 253
 
 
 def check_filename_fit(filename):
@@ -49,7 +65,21 @@ def check_filename_fit(filename):
             type(filename)))
 
 
-def load_power_from_fit(filename):
+def _check_fields(fields):
+    """Map the columns to load to the name of the FIT fields."""
+    if fields is None:
+        return FIELDS_DATA
+    if isinstance(fields, six.string_types):
+        fields = [fields]
+    fit_names = {column: field for field, column in FIELDS_RENAME.items()}
+    fields = [fit_names.get(column, column) for column in fields
+              if column != FIELDS_DATA[0]]
+    if not fields:
+        raise ValueError('At least a field should be loaded.')
+    return (FIELDS_DATA[0],) + tuple(fields)
+
+
+def load_power_from_fit(filename, fields=None, dtype=None):
     """Method to open the power data from FIT file into a pandas dataframe.
 
     Parameters
@@ -57,6 +87,19 @@ def load_power_from_fit(filename):
     filename : str,
         Path to the FIT file.
 
+    fields : str, list of str or None, default=None
+        The fields of the records to load, named as the columns of the
+        returned DataFrame (e.g. ``'elevation'`` or ``'temperature'``). The
+        fields missing in the file are filled with NaN. By default, the
+        power, heart-rate, cadence, distance, elevation, and speed are
+        loaded.
+
+    dtype : {np.float32, np.float64} or None, default=None
+        The dtype of the columns. The values of the FIT records are integers
+        scaled to a small number of decimals and are exactly represented
+        with ``np.float32``, which halves the memory. By default, the dtype
+        inferred by pandas is kept.
+
     Returns
     -------
     data : DataFrame
@@ -64,6 +107,9 @@ def load_power_from_fit(filename):
 
     """
     filename = check_filename_fit(filename)
+    fields = _check_fields(fields)
+    # imported here to not import fitparse with skcycling.io
+    from fitparse import FitFile
     activity = FitFile(filename)
     activity.parse()
     records = activity.get_messages(name='record')
@@ -71,7 +117,7 @@ def load_power_from_fit(filename):
     data = defaultdict(list)
     for rec in records:
         values = rec.get_values()
-        for key in FIELDS_DATA:
+        for key in fields:
             data[key].append(values.get(key, np.NaN))
 
     data = pd.DataFrame(data)
@@ -80,10 +126,123 @@ def load_power_from_fit(filename):
             filename))
 
     # rename the columns for consistency
-    data.rename(columns={'heart_rate': 'heart-rate', 'altitude': 'elevation'},
-                inplace=True)
+    data.rename(columns=FIELDS_RENAME, inplace=True)
 
-    data.set_index(FIELDS_DATA[0], inplace=True)
+    data.set_index(fields[0], inplace=True)
     del data.index.name
 
+    if dtype is not None:
+        data = data.astype(check_dtype(dtype))
+
     return data
+
+
+def _fit_crc_table():
+    """Table of the CRC-16 used by the FIT protocol."""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+FIT_CRC_TABLE = _fit_crc_table()
+
+
+def _fit_crc(data, crc=0):
+    """Compute the CRC of some bytes as defined by the FIT protocol."""
+    table = FIT_CRC_TABLE
+    for byte in bytearray(data):
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def _fit_definition(local_mesg, global_mesg, fields):
+    """Encode a definition message of little endian fields."""
+    definition = bytearray([0x40 | local_mesg, 0, 0])
+    definition += np.array([global_mesg], dtype='<u2').tobytes()
+    definition.append(len(fields))
+    for field_num, base_type, np_type in fields:
+        definition += bytearray([field_num, np.dtype(np_type).itemsize,
+                                 base_type])
+    return bytes(definition)
+
+
+def save_power_to_fit(activity, filename):
+    """Method to save the data of an activity in a FIT file.
+
+    The samples are written as record messages which can be read back with
+    :func:`load_power_from_fit`. The values are rounded to the resolution of
+    the FIT protocol and the missing values are encoded as invalid.
+
+    Parameters
+    ----------
+    activity : DataFrame
+        The activity to save. The index should contain the time of the
+        samples. The columns among ``'elevation'``, ``'heart-rate'``,
+        ``'cadence'``, ``'distance'``, ``'speed'``, ``'power'``, and
+        ``'temperature'`` are written.
+
+    filename : str
+        Path to the FIT file.
+
+    Returns
+    -------
+    filename : str
+        Path to the FIT file.
+
+    """
+    if not isinstance(filename, six.string_types):
+        raise ValueError('filename needs to be a string. Got {}'.format(
+            type(filename)))
+    if activity.empty:
+        raise ValueError('The activity does not contain any data.')
+    columns = [col for col in activity.columns if col in FIELDS_ENCODING]
+
+    timestamp = ((pd.DatetimeIndex(activity.index) - FIT_EPOCH) //
+                 pd.Timedelta(seconds=1)).values
+    record_fields = [(FIT_FIELD_TIMESTAMP, 0x86, '<u4')]
+    record_fields += [FIELDS_ENCODING[col][:3] for col in columns]
+    record_dtype = np.dtype(
+        [('header', 'u1'), ('timestamp', '<u4')] +
+        [(col, FIELDS_ENCODING[col][2]) for col in columns])
+
+    records = np.zeros(activity.shape[0], dtype=record_dtype)
+    records['timestamp'] = timestamp
+    for col in columns:
+        _, _, np_type, scale, offset = FIELDS_ENCODING[col]
+        info = np.iinfo(np_type)
+        # the maximum (or 0x7F for signed types) encodes an invalid value
+        invalid = info.max
+        values = np.round((activity[col].values.astype(np.float64) +
+                           offset) * scale)
+        valid = np.isfinite(values)
+        values[valid] = np.clip(values[valid], info.min, invalid - 1)
+        values[~valid] = invalid
+        records[col] = values
+
+    file_id_dtype = np.dtype([('header', 'u1'), ('type', 'u1'),
+                              ('manufacturer', '<u2'),
+                              ('time_created', '<u4')])
+    file_id = np.array([(0, 4, 255, timestamp[0])], dtype=file_id_dtype)
+    data = b''.join([
+        _fit_definition(0, FIT_MESG_FILE_ID,
+                        [(0, 0x00, 'u1'), (1, 0x84, '<u2'),
+                         (4, 0x86, '<u4')]),
+        file_id.tobytes(),
+        _fit_definition(1, FIT_MESG_RECORD, record_fields)])
+    records['header'] = 1
+    data += records.tobytes()
+
+    header = bytearray([14, 0x10])
+    header += np.array([2014], dtype='<u2').tobytes()
+    header += np.array([len(data)], dtype='<u4').tobytes()
+    header += b'.FIT'
+    header += np.array([_fit_crc(header)], dtype='<u2').tobytes()
+    content = bytes(header) + data
+    with open(filename, 'wb') as f:
+        f.write(content)
+        f.write(np.array([_fit_crc(content)], dtype='<u2').tobytes())
+    return filename
@@ -15,6 +15,7 @@ from numpy.testing import assert_allclose
 from skcycling.datasets import load_fit
 from skcycling.io.fit import load_power_from_fit
 from skcycling.io.fit import check_filename_fit
+from skcycling.io.fit import save_power_to_fit
 
 
 ride = np.array(
@@ -87,3 +88,60 @@ def test_check_filename_fit():
     filename = load_fit()[0]
     my_filename = check_filename_fit(filename)
     assert my_filename == filename
+
+
+@pytest.mark.parametrize(
+    "fields, columns",
+    [('temperature', ['temperature']),
+     (['power', 'heart-rate', 'elevation'],
+      ['power', 'heart-rate', 'elevation']),
+     (['timestamp', 'speed', 'unknown'], ['speed', 'unknown'])])
+def test_load_power_from_fit_fields(fields, columns):
+    filename = load_fit()[0]
+    df = load_power_from_fit(filename, fields=fields)
+    assert sorted(df.columns) == sorted(columns)
+    df_all = load_power_from_fit(filename)
+    for col in set(columns).intersection(df_all.columns):
+        assert_allclose(df[col], df_all[col])
+    if 'unknown' in columns:
+        assert df['unknown'].isnull().all()
+
+
+def test_load_power_from_fit_fields_error():
+    with pytest.raises(ValueError, match='At least a field'):
+        load_power_from_fit(load_fit()[0], fields=['timestamp'])
+
+
+def test_load_power_from_fit_dtype():
+    df = load_power_from_fit(load_fit()[0])
+    df_32 = load_power_from_fit(load_fit()[0], dtype=np.float32)
+    assert (df_32.dtypes == np.float32).all()
+    assert_allclose(df_32, df.astype(np.float64), rtol=1e-6)
+    with pytest.raises(ValueError, match='"dtype" should be one of'):
+        load_power_from_fit(load_fit()[0], dtype=np.uint16)
+
+
+def test_save_power_to_fit_round_trip(tmpdir):
+    filename = load_fit()[0]
+    df = load_power_from_fit(filename, fields=['power', 'heart-rate',
+                                               'cadence', 'distance',
+                                               'elevation', 'speed',
+                                               'temperature'])
+    saved_filename = save_power_to_fit(df, str(tmpdir.join('ride.fit')))
+    df_saved = load_power_from_fit(saved_filename, fields=df.columns)
+    assert df_saved.index.equals(df.index)
+    for col in df.columns:
+        # the missing values are read back as None
+        assert_allclose(df_saved[col].astype(np.float64), df[col])
+
+
+@pytest.mark.parametrize(
+    "filename, empty, msg",
+    [(1, False, "filename needs to be a string"),
+     ('ride.fit', True, "does not contain any data")])
+def test_save_power_to_fit_error(filename, empty, msg):
+    df = load_power_from_fit(load_fit()[0])
+    if empty:
+        df = df.iloc[:0]
+    with pytest.raises(ValueError, match=msg):
+        save_power_to_fit(df, filename)
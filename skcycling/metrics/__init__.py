@@ -6,14 +6,7 @@ The :mod:`skcycling.metrics` module include score functions.
 #          Cedric Lemaitre
 # License: BSD 3 clause
 
-from .activity import normalized_power_score
-from .activity import intensity_factor_score
-from .activity import training_stress_score
-from .activity import training_load_score
-from .activity import mpa2ftp
-from .activity import ftp2mpa
-
-from .power_profile import aerobic_meta_model
+from .._lazy import attach
 
 __all__ = ['normalized_power_score',
            'intensity_factor_score',
@@ -21,4 +14,16 @@ __all__ = ['normalized_power_score',
            'training_load_score',
            'mpa2ftp',
            'ftp2mpa',
-           'aerobic_meta_model']
+           'w_prime_balance',
+           'aerobic_meta_model',
+           'critical_power_model']
+
+__getattr__, __dir__ = attach(
+    __name__,
+    submod_attrs={'activity': ['normalized_power_score',
+                               'intensity_factor_score',
+                               'training_stress_score',
+                               'training_load_score', 'mpa2ftp', 'ftp2mpa',
+                               'w_prime_balance'],
+                  'power_profile': ['aerobic_meta_model'],
+                  'critical_power': ['critical_power_model']})
@@ -0,0 +1,79 @@
+#cython: cdivision=True
+#cython: boundscheck=False
+#cython: nonecheck=False
+#cython: wraparound=False
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+from cython cimport floating
+from cython.parallel import parallel, prange
+from libc.math cimport exp
+import numpy as np
+
+
+cpdef _w_prime_balance(floating[:] power, double[:] cp, double[:] w_prime,
+                       double[:] tau, bint differential, int num_threads=1):
+    """Compute the W' balance of several riders for the same activity.
+
+    The W' expended is updated sample by sample such that the cost is linear
+    with the number of samples for each rider.
+
+    Parameters
+    ----------
+    power : ndarray, shape (n_samples,)
+        The power of the activity sampled at 1 Hz. The missing values are
+        considered as 0 W.
+
+    cp : ndarray, shape (n_riders,)
+        The critical power of each rider.
+
+    w_prime : ndarray, shape (n_riders,)
+        The work capacity above the critical power of each rider.
+
+    tau : ndarray, shape (n_riders,)
+        The time constant of the recovery of each rider. Only used with the
+        integral formulation.
+
+    differential : bool
+        Whether to use the differential formulation instead of the integral
+        formulation.
+
+    num_threads : int, default=1
+        The number of OpenMP threads.
+
+    Returns
+    -------
+    w_prime_balance : ndarray, shape (n_samples, n_riders)
+        The W' balance of each rider.
+
+    """
+    cdef:
+        Py_ssize_t n_samples = power.shape[0]
+        Py_ssize_t n_riders = cp.shape[0]
+        double[:, ::1] balance = np.empty((n_samples, n_riders))
+        Py_ssize_t rider, idx_sample
+        double expended, decay, sample_power
+
+    with nogil, parallel(num_threads=num_threads):
+        for rider in prange(n_riders):
+            expended = 0.0
+            decay = exp(-1.0 / tau[rider])
+            for idx_sample in range(n_samples):
+                sample_power = power[idx_sample]
+                if sample_power != sample_power:
+                    sample_power = 0.0
+                if differential:
+                    if sample_power > cp[rider]:
+                        expended = expended + sample_power - cp[rider]
+                    else:
+                        expended = expended * exp(
+                            (sample_power - cp[rider]) / w_prime[rider])
+                else:
+                    expended = expended * decay
+                    if sample_power > cp[rider]:
+                        expended = expended + sample_power - cp[rider]
+                balance[idx_sample, rider] = w_prime[rider] - expended
+
+    return np.asarray(balance)
@@ -0,0 +1,87 @@
+"""NumPy implementation of the W' balance kernel.
+
+This function is used when the compiled extension is not available. It has
+the same signature and gives the same results as the function of
+``_w_prime_balance.pyx``. The ``num_threads`` argument is ignored.
+"""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+from __future__ import division
+
+import numpy as np
+
+# the largest recovery, in log-scale, accumulated before rescaling the sums
+# of the differential formulation to avoid an overflow of the exponential
+MAX_LOG_RECOVERY = 50.
+
+
+def _expended_differential(above, recovery):
+    """Solve ``e[t] = e[t - 1] * exp(-recovery[t]) + above[t]``.
+
+    The solution is ``e[t] = sum_u above[u] * exp(-(R[t] - R[u]))`` with
+    ``R`` the cumulative recovery. The sums are computed by chunks in which
+    ``R`` increases by less than ``MAX_LOG_RECOVERY``.
+    """
+    log_recovery = np.cumsum(recovery)
+    expended = np.empty_like(above)
+    carry, start = 0., 0
+    while start < above.size:
+        offset = log_recovery[start - 1] if start else 0.
+        stop = max(np.searchsorted(log_recovery, offset + MAX_LOG_RECOVERY,
+                                   side='right'), start + 1)
+        chunk_recovery = log_recovery[start:stop] - offset
+        expended[start:stop] = np.exp(-chunk_recovery) * (
+            carry + np.cumsum(above[start:stop] * np.exp(chunk_recovery)))
+        carry, start = expended[stop - 1], stop
+    return expended
+
+
+def _w_prime_balance(power, cp, w_prime, tau, differential, num_threads=1):
+    """Compute the W' balance of several riders for the same activity.
+
+    Parameters
+    ----------
+    power : ndarray, shape (n_samples,)
+        The power of the activity sampled at 1 Hz. The missing values are
+        considered as 0 W.
+
+    cp : ndarray, shape (n_riders,)
+        The critical power of each rider.
+
+    w_prime : ndarray, shape (n_riders,)
+        The work capacity above the critical power of each rider.
+
+    tau : ndarray, shape (n_riders,)
+        The time constant of the recovery of each rider. Only used with the
+        integral formulation.
+
+    differential : bool
+        Whether to use the differential formulation instead of the integral
+        formulation.
+
+    num_threads : int, default=1
+        Ignored.
+
+    Returns
+    -------
+    w_prime_balance : ndarray, shape (n_samples, n_riders)
+        The W' balance of each rider.
+
+    """
+    # imported here to not import scipy.signal with skcycling
+    from scipy.signal import lfilter
+    power = np.nan_to_num(np.asarray(power, dtype=np.float64))
+    balance = np.empty((power.size, len(cp)))
+    for rider, (rider_cp, rider_w_prime, rider_tau) in enumerate(
+            zip(cp, w_prime, tau)):
+        above = np.maximum(power - rider_cp, 0.)
+        if differential:
+            recovery = np.maximum(rider_cp - power, 0.) / rider_w_prime
+            expended = _expended_differential(above, recovery)
+        else:
+            expended = lfilter([1.], [1., -np.exp(-1. / rider_tau)], above)
+        balance[:, rider] = rider_w_prime - expended
+    return balance
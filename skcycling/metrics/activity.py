@@ -17,6 +17,9 @@ from __future__ import division
 
 import numpy as np
 
+from .._config import _effective_num_threads
+from .._config import _get_kernels
+
 TS_SCALE_GRAPPE = dict([('I1', 2.), ('I2', 2.5), ('I3', 3.),
                         ('I4', 3.5), ('I5', 4.5), ('I6', 7.),
                         ('I7', 11.)])
@@ -26,6 +29,8 @@ ESIE_SCALE_GRAPPE = dict([('I1', (.3, .5)), ('I2', (.5, .6)),
                           ('I5', (.85, 1.)), ('I6', (1., 1.80)),
                           ('I7', (1.8, 3.))])
 
+W_PRIME_BALANCE_METHODS = ('integral', 'differential')
+
 
 def mpa2ftp(mpa):
     """Convert the maximum power aerobic into the functional threshold power.
@@ -264,3 +269,123 @@ def training_load_score(activity_power, mpa):
                            activity_power < ESIE_SCALE_GRAPPE[key][1] * mpa)]
         tls_score += power_samples.size / 60 * TS_SCALE_GRAPPE[key]
     return tls_score
+
+
+def _recovery_time_constant(power, cp):
+    """Time constant of the recovery of W' proposed by Skiba et al. (2012).
+
+    It depends on the difference between the critical power and the mean
+    power of the samples below the critical power.
+    """
+    below = power[power < cp]
+    d_cp = cp - below.mean() if below.size else 0.
+    return 546. * np.exp(-0.01 * d_cp) + 316.
+
+
+def w_prime_balance(activity_power, cp, w_prime, method='integral', tau=None,
+                    num_threads=None):
+    """W' balance.
+
+    The W' balance is the work capacity above the critical power remaining
+    during an activity: W' is expended when the power is above the critical
+    power and recovers when the power is below. The W' expended is updated
+    sample by sample, such that the cost is linear with the duration of the
+    activity.
+
+    Two models are available:
+
+    * ``'integral'`` [1]_: the W' expended above the critical power recovers
+      exponentially with a time constant ``tau``. The integral of the model
+      is computed exactly with a running exponential-decay accumulator;
+    * ``'differential'`` [2]_: the W' expended increases by the work above
+      the critical power and recovers exponentially at a rate proportional
+      to the difference between the critical power and the power.
+
+    Read more in the :ref:`User Guide <metrics>`.
+
+    Parameters
+    ----------
+    activity_power : Series
+        A Series containing the power data from an activity sampled at 1 Hz,
+        as read by :func:`skcycling.io.bikeread`. The missing values are
+        considered as 0 W.
+
+    cp : float or array-like, shape (n_riders,)
+        The critical power in watts. Give an array to compute the W' balance
+        of several riders at once.
+
+    w_prime : float or array-like, shape (n_riders,)
+        The work capacity above the critical power in joules.
+
+    method : str, {'integral', 'differential'}, default='integral'
+        The model of the W' balance.
+
+    tau : float, array-like of shape (n_riders,) or None, default=None
+        The time constant of the recovery in seconds used by the
+        ``'integral'`` model. If None, the time constant of each rider is
+        estimated from the activity as in [1]_.
+
+    num_threads : int or None, default=None
+        The number of threads used to process the riders. If None, the number
+        set with :func:`skcycling.set_num_threads` is used.
+
+    Returns
+    -------
+    w_prime_balance : Series or DataFrame
+        The W' balance in joules, with the same index as ``activity_power``.
+        When ``cp``, ``w_prime``, and ``tau`` are scalars, a Series is
+        returned; otherwise, a DataFrame with a column for each rider.
+
+    References
+    ----------
+    .. [1] Skiba, P. F., et al. "Modeling the expenditure and reconstitution
+       of work capacity above critical power." Medicine and Science in Sports
+       and Exercise 44.8 (2012): 1526-1532.
+
+    .. [2] Skiba, P. F., et al. "Intramuscular determinants of the ability to
+       recover work capacity above critical power." European Journal of
+       Applied Physiology 115.4 (2015): 703-713.
+
+    Examples
+    --------
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.io import bikeread
+    >>> from skcycling.metrics import w_prime_balance
+    >>> ride = bikeread(load_fit()[0])
+    >>> w_bal = w_prime_balance(ride['power'], cp=250, w_prime=20000)
+    >>> print("Minimum W' balance {:.0f} J".format(w_bal.min()))
+    Minimum W' balance 10558 J
+
+    """
+    # imported here to not import pandas with skcycling.metrics
+    import pandas as pd
+    if method not in W_PRIME_BALANCE_METHODS:
+        raise ValueError('"method" should be one of {}. Got {!r} instead.'
+                         .format(W_PRIME_BALANCE_METHODS, method))
+    power = np.asarray(activity_power)
+    if power.dtype not in (np.float32, np.float64):
+        power = power.astype(np.float64)
+    single_rider = np.ndim(cp) == 0 and np.ndim(w_prime) == 0 and (
+        np.ndim(tau) == 0)
+    cp, w_prime = np.broadcast_arrays(np.atleast_1d(cp).astype(np.float64),
+                                      np.atleast_1d(w_prime)
+                                      .astype(np.float64))
+    if np.any(cp <= 0) or np.any(w_prime <= 0):
+        raise ValueError('"cp" and "w_prime" should be positive.')
+    if tau is None:
+        valid_power = power[~np.isnan(power)]
+        tau = [_recovery_time_constant(valid_power, rider_cp)
+               for rider_cp in cp]
+    cp, w_prime, tau = np.broadcast_arrays(
+        cp, w_prime, np.atleast_1d(tau).astype(np.float64))
+    if np.any(tau <= 0):
+        raise ValueError('"tau" should be positive.')
+
+    balance = _get_kernels('metrics._w_prime_balance')._w_prime_balance(
+        power, np.ascontiguousarray(cp), np.ascontiguousarray(w_prime),
+        np.ascontiguousarray(tau), method == 'differential',
+        _effective_num_threads(num_threads))
+    index = getattr(activity_power, 'index', None)
+    if single_rider:
+        return pd.Series(balance[:, 0], index=index, name='w_prime_balance')
+    return pd.DataFrame(balance, index=index)
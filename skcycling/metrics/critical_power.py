@@ -0,0 +1,308 @@
+"""Critical power models fitted to record power-profiles."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+from __future__ import division
+
+import numpy as np
+import pandas as pd
+
+from .power_profile import _masked_linear_fit
+
+CRITICAL_POWER_MODELS = ('2-parameter', 'linear-work', '3-parameter',
+                         'ward-smith')
+
+# the durations of the record power-profile used by default by each model:
+# the models with a maximum power need the short durations to estimate it
+CRITICAL_POWER_DURATIONS = {'2-parameter': ('00:02:00', '00:20:00'),
+                            'linear-work': ('00:02:00', '00:20:00'),
+                            '3-parameter': ('00:00:01', '00:20:00'),
+                            'ward-smith': ('00:00:01', '00:20:00')}
+
+
+def _morton_model(params, time):
+    """Power and Jacobian of the 3-parameter model of Morton.
+
+    The parameters are the critical power, W', and the logarithm of the time
+    constant ``W' / (p_max - cp)``.
+    """
+    cp, w_prime, log_tau = (p[:, np.newaxis] for p in params.T)
+    tau = np.exp(log_tau)
+    inv_time = 1. / (time + tau)
+    power = cp + w_prime * inv_time
+    jacobian = np.stack(np.broadcast_arrays(
+        np.ones_like(power), inv_time, -w_prime * tau * inv_time ** 2),
+        axis=-1)
+    return power, jacobian
+
+
+def _ward_smith_model(params, time):
+    """Power and Jacobian of the model of Ward-Smith.
+
+    The parameters are the critical power, W', and the logarithm of the time
+    constant ``W' / (p_max - cp)``.
+    """
+    cp, w_prime, log_tau = (p[:, np.newaxis] for p in params.T)
+    tau = np.exp(log_tau)
+    decay = np.exp(-time / tau)
+    power = cp + w_prime * (1. - decay) / time
+    jacobian = np.stack(np.broadcast_arrays(
+        np.ones_like(power), (1. - decay) / time, -w_prime * decay / tau),
+        axis=-1)
+    return power, jacobian
+
+
+def _levenberg_marquardt(model, params, time, power, mask, max_iter, tol):
+    """Fit a non-linear model to several record power-profiles at once.
+
+    Each iteration solves the damped normal equations of all the profiles with
+    a single batched linear solve. The damping of each profile is decreased
+    when its squared error decreases and increased otherwise.
+
+    Parameters
+    ----------
+    model : callable
+        Function returning the power, shape (n_profiles, n_durations), and the
+        Jacobian, shape (n_profiles, n_durations, n_params), of the model.
+
+    params : ndarray, shape (n_profiles, n_params)
+        The initial parameters. The profiles with non-finite parameters are
+        not fitted.
+
+    time : ndarray, shape (n_durations,)
+        The durations in seconds.
+
+    power : ndarray, shape (n_profiles, n_durations)
+        The record powers, set to 0 where ``mask`` is False.
+
+    mask : ndarray of bool, shape (n_profiles, n_durations)
+        The samples to consider in each fit.
+
+    max_iter : int
+        The maximum number of iterations.
+
+    tol : float
+        The relative decrease of the squared error below which a fit stops.
+
+    Returns
+    -------
+    params : ndarray, shape (n_profiles, n_params)
+        The fitted parameters.
+
+    """
+    n_params = params.shape[1]
+    weight = mask.astype(np.float64)
+    active = np.isfinite(params).all(axis=1)
+    params = np.where(active[:, np.newaxis], params, 0.)
+    damping = np.full(params.shape[0], 1e-3)
+
+    def squared_error(params):
+        prediction, jacobian = model(params, time)
+        residual = weight * (power - prediction)
+        return np.sum(residual ** 2, axis=1), residual, jacobian
+
+    error, residual, jacobian = squared_error(params)
+    for _ in range(max_iter):
+        weighted_jacobian = jacobian * weight[:, :, np.newaxis]
+        hessian = np.einsum('ijk,ijl->ikl', weighted_jacobian,
+                            weighted_jacobian)
+        gradient = np.einsum('ijk,ij->ik', weighted_jacobian, residual)
+        diagonal = np.einsum('ikk->ik', hessian)
+        damped = hessian.copy()
+        damped[:, np.arange(n_params), np.arange(n_params)] += (
+            damping[:, np.newaxis] * diagonal + 1e-12)
+        # the profiles already fitted are solved with a well-posed system
+        damped[~active] = np.eye(n_params)
+        step = np.linalg.solve(damped, gradient[:, :, np.newaxis])[:, :, 0]
+        step[~active] = 0.
+
+        new_params = params + step
+        with np.errstate(over='ignore', invalid='ignore'):
+            new_error, new_residual, new_jacobian = squared_error(new_params)
+        improved = active & (new_error < error)
+        converged = improved & (error - new_error <= tol * error)
+        params[improved] = new_params[improved]
+        residual[improved] = new_residual[improved]
+        jacobian[improved] = new_jacobian[improved]
+        error[improved] = new_error[improved]
+        damping = np.where(improved, damping / 10., damping * 10.)
+
+        # stop the fits which converged or which cannot be improved anymore
+        active &= ~converged & (damping < 1e10)
+        if not active.any():
+            break
+
+    return params
+
+
+def _check_record_power(record_power, durations):
+    """Get the record powers, shape (n_profiles, n_durations), and the
+    durations of the record power-profiles."""
+    if durations is None:
+        if not hasattr(record_power, 'index'):
+            raise ValueError('"durations" should be given when the record'
+                             ' power-profiles are not a Series or a'
+                             ' DataFrame.')
+        durations = record_power.index
+    durations = pd.to_timedelta(durations)
+    power = np.asarray(record_power, dtype=np.float64)
+    if power.ndim == 1:
+        power = power[:, np.newaxis]
+    if power.ndim != 2 or power.shape[0] != len(durations):
+        raise ValueError('The record power-profiles should be of shape'
+                         ' (n_durations, n_profiles) with {} durations. Got'
+                         ' an array of shape {} instead.'
+                         .format(len(durations), power.shape))
+    return power.T, durations
+
+
+def critical_power_model(record_power_profile, model='2-parameter',
+                         durations=None, duration_range=None, max_iter=100,
+                         tol=1e-10):
+    """Fit a critical power model to one or several record power-profiles.
+
+    The models relate the maximal power ``P`` which can be sustained during a
+    duration ``t`` to the critical power ``cp``, the work capacity above the
+    critical power ``w_prime``, and, for the models with three parameters, the
+    maximal instantaneous power ``p_max``:
+
+    * ``'2-parameter'``: ``P = cp + w_prime / t``, fitted by least-squares on
+      the power;
+    * ``'linear-work'``: the same model, fitted by least-squares on the work
+      ``P * t = cp * t + w_prime``;
+    * ``'3-parameter'``: the model of Morton [1]_,
+      ``P = cp + w_prime / (t + tau)`` with
+      ``tau = w_prime / (p_max - cp)``;
+    * ``'ward-smith'``: the model of Ward-Smith [2]_,
+      ``P = cp + w_prime * (1 - exp(-t / tau)) / t`` with
+      ``tau = w_prime / (p_max - cp)``.
+
+    The 2-parameter models are linear and solved in closed-form. The
+    3-parameter models are solved with a Levenberg-Marquardt algorithm (i.e.
+    a damped Gauss-Newton algorithm) in which all the record power-profiles
+    are fitted at once.
+
+    Read more in the :ref:`User Guide <critical_power>`.
+
+    Parameters
+    ----------
+    record_power_profile : Series, DataFrame, or ndarray
+        The record powers indexed by duration. Several record power-profiles
+        can be given as the columns of a DataFrame or of an array of shape
+        ``(n_durations, n_profiles)``, e.g. the ``'power'`` of the
+        power-profile or of the rolling record power-profile of a
+        :class:`skcycling.Rider`. The missing values are ignored.
+
+    model : str, default='2-parameter'
+        The model to fit, one of ``'2-parameter'``, ``'linear-work'``,
+        ``'3-parameter'``, or ``'ward-smith'``.
+
+    durations : TimedeltaIndex or None, default=None
+        The durations of the record powers. Required when
+        ``record_power_profile`` is an array. By default, the index of
+        ``record_power_profile`` is used.
+
+    duration_range : tuple of Timedelta or str, or None, default=None
+        The minimum and maximum durations (both included) used to fit the
+        model. By default, the durations from 2 to 20 minutes are used by the
+        2-parameter models and the durations from 1 second to 20 minutes by
+        the 3-parameter models.
+
+    max_iter : int, default=100
+        The maximum number of iterations of the 3-parameter models.
+
+    tol : float, default=1e-10
+        The relative decrease of the squared error below which the fit of the
+        3-parameter models stops.
+
+    Returns
+    -------
+    parameters : Series or DataFrame
+        The fitted ``'cp'`` (W), ``'w_prime'`` (J), ``'p_max'`` (W, only for
+        the 3-parameter models), and the root mean squared error of the
+        fitted power ``'rmse'`` (W). A DataFrame with a row for each
+        record power-profile is returned when several are given. The
+        parameters of the profiles with fewer durations than parameters are
+        set to NaN.
+
+    References
+    ----------
+    .. [1] Morton, R. H. "A 3-parameter critical power model." Ergonomics
+       39.4 (1996): 611-619.
+
+    .. [2] Ward-Smith, A. J. "A mathematical theory of running, based on the
+       first law of thermodynamics, and its application to the performance of
+       world-class athletes." Journal of Biomechanics 18.5 (1985): 337-349.
+
+    Examples
+    --------
+    >>> from skcycling import Rider
+    >>> from skcycling.datasets import load_rider
+    >>> from skcycling.metrics import critical_power_model
+    >>> rider = Rider.from_csv(load_rider())
+    >>> record_power = rider.record_power_profile()['power']
+    >>> critical_power_model(record_power).round(1)
+    cp           188.4
+    w_prime    24556.4
+    rmse          11.9
+    dtype: float64
+
+    """
+    if model not in CRITICAL_POWER_MODELS:
+        raise ValueError('"model" should be one of {}. Got {!r} instead.'
+                         .format(CRITICAL_POWER_MODELS, model))
+    power, durations = _check_record_power(record_power_profile, durations)
+    if duration_range is None:
+        duration_range = CRITICAL_POWER_DURATIONS[model]
+    min_duration, max_duration = pd.to_timedelta(list(duration_range))
+
+    # only the durations in the range are kept to not evaluate the models on
+    # the other durations at each iteration
+    in_range = np.asarray((durations >= min_duration) &
+                          (durations <= max_duration))
+    time = durations[in_range].total_seconds().values
+    power = power[:, in_range]
+    mask = ~np.isnan(power)
+    power = np.where(mask, power, 0.)
+
+    # the 2-parameter model gives the initial parameters of the other models
+    if model == 'linear-work':
+        cp, w_prime, n_samples = _masked_linear_fit(time, power * time, mask)
+    else:
+        w_prime, cp, n_samples = _masked_linear_fit(1. / time, power, mask)
+
+    if model in ('2-parameter', 'linear-work'):
+        n_params = 2
+        prediction = cp[:, np.newaxis] + w_prime[:, np.newaxis] / time
+        parameters = {'cp': cp, 'w_prime': w_prime}
+    else:
+        n_params = 3
+        model_func = (_morton_model if model == '3-parameter'
+                      else _ward_smith_model)
+        p_max = np.max(power, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tau = np.where(p_max > cp,
+                           np.clip(w_prime / (p_max - cp), 1., 1e3), 1.)
+        params = _levenberg_marquardt(
+            model_func, np.column_stack([cp, w_prime, np.log(tau)]), time,
+            power, mask, max_iter, tol)
+        prediction, _ = model_func(params, time)
+        cp, w_prime, tau = params[:, 0], params[:, 1], np.exp(params[:, 2])
+        parameters = {'cp': cp, 'w_prime': w_prime,
+                      'p_max': cp + w_prime / tau}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        parameters['rmse'] = np.sqrt(
+            np.sum(np.where(mask, power - prediction, 0.) ** 2, axis=1) /
+            n_samples)
+    columns = ['cp', 'w_prime'] + (['p_max'] if n_params == 3 else [])
+    parameters = pd.DataFrame(parameters, columns=columns + ['rmse'])
+    parameters[n_samples < n_params] = np.nan
+
+    if np.ndim(record_power_profile) == 1:
+        return parameters.iloc[0].rename(None)
+    if hasattr(record_power_profile, 'columns'):
+        parameters.index = record_power_profile.columns
+    return parameters
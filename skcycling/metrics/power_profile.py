@@ -9,8 +9,6 @@ from __future__ import division
 import pandas as pd
 import numpy as np
 
-from sklearn.linear_model import LinearRegression
-
 
 SAMPLING_WKO = pd.TimedeltaIndex(
     ['00:00:01', '00:00:05', '00:00:30', '00:01:00', '00:03:00',
@@ -41,6 +39,132 @@ def std_dev_squared_error(y_true, y_pred):
     return np.sqrt(np.sum((y_true - y_pred) ** 2 / (y_true.size - 2)))
 
 
+def _masked_linear_fit(x, y, mask):
+    """Fit a simple linear regression for several targets at once.
+
+    Parameters
+    ----------
+    x : ndarray, shape (n_samples,)
+        The data shared by all the regressions.
+
+    y : ndarray, shape (n_fits, n_samples)
+        The targets of the regressions.
+
+    mask : ndarray of bool, shape (n_fits, n_samples)
+        The samples to consider in each regression.
+
+    Returns
+    -------
+    slope : ndarray, shape (n_fits,)
+        The slope of each regression.
+
+    intercept : ndarray, shape (n_fits,)
+        The intercept of each regression.
+
+    n_samples : ndarray, shape (n_fits,)
+        The number of samples used in each regression.
+
+    """
+    weight = mask.astype(np.float64)
+    y = np.where(mask, y, 0.)
+    n_samples = weight.sum(axis=1)
+    # all the sufficient statistics are obtained with two matrix products
+    sum_x, sum_xx = weight.dot(np.vstack([x, x ** 2]).T).T
+    sum_y = y.sum(axis=1)
+    sum_xy = y.dot(x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = ((n_samples * sum_xy - sum_x * sum_y) /
+                 (n_samples * sum_xx - sum_x ** 2))
+        intercept = (sum_y - slope * sum_x) / n_samples
+    return slope, intercept, n_samples
+
+
+def _aerobic_meta_model_batch(record_power, max_duration, time_samples):
+    """Compute the aerobic metabolism model for several record power-profiles.
+
+    This is the vectorized counterpart of :func:`aerobic_meta_model` where all
+    the regressions are fitted at once. Profiles for which the model cannot be
+    computed will lead to NaN values.
+
+    Parameters
+    ----------
+    record_power : ndarray, shape (n_profiles, n_time_samples)
+        The record power-profiles taken at ``time_samples``. Missing values
+        should be set to NaN.
+
+    max_duration : ndarray of timedelta64, shape (n_profiles,)
+        The maximum duration available in each record power-profile.
+
+    time_samples : TimedeltaIndex, shape (n_time_samples,)
+        The time samples of the record power-profiles.
+
+    Returns
+    -------
+    mpa : ndarray, shape (n_profiles,)
+        Maximum Aerobic Power.
+
+    t_mpa : ndarray of timedelta64, shape (n_profiles,)
+        Time of the Maximum Aerobic Power.
+
+    aei : ndarray, shape (n_profiles,)
+        Aerobic Endurance Index.
+
+    """
+    record_power = np.asarray(record_power, dtype=np.float64)
+    time_values = np.asarray(time_samples.values)
+    log_time = np.log(time_values / np.timedelta64(1, 's'))
+    valid_samples = np.bitwise_and(
+        time_values[np.newaxis, :] < np.asarray(max_duration)[:, np.newaxis],
+        ~np.isnan(record_power))
+
+    # only samples between 10 minutes and 4 hours are considered for the
+    # regression
+    mask_samples_map = np.bitwise_and(
+        valid_samples,
+        np.bitwise_and(time_samples >= '00:10:00',
+                       time_samples <= '04:00:00'))
+    slope, intercept, n_samples = _masked_linear_fit(
+        log_time, record_power, mask_samples_map)
+    aerobic_model = (slope[:, np.newaxis] * log_time +
+                     intercept[:, np.newaxis])
+    squared_error = np.where(mask_samples_map,
+                             (record_power - aerobic_model) ** 2, 0.)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std_fit = np.sqrt(squared_error.sum(axis=1) / (n_samples - 2))
+
+    # mpa will be find between 3 minutes and 7 minutes: take the first value
+    # in the 2 * std confidence interval
+    mask_samples_mpa = np.bitwise_and(
+        valid_samples,
+        np.bitwise_and(time_samples >= '00:03:00',
+                       time_samples <= '00:10:00'))
+    with np.errstate(invalid='ignore'):
+        samples_within = np.bitwise_and(
+            mask_samples_mpa,
+            np.abs(record_power - aerobic_model) <
+            2 * std_fit[:, np.newaxis])
+    found_mpa = samples_within.any(axis=1)
+    index_mpa = samples_within.argmax(axis=1)
+    mpa = np.where(found_mpa,
+                   record_power[np.arange(record_power.shape[0]), index_mpa],
+                   np.nan)
+    t_mpa = np.where(found_mpa, time_values[index_mpa],
+                     np.timedelta64('NaT'))
+
+    # find aerobic endurance index
+    mask_samples_aei = np.bitwise_and(
+        np.bitwise_and(valid_samples, found_mpa[:, np.newaxis]),
+        np.bitwise_and(time_values[np.newaxis, :] >=
+                       time_values[index_mpa][:, np.newaxis],
+                       time_samples <= '04:00:00'))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        aei, _, _ = _masked_linear_fit(
+            log_time, record_power / mpa[:, np.newaxis] * 100,
+            mask_samples_aei)
+
+    return mpa, t_mpa, aei
+
+
 def aerobic_meta_model(record_power_profile, time_samples=None):
     """Compute the aerobic metabolism model from the record power-profile.
 
@@ -120,6 +244,8 @@ def aerobic_meta_model(record_power_profile, time_samples=None):
     extracted_time = np.log(extracted_time /
                             np.timedelta64(1, 's')).reshape(-1, 1)
 
+    # imported here to not import scikit-learn with skcycling.metrics
+    from sklearn.linear_model import LinearRegression
     ols = LinearRegression()
     ols.fit(extracted_time, extracted_profile)
     std_fit = std_dev_squared_error(extracted_profile,
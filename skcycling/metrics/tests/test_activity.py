@@ -8,6 +8,7 @@ import pytest
 
 import pandas as pd
 import numpy as np
+from numpy.testing import assert_allclose
 
 from skcycling.metrics import normalized_power_score
 from skcycling.metrics import intensity_factor_score
@@ -15,6 +16,9 @@ from skcycling.metrics import training_stress_score
 from skcycling.metrics import training_load_score
 from skcycling.metrics import mpa2ftp
 from skcycling.metrics import ftp2mpa
+from skcycling.metrics import w_prime_balance
+from skcycling.metrics import _w_prime_balance
+from skcycling.metrics import _w_prime_balance_numpy
 
 
 mpa = 400.
@@ -49,3 +53,84 @@ def test_scores(score_func, params, expected_score):
 
 def test_convert_mpa_ftp():
     assert mpa2ftp(ftp2mpa(ftp)) == pytest.approx(ftp)
+
+
+def _w_prime_balance_integral(power, cp, w_prime, tau):
+    # direct quadratic evaluation of the integral model of Skiba et al.
+    above = np.maximum(power - cp, 0)
+    time = np.arange(power.size)
+    return np.array([w_prime - np.sum(above[:t + 1] *
+                                      np.exp(-(t - time[:t + 1]) / tau))
+                     for t in time])
+
+
+def _make_intervals(n_samples=600, seed=0):
+    rng = np.random.RandomState(seed)
+    power = rng.randint(100, 450, size=n_samples).astype(np.float64)
+    power[rng.choice(n_samples, size=n_samples // 10)] = np.nan
+    return pd.Series(power, index=pd.date_range('1/1/2011',
+                                                periods=n_samples,
+                                                freq='1S'))
+
+
+def test_w_prime_balance_integral():
+    power = _make_intervals()
+    w_bal = w_prime_balance(power, cp=250., w_prime=20000., tau=400.)
+    assert isinstance(w_bal, pd.Series)
+    assert w_bal.index.equals(power.index)
+    assert_allclose(w_bal, _w_prime_balance_integral(
+        np.nan_to_num(power.values), 250., 20000., 400.))
+
+
+def test_w_prime_balance_differential():
+    power = pd.Series([350.] * 100 + [150.] * 100)
+    w_bal = w_prime_balance(power, cp=250., w_prime=20000.,
+                            method='differential')
+    assert_allclose(w_bal[:100], 20000. - 100. * np.arange(1, 101))
+    # the recovery is exponential at a rate (cp - power) / w_prime
+    assert_allclose(w_bal[100:], 20000. - 10000. * np.exp(
+        -100. * np.arange(1, 101) / 20000.))
+
+
+@pytest.mark.parametrize("method", ['integral', 'differential'])
+def test_w_prime_balance_riders(method):
+    power = _make_intervals()
+    cp, w_prime = [200., 250., 300.], [15000., 20000., 25000.]
+    w_bal = w_prime_balance(power, cp=cp, w_prime=w_prime, method=method,
+                            num_threads=2)
+    assert isinstance(w_bal, pd.DataFrame)
+    assert w_bal.shape == (power.size, 3)
+    for rider in range(3):
+        assert_allclose(w_bal[rider], w_prime_balance(
+            power, cp=cp[rider], w_prime=w_prime[rider], method=method))
+
+
+@pytest.mark.parametrize("method", ['integral', 'differential'])
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_w_prime_balance_kernels(method, dtype):
+    # long activity to check the rescaling of the differential model
+    power = _make_intervals(n_samples=20000).values.astype(dtype)
+    cp = np.array([150., 250., 400.])
+    w_prime = np.array([5000., 20000., 30000.])
+    tau = np.array([300., 500., 700.])
+    differential = method == 'differential'
+    assert_allclose(
+        _w_prime_balance_numpy._w_prime_balance(power, cp, w_prime, tau,
+                                                differential),
+        _w_prime_balance._w_prime_balance(power, cp, w_prime, tau,
+                                          differential),
+        rtol=1e-7, atol=1e-6)
+
+
+@pytest.mark.parametrize(
+    "params, err_msg",
+    [({'method': 'unknown'}, '"method" should be one of'),
+     ({'cp': 0.}, '"cp" and "w_prime" should be positive'),
+     ({'w_prime': [20000., -1.]}, '"cp" and "w_prime" should be positive'),
+     ({'tau': 0.}, '"tau" should be positive')]
+)
+def test_w_prime_balance_error(params, err_msg):
+    kwargs = {'cp': 250., 'w_prime': 20000.}
+    kwargs.update(params)
+    with pytest.raises(ValueError, match=err_msg):
+        w_prime_balance(ride, **kwargs)
@@ -0,0 +1,115 @@
+"""Test the critical power models."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose
+
+from skcycling.metrics import critical_power_model
+from skcycling.metrics.critical_power import _morton_model
+from skcycling.metrics.critical_power import _ward_smith_model
+
+DURATIONS = pd.timedelta_range('00:00:01', '00:30:00', freq='1S')
+TIME = DURATIONS.total_seconds().values
+CP = np.array([250., 300., 180.])
+W_PRIME = np.array([20000., 15000., 25000.])
+P_MAX = np.array([1000., 1200., 800.])
+
+
+def _record_power(model):
+    if model in ('2-parameter', 'linear-work'):
+        power = CP[:, np.newaxis] + W_PRIME[:, np.newaxis] / TIME
+    else:
+        model_func = (_morton_model if model == '3-parameter'
+                      else _ward_smith_model)
+        params = np.column_stack([CP, W_PRIME,
+                                  np.log(W_PRIME / (P_MAX - CP))])
+        power, _ = model_func(params, TIME)
+    return pd.DataFrame(power.T, index=DURATIONS,
+                        columns=['rider-1', 'rider-2', 'rider-3'])
+
+
+@pytest.mark.parametrize(
+    "model", ['2-parameter', 'linear-work', '3-parameter', 'ward-smith'])
+def test_critical_power_model(model):
+    record_power = _record_power(model)
+    # missing durations and profiles too short to be fitted are handled
+    record_power.iloc[::7, 0] = np.nan
+    record_power['rider-4'] = np.nan
+    parameters = critical_power_model(record_power, model)
+    assert isinstance(parameters, pd.DataFrame)
+    assert list(parameters.index) == list(record_power.columns)
+    assert_allclose(parameters['cp'][:3], CP)
+    assert_allclose(parameters['w_prime'][:3], W_PRIME)
+    if model in ('3-parameter', 'ward-smith'):
+        assert_allclose(parameters['p_max'][:3], P_MAX)
+    else:
+        assert 'p_max' not in parameters
+    assert_allclose(parameters['rmse'][:3], 0, atol=1e-6)
+    assert parameters.loc['rider-4'].isnull().all()
+
+
+@pytest.mark.parametrize(
+    "model", ['2-parameter', 'linear-work', '3-parameter', 'ward-smith'])
+def test_critical_power_model_single_profile(model):
+    record_power = _record_power(model)
+    parameters = critical_power_model(record_power['rider-2'], model)
+    assert isinstance(parameters, pd.Series)
+    assert parameters['cp'] == pytest.approx(CP[1])
+    # arrays are accepted with the durations
+    assert_allclose(critical_power_model(record_power.values, model,
+                                         durations=DURATIONS).iloc[1],
+                    parameters, atol=1e-6)
+
+
+@pytest.mark.parametrize("model", ['3-parameter', 'ward-smith'])
+def test_critical_power_model_curve_fit(model):
+    # the batched fit should match a least-squares fit of each profile
+    from scipy.optimize import curve_fit
+
+    rng = np.random.RandomState(0)
+    record_power = _record_power(model)
+    record_power += rng.normal(scale=10., size=record_power.shape)
+    duration_range = ('00:00:01', '00:20:00')
+    parameters = critical_power_model(record_power, model,
+                                      duration_range=duration_range)
+    model_func = (_morton_model if model == '3-parameter'
+                  else _ward_smith_model)
+
+    def func(time, cp, w_prime, log_tau):
+        return model_func(np.array([[cp, w_prime, log_tau]]), time)[0][0]
+
+    mask = DURATIONS <= '00:20:00'
+    for rider, rider_power in record_power.iteritems():
+        expected, _ = curve_fit(func, TIME[mask], rider_power.values[mask],
+                                p0=[200., 20000., 3.])
+        assert_allclose(parameters.loc[rider, ['cp', 'w_prime']],
+                        expected[:2], rtol=1e-4)
+
+
+def test_critical_power_model_duration_range():
+    record_power = _record_power('3-parameter')
+    # the 2-parameter model over-estimates the critical power of a
+    # 3-parameter profile, less with longer durations
+    cp_short = critical_power_model(record_power)['cp']
+    cp_long = critical_power_model(
+        record_power, duration_range=('00:10:00', '00:30:00'))['cp']
+    assert np.all(cp_long < cp_short)
+    assert np.all(cp_long > CP)
+
+
+@pytest.mark.parametrize(
+    "params, err_msg",
+    [({'model': 'unknown'}, '"model" should be one of'),
+     ({'durations': DURATIONS[:10]}, 'should be of shape'),
+     ({'record_power_profile': np.ones((10, 2))}, '"durations" should be')]
+)
+def test_critical_power_model_error(params, err_msg):
+    kwargs = {'record_power_profile': _record_power('2-parameter')}
+    kwargs.update(params)
+    with pytest.raises(ValueError, match=err_msg):
+        critical_power_model(**kwargs)
@@ -6,11 +6,14 @@
 
 from os.path import dirname, join
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from skcycling import Rider
 from skcycling.metrics import aerobic_meta_model
+from skcycling.metrics.power_profile import SAMPLING_WKO
+from skcycling.metrics.power_profile import _aerobic_meta_model_batch
 
 module_path = dirname(__file__)
 filename_csv = join(module_path, 'data', 'rider_power_profile.csv')
@@ -36,3 +39,27 @@ def test_aerobic_meta_model(rpp, ts,
     assert mpa == pytest.approx(expected_mpa)
     assert time_mpa == expected_time_mpa
     assert aei == pytest.approx(expected_aei)
+
+
+@pytest.mark.parametrize(
+    "ts",
+    [None,
+     pd.timedelta_range('00:00:01', '04:00:00', freq='5S'),
+     pd.timedelta_range('00:00:01', '05:00:00', freq='5S')])
+def test_aerobic_meta_model_batch(ts):
+    rpp = rider.record_power_profile()['power']
+    mpa, time_mpa, aei, _, _ = aerobic_meta_model(rpp, ts)
+
+    ts = SAMPLING_WKO if ts is None else ts
+    record_power = np.vstack([rpp.reindex(ts).values] * 2)
+    max_duration = np.array([rpp.index.max()] * 2, dtype='timedelta64[ns]')
+    # the second profile is too short to find the MPA
+    max_duration[1] = np.timedelta64(60, 's')
+    mpa_batch, time_mpa_batch, aei_batch = _aerobic_meta_model_batch(
+        record_power, max_duration, ts)
+    assert mpa_batch[0] == pytest.approx(mpa)
+    assert pd.Timedelta(time_mpa_batch[0]) == time_mpa
+    assert aei_batch[0] == pytest.approx(aei)
+    assert np.isnan(mpa_batch[1])
+    assert np.isnat(time_mpa_batch[1])
+    assert np.isnan(aei_batch[1])
@@ -6,6 +6,17 @@ The :mod:`skcycling.model` module includes algorithms to model cycling data.
 #          Cedric Lemaitre
 # License: BSD 3 clause
 
-from .power import strava_power_model
+from .._lazy import attach
 
-__all__ = ['strava_power_model']
+__all__ = ['estimate_resistance_coefficients',
+           'simulate_course',
+           'strava_power_model',
+           'strava_power_model_batch',
+           'strava_power_model_error']
+
+__getattr__, __dir__ = attach(
+    __name__,
+    submod_attrs={'power': ['estimate_resistance_coefficients',
+                            'strava_power_model', 'strava_power_model_batch',
+                            'strava_power_model_error'],
+                  'simulation': ['simulate_course']})
@@ -7,11 +7,185 @@
 from __future__ import division
 
 import numpy as np
+import six
 from scipy import constants
 
+from ..exceptions import MissingDataError
 from ..extraction import gradient_elevation
 from ..extraction import acceleration
 
+# maximum number of elements evaluated at once by the batched model
+BATCH_SIZE = 2 ** 22
+
+ESTIMATION_METHODS = ('power', 'virtual-elevation')
+
+# International Standard Atmosphere at sea level
+TEMPERATURE_SEA_LEVEL = 288.15  # K
+TEMPERATURE_LAPSE_RATE = 0.0065  # K.m^-1
+MOLAR_MASS_DRY_AIR = 28.97 / 1000  # kg.mol^-1
+
+
+def _air_density(pressure, temperature):
+    """Compute the air density in kg.m^-3.
+
+    Parameters
+    ----------
+    pressure : float or ndarray
+        Pressure in Pascal.
+
+    temperature : float or ndarray
+        Temperature in Celsius.
+
+    Returns
+    -------
+    air_density : float or ndarray
+        The air density.
+
+    """
+    temperature_kelvin = constants.convert_temperature(
+        temperature, 'Celsius', 'Kelvin')
+
+    # air density at 0 degree Celsius and a standard atmosphere
+    standard_atmosphere = constants.physical_constants[
+        'standard atmosphere'][0]  # Pa
+    zero_celsius_kelvin = constants.convert_temperature(
+        0, 'Celsius', 'Kelvin')  # 273.15 K
+    air_density_ref = (
+        (standard_atmosphere * MOLAR_MASS_DRY_AIR) /
+        (constants.gas_constant * zero_celsius_kelvin))  # kg.m^-3
+    return air_density_ref * (
+        (pressure * zero_celsius_kelvin) /
+        (standard_atmosphere * temperature_kelvin))  # kg.m^-3
+
+
+def _barometric_pressure(elevation):
+    """Compute the pressure in Pascal from the elevation in meters.
+
+    The pressure is given by the barometric formula of the International
+    Standard Atmosphere.
+
+    Parameters
+    ----------
+    elevation : float or ndarray
+        Elevation in meters.
+
+    Returns
+    -------
+    pressure : float or ndarray
+        The pressure in Pascal.
+
+    """
+    standard_atmosphere = constants.physical_constants[
+        'standard atmosphere'][0]  # Pa
+    exponent = ((constants.g * MOLAR_MASS_DRY_AIR) /
+                (constants.gas_constant * TEMPERATURE_LAPSE_RATE))
+    return standard_atmosphere * (
+        1 - TEMPERATURE_LAPSE_RATE * elevation /
+        TEMPERATURE_SEA_LEVEL) ** exponent
+
+
+def _check_sample_values(values, activity, name):
+    """Check that a parameter is a scalar or has a value per sample."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 0:
+        return float(values)
+    if values.shape != (activity.shape[0],):
+        raise ValueError('"{}" should be a scalar or an array with a value'
+                         ' for each sample of the activity. Got an array of'
+                         ' shape {} for an activity of {} samples.'
+                         .format(name, values.shape, activity.shape[0]))
+    return values
+
+
+def _activity_air_density(activity, pressure, temperature):
+    """Compute the air density for each sample of an activity.
+
+    Returns
+    -------
+    air_density : float or ndarray, shape (n_samples,)
+        The air density in kg.m^-3. A scalar is returned when the pressure
+        and the temperature are scalars.
+
+    """
+    if isinstance(pressure, six.string_types):
+        if pressure != 'elevation':
+            raise ValueError('"pressure" should be a float, an array, or'
+                             ' "elevation". Got {!r} instead.'
+                             .format(pressure))
+        if 'elevation' not in activity.columns:
+            raise MissingDataError('To derive the pressure from the'
+                                   ' elevation, elevation data are required.'
+                                   ' Got {} fields.'
+                                   .format(activity.columns))
+        pressure = _barometric_pressure(activity['elevation'].values)
+    pressure = _check_sample_values(pressure, activity, 'pressure')
+    temperature = _check_sample_values(temperature, activity, 'temperature')
+    return _air_density(pressure, temperature)
+
+
+def _power_features(activity, use_acceleration):
+    """Compute the speed-dependent terms of the power model.
+
+    The power of the model is a linear combination of these terms, each of
+    them being weighted by a coefficient depending only on the parameters of
+    the model.
+
+    Returns
+    -------
+    features : ndarray, shape (n_features, n_samples)
+        The speed, the cubic speed, the speed projected on the slope and,
+        if required, the acceleration term.
+
+    """
+    if 'gradient-elevation' in activity.columns:
+        slope = activity['gradient-elevation'].values
+    else:
+        slope = gradient_elevation(activity, append=False).values
+    if use_acceleration:
+        if 'acceleration' in activity.columns:
+            acc = activity['acceleration'].values
+        else:
+            acc = acceleration(activity, append=False).values
+    speed = activity['speed'].values
+
+    features = [speed, speed ** 3, np.sin(np.arctan(slope)) * speed]
+    if use_acceleration:
+        features.append(acc * (speed * (1 + acc)) / 2)
+    return np.vstack(features)
+
+
+def _power_coefficients(cyclist_weight, bike_weight, coef_roll_res, pressure,
+                        temperature, coef_drag, surface_rider,
+                        use_acceleration):
+    """Compute the coefficients weighting the terms of the power model.
+
+    All the parameters are broadcast together.
+
+    Returns
+    -------
+    coefficients : ndarray, shape (n_params, n_features)
+        The coefficients of each parameter set.
+
+    """
+    params = np.broadcast_arrays(
+        *[np.atleast_1d(np.asarray(p, dtype=np.float64))
+          for p in (cyclist_weight, bike_weight, coef_roll_res, pressure,
+                    temperature, coef_drag, surface_rider)])
+    if params[0].ndim != 1:
+        raise ValueError('The parameters should be scalars or 1-D arrays.'
+                         ' Got {}-D arrays instead.'.format(params[0].ndim))
+    (cyclist_weight, bike_weight, coef_roll_res, pressure, temperature,
+     coef_drag, surface_rider) = params
+    total_weight = cyclist_weight + bike_weight  # kg
+
+    coefficients = [coef_roll_res * constants.g * total_weight,
+                    0.5 * _air_density(pressure, temperature) *
+                    surface_rider * coef_drag,
+                    total_weight * constants.g]
+    if use_acceleration:
+        coefficients.append(total_weight)
+    return np.vstack(coefficients).T
+
 
 def strava_power_model(activity, cyclist_weight, bike_weight=6.8,
                        coef_roll_res=0.0045, pressure=101325.0,
@@ -38,11 +212,15 @@ def strava_power_model(activity, cyclist_weight, bike_weight=6.8,
     coef_roll_res : float, default=0.0045
         Rolling resistance coefficient.
 
-    pressure : float, default=101325.0
-        Pressure in Pascal.
+    pressure : float, array-like of shape (n_samples,) or 'elevation', \
+default=101325.0
+        Pressure in Pascal. An array gives the pressure of each sample while
+        ``'elevation'`` derives the pressure of each sample from the
+        elevation of the activity using the barometric formula.
 
-    temperature : float, default=15.0
-        Temperature in Celsius.
+    temperature : float or array-like of shape (n_samples,), default=15.0
+        Temperature in Celsius. An array (e.g. the ``'temperature'`` column of
+        the activity) gives the temperature of each sample.
 
     coef_drag : float, default=1
         The drag coefficient also known as Cx.
@@ -88,43 +266,363 @@ def strava_power_model(activity, cyclist_weight, bike_weight=6.8,
     Freq: S, dtype: float64
 
     """
-    if 'gradient-elevation' not in activity.columns:
-        activity = gradient_elevation(activity)
-    if use_acceleration and 'acceleration' not in activity.columns:
-        activity = acceleration(activity)
+    if 'gradient-elevation' in activity.columns:
+        slope = activity['gradient-elevation']  # grade
+    else:
+        slope = gradient_elevation(activity, append=False)
+    if use_acceleration:
+        if 'acceleration' in activity.columns:
+            acc = activity['acceleration']  # m.s^-2
+        else:
+            acc = acceleration(activity, append=False)
 
-    temperature_kelvin = constants.convert_temperature(
-        temperature, 'Celsius', 'Kelvin')
     total_weight = cyclist_weight + bike_weight  # kg
 
     speed = activity['speed']  # m.s^-1
     power_roll_res = coef_roll_res * constants.g * total_weight * speed
 
-    # air density at 0 degree Celsius and a standard atmosphere
-    molar_mass_dry_air = 28.97 / 1000  # kg.mol^-1
-    standard_atmosphere = constants.physical_constants[
-        'standard atmosphere'][0]  # Pa
-    zero_celsius_kelvin = constants.convert_temperature(
-        0, 'Celsius', 'Kelvin')  # 273.15 K
-    air_density_ref = (
-        (standard_atmosphere * molar_mass_dry_air) /
-        (constants.gas_constant * zero_celsius_kelvin))  # kg.m^-3
-    air_density = air_density_ref * (
-        (pressure * zero_celsius_kelvin) /
-        (standard_atmosphere * temperature_kelvin))  # kg.m^-3
+    air_density = _activity_air_density(
+        activity, pressure, temperature)  # kg.m^-3
     power_wind = 0.5 * air_density * surface_rider * coef_drag * speed**3
 
-    slope = activity['gradient-elevation']  # grade
     power_gravity = (total_weight * constants.g *
                      np.sin(np.arctan(slope)) * speed)
 
     power_total = power_roll_res + power_wind + power_gravity
 
     if use_acceleration:
-        acc = activity['acceleration']  # m.s^-1
         power_acceleration = total_weight * acc
         # multiply by the average speed between t and t-1
         power_acceleration = power_acceleration * (speed * (1 + acc)) / 2
         power_total = power_total + power_acceleration
 
     return power_total.clip(0)
+
+
+def strava_power_model_batch(activity, cyclist_weight, bike_weight=6.8,
+                             coef_roll_res=0.0045, pressure=101325.0,
+                             temperature=15.0, coef_drag=1,
+                             surface_rider=0.32, use_acceleration=False):
+    """Strava model evaluated for several sets of parameters at once.
+
+    The parameters are broadcast together and each resulting parameter set is
+    evaluated as in :func:`strava_power_model`. The terms depending on the
+    speed and the slope are computed once and combined with the coefficients
+    of all parameter sets with a single matrix product.
+
+    Read more in the :ref:`User Guide <strava>`.
+
+    Parameters
+    ----------
+    activity : DataFrame
+        The activity containing the ride information.
+
+    cyclist_weight : float or ndarray, shape (n_params,)
+        The cyclist weight in kg.
+
+    bike_weight : float or ndarray, shape (n_params,), default=6.8
+        The bike weight in kg.
+
+    coef_roll_res : float or ndarray, shape (n_params,), default=0.0045
+        Rolling resistance coefficient.
+
+    pressure : float or ndarray, shape (n_params,), default=101325.0
+        Pressure in Pascal.
+
+    temperature : float or ndarray, shape (n_params,), default=15.0
+        Temperature in Celsius.
+
+    coef_drag : float or ndarray, shape (n_params,), default=1
+        The drag coefficient also known as Cx.
+
+    surface_rider : float or ndarray, shape (n_params,), default=0.32
+        Surface area of the rider facing wind also known as S. The unit is m^2.
+
+    use_acceleration : bool, default=False
+        Either to add the power required to accelerate.
+
+    Returns
+    -------
+    power : ndarray, shape (n_params, n_samples)
+        The power estimated for each set of parameters.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.io import bikeread
+    >>> from skcycling.model import strava_power_model_batch
+    >>> ride = bikeread(load_fit()[0])
+    >>> power = strava_power_model_batch(
+    ...     ride, cyclist_weight=np.linspace(60, 80, num=21),
+    ...     coef_roll_res=0.0045)
+    >>> power.shape
+    (21, 2257)
+
+    """
+    features = _power_features(activity, use_acceleration)
+    coefficients = _power_coefficients(
+        cyclist_weight, bike_weight, coef_roll_res, pressure, temperature,
+        coef_drag, surface_rider, use_acceleration)
+    power = coefficients.dot(features)
+    with np.errstate(invalid='ignore'):
+        return np.maximum(power, 0, out=power)
+
+
+def strava_power_model_error(activity, cyclist_weight, bike_weight=6.8,
+                             coef_roll_res=0.0045, pressure=101325.0,
+                             temperature=15.0, coef_drag=1,
+                             surface_rider=0.32, use_acceleration=False):
+    """Error of the Strava model for several sets of parameters.
+
+    Compute the root mean squared error between the power measured during the
+    activity and the power estimated by :func:`strava_power_model` for each
+    set of parameters. The parameters are broadcast together and evaluated by
+    chunks such that the memory usage stays bounded.
+
+    Read more in the :ref:`User Guide <strava>`.
+
+    Parameters
+    ----------
+    activity : DataFrame
+        The activity containing the ride information and the measured power
+        in a ``'power'`` column.
+
+    cyclist_weight : float or ndarray, shape (n_params,)
+        The cyclist weight in kg.
+
+    bike_weight : float or ndarray, shape (n_params,), default=6.8
+        The bike weight in kg.
+
+    coef_roll_res : float or ndarray, shape (n_params,), default=0.0045
+        Rolling resistance coefficient.
+
+    pressure : float or ndarray, shape (n_params,), default=101325.0
+        Pressure in Pascal.
+
+    temperature : float or ndarray, shape (n_params,), default=15.0
+        Temperature in Celsius.
+
+    coef_drag : float or ndarray, shape (n_params,), default=1
+        The drag coefficient also known as Cx.
+
+    surface_rider : float or ndarray, shape (n_params,), default=0.32
+        Surface area of the rider facing wind also known as S. The unit is m^2.
+
+    use_acceleration : bool, default=False
+        Either to add the power required to accelerate.
+
+    Returns
+    -------
+    error : ndarray, shape (n_params,)
+        The root mean squared error for each set of parameters. The samples
+        for which the power cannot be estimated or was not measured are
+        ignored.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.io import bikeread
+    >>> from skcycling.model import strava_power_model_error
+    >>> ride = bikeread(load_fit()[0])
+    >>> cyclist_weight = np.linspace(60, 80, num=21)
+    >>> error = strava_power_model_error(ride, cyclist_weight=cyclist_weight)
+    >>> best_weight = cyclist_weight[np.argmin(error)]
+
+    """
+    if 'power' not in activity.columns:
+        raise MissingDataError('To compute the error of the model, power data'
+                               ' are required. Got {} fields.'
+                               .format(activity.columns))
+
+    features = _power_features(activity, use_acceleration)
+    coefficients = _power_coefficients(
+        cyclist_weight, bike_weight, coef_roll_res, pressure, temperature,
+        coef_drag, surface_rider, use_acceleration)
+    activity_power = activity['power'].values
+    mask_samples = np.bitwise_and(np.isfinite(activity_power),
+                                  np.isfinite(features).all(axis=0))
+    features = features[:, mask_samples]
+    activity_power = activity_power[mask_samples]
+
+    error = np.empty(coefficients.shape[0])
+    batch_size = max(1, BATCH_SIZE // max(1, features.shape[1]))
+    for start in range(0, coefficients.shape[0], batch_size):
+        power = coefficients[start:start + batch_size].dot(features)
+        np.maximum(power, 0, out=power)
+        power -= activity_power
+        power **= 2
+        error[start:start + batch_size] = np.sqrt(power.mean(axis=1))
+    return error
+
+
+def _resistance_coefficients_power(activity, total_weight, air_density,
+                                   use_acceleration):
+    """Fit the coefficients by regressing the measured power."""
+    features = _power_features(activity, use_acceleration)
+    activity_power = activity['power'].values
+    # the power is not informative when the cyclist is not pedaling
+    with np.errstate(invalid='ignore'):
+        mask_samples = np.bitwise_and(np.isfinite(features).all(axis=0),
+                                      activity_power > 0)
+    mask_samples &= np.isfinite(air_density)
+    features = features[:, mask_samples]
+    air_density = air_density[mask_samples]
+
+    target = (activity_power[mask_samples] -
+              total_weight * constants.g * features[2])
+    if use_acceleration:
+        target -= total_weight * features[3]
+    design = np.vstack([constants.g * total_weight * features[0],
+                        0.5 * air_density * features[1]]).T
+    return np.linalg.lstsq(design, target, rcond=None)[0]
+
+
+def _resistance_coefficients_virtual_elevation(activity, total_weight,
+                                               air_density):
+    """Fit the coefficients by matching the virtual and measured elevation."""
+    if not {'elevation', 'power'}.issubset(activity.columns):
+        raise MissingDataError('To estimate the coefficients with the virtual'
+                               ' elevation, elevation and power data are'
+                               ' required. Got {} fields.'
+                               .format(activity.columns))
+    data = activity[['speed', 'power', 'elevation']].values
+    mask_samples = np.bitwise_and(np.isfinite(data).all(axis=1),
+                                  np.isfinite(air_density))
+    speed, activity_power, elevation = data[mask_samples].T
+    air_density = air_density[mask_samples]
+
+    # the elevation of the virtual slope is a linear function of the
+    # coefficients. The samples are expected to be spaced by one second.
+    weight_force = total_weight * constants.g
+    elevation_energy = (np.cumsum(activity_power) / weight_force -
+                        (speed ** 2 - speed[0] ** 2) / (2 * constants.g))
+    elevation_roll_res = np.cumsum(speed)
+    elevation_wind = np.cumsum(0.5 * air_density * speed ** 3) / weight_force
+
+    target = elevation - elevation_energy
+    design = np.vstack([-elevation_roll_res, -elevation_wind,
+                        np.ones_like(speed)]).T
+    return np.linalg.lstsq(design, target, rcond=None)[0][:2]
+
+
+def _estimate_resistance_coefficients(activity, cyclist_weight, bike_weight,
+                                      pressure, temperature, method,
+                                      use_acceleration):
+    if 'power' not in activity.columns:
+        raise MissingDataError('To estimate the coefficients, power data are'
+                               ' required. Got {} fields.'
+                               .format(activity.columns))
+    total_weight = cyclist_weight + bike_weight
+    air_density = np.broadcast_to(
+        _activity_air_density(activity, pressure, temperature),
+        (activity.shape[0],))
+    if method == 'power':
+        return _resistance_coefficients_power(activity, total_weight,
+                                              air_density, use_acceleration)
+    return _resistance_coefficients_virtual_elevation(activity, total_weight,
+                                                      air_density)
+
+
+def estimate_resistance_coefficients(activity, cyclist_weight,
+                                     bike_weight=6.8, pressure=101325.0,
+                                     temperature=15.0, method='power',
+                                     use_acceleration=False, n_jobs=1):
+    """Estimate the rolling and aerodynamic resistance of a cyclist.
+
+    The rolling resistance coefficient and the drag area (i.e. the product of
+    the drag coefficient and the frontal surface) are estimated from a ride
+    with measured power, using the same forces as in
+    :func:`strava_power_model`. The model being linear in these coefficients,
+    they are obtained in closed form by least-squares.
+
+    Read more in the :ref:`User Guide <strava>`.
+
+    Parameters
+    ----------
+    activity : DataFrame or list of DataFrame
+        The activity containing the ride information with the measured power.
+        A list of activities can be given to fit each of them in parallel.
+
+    cyclist_weight : float or array-like, shape (n_activities,)
+        The cyclist weight in kg.
+
+    bike_weight : float or array-like, shape (n_activities,), default=6.8
+        The bike weight in kg.
+
+    pressure : float, array-like of shape (n_samples,) or 'elevation', \
+default=101325.0
+        Pressure in Pascal. An array gives the pressure of each sample while
+        ``'elevation'`` derives the pressure of each sample from the
+        elevation of the activity using the barometric formula.
+
+    temperature : float or array-like of shape (n_samples,), default=15.0
+        Temperature in Celsius. An array gives the temperature of each
+        sample.
+
+    method : str, {'power', 'virtual-elevation'}, default='power'
+        The objective to minimize:
+
+        * ``'power'``: the squared error between the measured and the
+          estimated power. The samples without any power are ignored.
+        * ``'virtual-elevation'``: the squared error between the measured
+          elevation and the virtual elevation reconstructed from the power
+          (Chung method). The elevation is used instead of its gradient which
+          is more robust to noise. The samples should be spaced by one
+          second.
+
+    use_acceleration : bool, default=False
+        Either to account for the power required to accelerate with the
+        ``'power'`` method. The ``'virtual-elevation'`` method always
+        accounts for the change of kinetic energy.
+
+    n_jobs : int, default=1
+        The number of workers to use when several activities are given.
+
+    Returns
+    -------
+    coef_roll_res : float or ndarray, shape (n_activities,)
+        Rolling resistance coefficient.
+
+    drag_area : float or ndarray, shape (n_activities,)
+        Drag area, i.e. the drag coefficient times the surface area of the
+        rider facing the wind, in m^2.
+
+    References
+    ----------
+    .. [1] Chung, R. "Estimating CdA with a power meter", 2012.
+
+    Examples
+    --------
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.io import bikeread
+    >>> from skcycling.model import estimate_resistance_coefficients
+    >>> ride = bikeread(load_fit()[0])
+    >>> coef_roll_res, drag_area = estimate_resistance_coefficients(
+    ...     ride, cyclist_weight=72, method='virtual-elevation')
+
+    """
+    if method not in ESTIMATION_METHODS:
+        raise ValueError('"method" should be one of {}. Got {!r} instead.'
+                         .format(ESTIMATION_METHODS, method))
+
+    if not isinstance(activity, list):
+        coef_roll_res, drag_area = _estimate_resistance_coefficients(
+            activity, cyclist_weight, bike_weight, pressure, temperature,
+            method, use_acceleration)
+        return coef_roll_res, drag_area
+
+    cyclist_weight, bike_weight = np.broadcast_arrays(
+        np.asarray(cyclist_weight, dtype=np.float64),
+        np.asarray(bike_weight, dtype=np.float64))
+    cyclist_weight = np.broadcast_to(cyclist_weight, (len(activity),))
+    bike_weight = np.broadcast_to(bike_weight, (len(activity),))
+    # imported here to not import joblib with skcycling.model
+    from joblib import Parallel, delayed
+    coefficients = Parallel(n_jobs=n_jobs)(
+        delayed(_estimate_resistance_coefficients)(
+            act, cw, bw, pressure, temperature, method, use_acceleration)
+        for act, cw, bw in zip(activity, cyclist_weight, bike_weight))
+    coef_roll_res, drag_area = np.array(coefficients).T
+    return coef_roll_res, drag_area
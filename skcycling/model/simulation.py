@@ -0,0 +1,162 @@
+"""Module to simulate a ride from a power plan."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+from __future__ import division
+
+import numpy as np
+import pandas as pd
+
+from .power import _power_coefficients
+
+
+def _steady_state_speed(coef_cubic, coef_linear, power):
+    """Solve ``coef_cubic * v ** 3 + coef_linear * v = power`` for ``v``.
+
+    All the arguments are broadcast together. The cubic coefficient should be
+    positive and the power non-negative such that there is a single positive
+    root which is the largest real root of the equation.
+
+    Returns
+    -------
+    speed : ndarray
+        The positive root of the cubic equation.
+
+    """
+    # depressed cubic: v ** 3 + p * v + q = 0
+    # p depends only on the segments while q is computed for all the plans
+    p = np.asarray(coef_linear / coef_cubic)
+    half_q = power / (-2 * coef_cubic)
+    discriminant = half_q ** 2 + (p / 3) ** 3
+
+    # single real root: Cardano formula. The roots are computed for all the
+    # samples and the samples with three real roots are corrected afterwards.
+    with np.errstate(invalid='ignore'):
+        sqrt_discriminant = np.sqrt(discriminant)
+    speed = np.cbrt(sqrt_discriminant - half_q)
+    sqrt_discriminant += half_q
+    speed -= np.cbrt(sqrt_discriminant, out=sqrt_discriminant)
+
+    # three real roots (steep descent with a low power): trigonometric
+    # solution of the largest root
+    mask = discriminant < 0
+    if np.any(mask):
+        p, half_q = np.broadcast_arrays(p, half_q)
+        p, half_q = p[mask], half_q[mask]
+        amplitude = np.sqrt(-p / 3)
+        speed[mask] = 2 * amplitude * np.cos(
+            np.arccos(np.clip(-half_q / amplitude ** 3, -1, 1)) / 3)
+    return np.maximum(speed, 0, out=speed)
+
+
+def simulate_course(course, power, cyclist_weight, bike_weight=6.8,
+                    coef_roll_res=0.0045, pressure=101325.0,
+                    temperature=15.0, coef_drag=1, surface_rider=0.32):
+    """Simulate the speed and the time to ride a course given a power plan.
+
+    The course is split into segments between consecutive points of the
+    elevation profile. On each segment, the cyclist is assumed to ride at the
+    steady-state speed at which the power of :func:`strava_power_model`
+    (without acceleration) equals the planned power. The cubic equation is
+    solved in closed form for all segments and all power plans at once.
+
+    Read more in the :ref:`User Guide <simulation>`.
+
+    Parameters
+    ----------
+    course : Series
+        The elevation profile of the course in meters, indexed by the
+        distance in meters. The distance should be strictly increasing.
+
+    power : float or ndarray, shape (n_segments,) or (n_plans, n_segments)
+        The power plan in watts, i.e. the power developed on each segment. A
+        2-D array corresponds to several power plans simulated at once.
+
+    cyclist_weight : float or ndarray, shape (n_plans,)
+        The cyclist weight in kg.
+
+    bike_weight : float or ndarray, shape (n_plans,), default=6.8
+        The bike weight in kg.
+
+    coef_roll_res : float or ndarray, shape (n_plans,), default=0.0045
+        Rolling resistance coefficient.
+
+    pressure : float or ndarray, shape (n_plans,), default=101325.0
+        Pressure in Pascal.
+
+    temperature : float or ndarray, shape (n_plans,), default=15.0
+        Temperature in Celsius.
+
+    coef_drag : float or ndarray, shape (n_plans,), default=1
+        The drag coefficient also known as Cx.
+
+    surface_rider : float or ndarray, shape (n_plans,), default=0.32
+        Surface area of the rider facing wind also known as S. The unit is m^2.
+
+    Returns
+    -------
+    speed : ndarray, shape (n_segments,) or (n_plans, n_segments)
+        The speed on each segment in m.s^-1.
+
+    elapsed_time : ndarray, shape (n_segments,) or (n_plans, n_segments)
+        The time in seconds elapsed at the end of each segment. The time to
+        ride the course is given by the last segment. A segment which cannot
+        be ridden (i.e. null speed) leads to an infinite time.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import pandas as pd
+    >>> from skcycling.model import simulate_course
+    >>> course = pd.Series([0., 50., 100., 100.],
+    ...                    index=[0., 1000., 2000., 3000.])
+    >>> power_plans = np.array([[250., 250., 250.],
+    ...                         [300., 250., 200.]])
+    >>> speed, elapsed_time = simulate_course(course, power_plans,
+    ...                                       cyclist_weight=70)
+    >>> speed.shape
+    (2, 3)
+    >>> best_plan = np.argmin(elapsed_time[:, -1])
+
+    """
+    if not isinstance(course, pd.Series):
+        raise TypeError('The course should be a pandas Series containing the'
+                        ' elevation and indexed by the distance. Got {}'
+                        ' instead.'.format(type(course)))
+    distance = np.asarray(course.index, dtype=np.float64)
+    elevation = course.values.astype(np.float64)
+    if distance.size < 2:
+        raise ValueError('The course should contain at least two points.'
+                         ' Got {} instead.'.format(distance.size))
+    if not (np.isfinite(distance).all() and np.isfinite(elevation).all()):
+        raise ValueError('The course should not contain missing values.')
+    segment_length = np.diff(distance)
+    if np.any(segment_length <= 0):
+        raise ValueError('The distance of the course should be strictly'
+                         ' increasing.')
+    slope = np.diff(elevation) / segment_length
+
+    power = np.asarray(power, dtype=np.float64)
+    if power.ndim > 2:
+        raise ValueError('The power plan should be at most a 2-D array. Got'
+                         ' a {}-D array instead.'.format(power.ndim))
+    coefficients = _power_coefficients(
+        cyclist_weight, bike_weight, coef_roll_res, pressure, temperature,
+        coef_drag, surface_rider, use_acceleration=False)
+    if coefficients.shape[0] == 1:
+        coef_roll_res, coef_wind, coef_gravity = coefficients[0]
+    else:
+        # one set of parameters per power plan
+        coef_roll_res, coef_wind, coef_gravity = \
+            coefficients.T[:, :, np.newaxis]
+
+    # the power required to ride at the speed v is:
+    # coef_wind * v ** 3 + coef_linear * v
+    coef_linear = coef_roll_res + coef_gravity * np.sin(np.arctan(slope))
+    speed = _steady_state_speed(coef_wind, coef_linear, np.maximum(power, 0))
+
+    with np.errstate(divide='ignore'):
+        elapsed_time = np.cumsum(segment_length / speed, axis=-1)
+    return speed, elapsed_time
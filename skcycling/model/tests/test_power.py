@@ -7,16 +7,22 @@
 import pytest
 
 import numpy as np
+from scipy import constants
 from numpy.testing import assert_array_less
 from numpy.testing import assert_allclose
 
 import pandas as pd
 from pandas.testing import assert_series_equal
 
+from skcycling.model import estimate_resistance_coefficients
 from skcycling.model import strava_power_model
+from skcycling.model import strava_power_model_batch
+from skcycling.model import strava_power_model_error
 from skcycling.extraction import gradient_elevation
 from skcycling.extraction import acceleration
 from skcycling.exceptions import MissingDataError
+from skcycling.model.power import _air_density
+from skcycling.model.power import _barometric_pressure
 
 
 speed = np.ones(100) * 5
@@ -50,6 +56,13 @@ def test_strava_power_model_auto_compute():
     assert_series_equal(power_auto, power_ele_acc)
 
 
+def test_strava_power_model_does_not_modify_activity():
+    activity_copy = activity.copy()
+    strava_power_model(activity_copy, cyclist_weight=70,
+                       use_acceleration=True)
+    assert activity_copy.columns.tolist() == activity.columns.tolist()
+
+
 def test_strava_power_model():
     # at constant speed the acceleration should not have any influence
     power_without_acc = strava_power_model(activity, cyclist_weight=78,
@@ -107,3 +120,148 @@ def test_strava_power_model():
                                                       cyclist_weight=70,
                                                       surface_rider=0.5)
     assert_array_less(power_initial, power_increase_surface_rider)
+
+
+def test_strava_power_model_air_density_per_sample():
+    temperature = np.linspace(5, 25, num=100)
+    power = strava_power_model(activity, cyclist_weight=70,
+                               temperature=temperature)
+    for idx in (10, 50, 90):
+        power_sample = strava_power_model(activity, cyclist_weight=70,
+                                          temperature=temperature[idx])
+        assert power.iloc[idx] == pytest.approx(power_sample.iloc[idx])
+
+    power = strava_power_model(activity, cyclist_weight=70,
+                               pressure='elevation')
+    expected_power = strava_power_model(
+        activity, cyclist_weight=70,
+        pressure=_barometric_pressure(activity['elevation'].values))
+    assert_series_equal(power, expected_power)
+    # the air is thinner in altitude
+    assert np.all(np.diff(_barometric_pressure(
+        activity['elevation'].values)) < 0)
+
+
+@pytest.mark.parametrize(
+    "pressure, temperature, err_type, err_msg",
+    [(np.ones(10), 15., ValueError, 'a value for each sample'),
+     (101325., np.ones((100, 2)), ValueError, 'a value for each sample'),
+     ('altitude', 15., ValueError, '"pressure" should be a float'),
+     ('elevation', 15., MissingDataError, 'elevation data are required')]
+)
+def test_strava_power_model_air_density_error(pressure, temperature,
+                                              err_type, err_msg):
+    activity_speed = activity.drop(columns='elevation').copy()
+    activity_speed['gradient-elevation'] = 0.
+    with pytest.raises(err_type, match=err_msg):
+        strava_power_model(activity_speed, cyclist_weight=70,
+                           pressure=pressure, temperature=temperature)
+
+
+@pytest.mark.parametrize("use_acceleration", [False, True])
+def test_strava_power_model_batch(use_acceleration):
+    activity_random = activity.copy()
+    activity_random['speed'] = np.random.RandomState(42).uniform(3, 12, 100)
+    cyclist_weight = np.array([60., 70., 80.])
+    coef_roll_res = np.array([0.003, 0.0045, 0.006])
+    temperature = np.array([5., 15., 25.])
+    power = strava_power_model_batch(
+        activity_random, cyclist_weight=cyclist_weight,
+        coef_roll_res=coef_roll_res, temperature=temperature,
+        coef_drag=0.8, use_acceleration=use_acceleration)
+    assert power.shape == (3, 100)
+
+    for params, power_params in zip(zip(cyclist_weight, coef_roll_res,
+                                        temperature), power):
+        expected_power = strava_power_model(
+            activity_random.copy(), cyclist_weight=params[0],
+            coef_roll_res=params[1], temperature=params[2], coef_drag=0.8,
+            use_acceleration=use_acceleration)
+        assert_allclose(power_params, expected_power)
+
+
+def test_strava_power_model_batch_error():
+    with pytest.raises(ValueError, match='scalars or 1-D arrays'):
+        strava_power_model_batch(activity, cyclist_weight=np.ones((2, 2)))
+
+
+def test_strava_power_model_error_cyclist_weight():
+    activity_power = activity.copy()
+    activity_power['power'] = strava_power_model(activity.copy(),
+                                                 cyclist_weight=70)
+    cyclist_weight = np.linspace(50, 90, num=41)
+    error = strava_power_model_error(activity_power,
+                                     cyclist_weight=cyclist_weight)
+    assert error.shape == (41,)
+    assert cyclist_weight[np.argmin(error)] == pytest.approx(70)
+    assert error.min() == pytest.approx(0)
+
+    with pytest.raises(MissingDataError):
+        strava_power_model_error(activity, cyclist_weight=cyclist_weight)
+
+
+def _make_climbing_activity(coef_roll_res, drag_area, total_weight,
+                            pressure=101325.0):
+    rng = np.random.RandomState(0)
+    n_samples = 3600
+    speed = 6 + np.cumsum(rng.normal(scale=0.1, size=n_samples))
+    speed = np.clip(speed, 3, 12)
+    distance = np.cumsum(speed)
+    elevation = 0.05 * distance + 5 * np.sin(distance / 500)
+    if pressure == 'elevation':
+        pressure = _barometric_pressure(1000 + elevation)
+    air_density = _air_density(pressure, 15.0)
+    kinetic_energy = 0.5 * total_weight * speed ** 2
+    power = (coef_roll_res * constants.g * total_weight * speed +
+             0.5 * air_density * drag_area * speed ** 3 +
+             np.ediff1d(elevation, to_begin=0) * total_weight * constants.g +
+             np.ediff1d(kinetic_energy, to_begin=0))
+    return pd.DataFrame({'speed': speed, 'distance': distance,
+                         'elevation': elevation, 'power': power})
+
+
+@pytest.mark.parametrize("method", ['power', 'virtual-elevation'])
+def test_estimate_resistance_coefficients(method):
+    coef_roll_res, drag_area = 0.005, 0.3
+    activity_climb = _make_climbing_activity(coef_roll_res, drag_area, 76.8)
+    if method == 'power':
+        # use the power computed by the Strava model as ground truth
+        activity_climb['power'] = strava_power_model(
+            activity_climb.copy(), cyclist_weight=70,
+            coef_roll_res=coef_roll_res, coef_drag=1.,
+            surface_rider=drag_area)
+    estimated = estimate_resistance_coefficients(
+        activity_climb, cyclist_weight=70, method=method)
+    assert estimated[0] == pytest.approx(coef_roll_res, rel=1e-6)
+    assert estimated[1] == pytest.approx(drag_area, rel=1e-6)
+
+    estimated = estimate_resistance_coefficients(
+        [activity_climb, activity_climb], cyclist_weight=[70, 70],
+        method=method)
+    assert_allclose(estimated[0], [coef_roll_res] * 2, rtol=1e-6)
+    assert_allclose(estimated[1], [drag_area] * 2, rtol=1e-6)
+
+
+@pytest.mark.parametrize("method", ['power', 'virtual-elevation'])
+def test_estimate_resistance_coefficients_air_density_per_sample(method):
+    coef_roll_res, drag_area = 0.005, 0.3
+    activity_climb = _make_climbing_activity(coef_roll_res, drag_area, 76.8,
+                                             pressure='elevation')
+    activity_climb['elevation'] += 1000
+    if method == 'power':
+        activity_climb['power'] = strava_power_model(
+            activity_climb.copy(), cyclist_weight=70,
+            coef_roll_res=coef_roll_res, coef_drag=1.,
+            surface_rider=drag_area, pressure='elevation')
+    estimated = estimate_resistance_coefficients(
+        activity_climb, cyclist_weight=70, pressure='elevation',
+        method=method)
+    assert estimated[0] == pytest.approx(coef_roll_res, rel=1e-6)
+    assert estimated[1] == pytest.approx(drag_area, rel=1e-6)
+
+
+def test_estimate_resistance_coefficients_error():
+    with pytest.raises(ValueError, match='"method" should be one of'):
+        estimate_resistance_coefficients(activity, 70, method='unknown')
+    with pytest.raises(MissingDataError):
+        estimate_resistance_coefficients(activity, 70)
@@ -0,0 +1,85 @@
+"""Test the simulation of a course from a power plan."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import pytest
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+import pandas as pd
+
+from skcycling.model import simulate_course
+from skcycling.model import strava_power_model_batch
+from skcycling.model.simulation import _steady_state_speed
+
+course = pd.Series([0., 50., 100., 100., 20.],
+                   index=[0., 1000., 2000., 3000., 4000.])
+
+
+def test_simulate_course_inverse_power_model():
+    power_plans = np.array([[250., 250., 250., 250.],
+                            [300., 250., 200., 0.]])
+    speed, elapsed_time = simulate_course(course, power_plans,
+                                          cyclist_weight=70)
+    assert speed.shape == elapsed_time.shape == (2, 4)
+
+    # the speed simulated should be the speed at which the Strava model gives
+    # back the power plan
+    slope = np.diff(course.values) / np.diff(course.index)
+    for plan, plan_speed in zip(power_plans, speed):
+        activity = pd.DataFrame({'speed': plan_speed,
+                                 'gradient-elevation': slope})
+        power = strava_power_model_batch(activity, cyclist_weight=70)
+        assert_allclose(power[0], plan, atol=1e-8)
+
+    assert_allclose(elapsed_time, np.cumsum(1000 / speed, axis=1))
+
+
+def test_simulate_course_parameters_per_plan():
+    cyclist_weight = np.array([60., 70., 80.])
+    speed, elapsed_time = simulate_course(course, 200.,
+                                          cyclist_weight=cyclist_weight)
+    assert speed.shape == (3, 4)
+    for weight, weight_speed in zip(cyclist_weight, speed):
+        speed_single, _ = simulate_course(course, 200.,
+                                          cyclist_weight=weight)
+        assert_allclose(weight_speed, speed_single)
+    # a heavier cyclist is slower in the climbs
+    assert np.all(np.diff(elapsed_time[:, 1]) > 0)
+
+
+@pytest.mark.parametrize(
+    "coef_linear, power",
+    [(30., 100.), (-50., 0.), (-50., 10.), (-5., 0.), (0., 100.)]
+)
+def test_steady_state_speed(coef_linear, power):
+    coef_cubic = 0.2
+    roots = np.roots([coef_cubic, 0, coef_linear, -power])
+    expected_speed = max(roots[np.isreal(roots)].real.max(), 0)
+    speed = _steady_state_speed(coef_cubic, np.array([coef_linear]),
+                                np.array([power]))
+    assert_allclose(speed, [expected_speed], atol=1e-8)
+
+
+def test_simulate_course_null_speed():
+    flat_course = pd.Series([0., 0.], index=[0., 100.])
+    speed, elapsed_time = simulate_course(flat_course, 0., cyclist_weight=70)
+    assert_allclose(speed, [0.])
+    assert np.isinf(elapsed_time[-1])
+
+
+@pytest.mark.parametrize(
+    "course, power, err_type, err_msg",
+    [(course.values, 200., TypeError, "pandas Series"),
+     (course.iloc[:1], 200., ValueError, "at least two points"),
+     (course.iloc[::-1], 200., ValueError, "strictly increasing"),
+     (pd.Series([0., np.nan], index=[0., 10.]), 200., ValueError,
+      "missing values"),
+     (course, np.ones((2, 2, 4)), ValueError, "at most a 2-D array")]
+)
+def test_simulate_course_errors(course, power, err_type, err_msg):
+    with pytest.raises(err_type, match=err_msg):
+        simulate_course(course, power, cyclist_weight=70)
@@ -8,18 +8,22 @@ def configuration(parent_package='', top_path=None):
 
     config.add_subpackage('__check_build')
 
+    config.add_extension('_openmp_helpers',
+                         sources=['_openmp_helpers.c'],
+                         extra_compile_args=["-fopenmp"],
+                         extra_link_args=["-fopenmp"])
+
     # pure python packages
     config.add_subpackage('datasets')
     config.add_subpackage('datasets/tests')
     config.add_subpackage('io')
     config.add_subpackage('io/tests')
-    config.add_subpackage('metrics')
-    config.add_subpackage('metrics/tests')
     config.add_subpackage('utils')
     config.add_subpackage('utils/tests')
 
     # packages that have their own setup.py -> cython files
     config.add_subpackage('extraction')
+    config.add_subpackage('metrics')
 
     return config
 
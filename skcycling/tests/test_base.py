@@ -6,12 +6,26 @@ import os
 import shutil
 from tempfile import mkdtemp
 
+import numpy as np
+import pandas as pd
 import pytest
+from numpy.testing import assert_allclose
 from pandas.testing import assert_frame_equal
+from pandas.testing import assert_series_equal
 
+from skcycling import set_backend
 from skcycling.base import Rider
 from skcycling.datasets import load_fit
 from skcycling.datasets import load_rider
+from skcycling.datasets import make_fit_archive
+from skcycling.extraction import activity_distance_profile
+from skcycling.extraction import activity_fatigue_profile
+from skcycling.io import bikeread
+from skcycling.metrics import aerobic_meta_model
+from skcycling.metrics import intensity_factor_score
+from skcycling.metrics import normalized_power_score
+from skcycling.metrics import training_load_score
+from skcycling.metrics import training_stress_score
 
 
 def test_rider_add_activities_update():
@@ -33,6 +47,23 @@ def test_rider_add_activities(rider, filename, expected_shape):
     assert rider.power_profile_.shape == expected_shape
 
 
+def test_rider_add_activities_n_jobs(tmpdir):
+    filenames = make_fit_archive(str(tmpdir), n_activities=4,
+                                 duration='10min', random_state=0)
+    rider = Rider(mpa=400)
+    rider.add_activities(filenames, compute_metrics=True)
+    rider_parallel = Rider(n_jobs=2, mpa=400, num_threads=1)
+    rider_parallel.add_activities(filenames, compute_metrics=True)
+    assert_frame_equal(rider_parallel.power_profile_, rider.power_profile_)
+    assert_frame_equal(rider_parallel.activity_metrics_,
+                       rider.activity_metrics_)
+
+    rider_parallel = Rider(n_jobs=2)
+    rider_parallel.add_activities(filenames)
+    assert_frame_equal(rider_parallel.power_profile_, rider.power_profile_)
+    assert rider_parallel.activity_metrics_ is None
+
+
 @pytest.mark.parametrize(
     "dates, time_comparison, expected_shape",
     [('07 May 2014', False, (33515, 2)),
@@ -81,3 +112,306 @@ def test_dump_load_rider():
         assert_frame_equal(rider.power_profile_, rider2.power_profile_)
     finally:
         shutil.rmtree(tmpdir)
+
+
+def test_dump_load_rider_metrics(tmpdir):
+    rider = Rider(mpa=400)
+    rider.add_activities(load_fit()[:1], compute_metrics=True)
+    csv_filename = str(tmpdir.join('rider.csv'))
+    csv_filename_metrics = str(tmpdir.join('rider_metrics.csv'))
+    rider.to_csv(csv_filename, filename_metrics=csv_filename_metrics)
+    rider2 = Rider.from_csv(csv_filename,
+                            filename_metrics=csv_filename_metrics)
+    assert_frame_equal(rider.power_profile_, rider2.power_profile_)
+    assert_frame_equal(rider.activity_metrics_, rider2.activity_metrics_)
+    rider3 = Rider.from_csv(csv_filename)
+    assert rider3.activity_metrics_ is None
+    with pytest.raises(ValueError, match='metrics of the activities are not'):
+        rider3.to_csv(csv_filename, filename_metrics=csv_filename_metrics)
+
+
+def test_rider_activity_metrics():
+    filename = load_fit()[0]
+    rider = Rider()
+    rider.add_activities(filename)
+    assert rider.activity_metrics_ is None
+
+    rider.delete_activities('07 May 2014')
+    rider.add_activities(filename, compute_metrics=True)
+    assert rider.activity_metrics_.shape == (1, 6)
+    assert rider.activity_metrics_['training-stress-score'].isnull().all()
+
+    rider = Rider(mpa=400)
+    rider.add_activities(filename, compute_metrics=True)
+    activity = bikeread(filename)
+    metrics = rider.activity_metrics_.iloc[0]
+    assert metrics['duration'] == activity.shape[0]
+    assert metrics['work'] == pytest.approx(activity['power'].sum() / 1000)
+    assert metrics['normalized-power'] == pytest.approx(
+        normalized_power_score(activity['power'], 400))
+    assert metrics['intensity-factor'] == pytest.approx(
+        intensity_factor_score(activity['power'], 400))
+    assert metrics['training-stress-score'] == pytest.approx(
+        training_stress_score(activity['power'], 400))
+    assert metrics['training-load-score'] == pytest.approx(
+        training_load_score(activity['power'], 400))
+
+    rider.delete_activities('07 May 2014')
+    assert rider.activity_metrics_.empty
+
+
+@pytest.mark.parametrize("window, step", [('42D', '7D'), ('90D', '1D')])
+def test_rider_aerobic_model_timeline(window, step):
+    rider = Rider.from_csv(load_rider())
+    timeline = rider.aerobic_model_timeline(window=window, step=step)
+    assert timeline.columns.tolist() == ['mpa', 't_mpa', 'aei']
+
+    window = pd.Timedelta(window)
+    for day, (mpa, t_mpa, aei) in timeline.iloc[::7].iterrows():
+        window_end = day + pd.Timedelta(days=1)
+        columns = rider.power_profile_.columns
+        mask_date = np.bitwise_and(columns >= window_end - window,
+                                   columns < window_end)
+        rider_window = Rider()
+        rider_window.power_profile_ = rider.power_profile_.loc[:, mask_date]
+        if not np.count_nonzero(mask_date):
+            assert pd.isnull(mpa)
+            continue
+        expected = aerobic_meta_model(
+            rider_window.record_power_profile()['power'])
+        assert mpa == pytest.approx(expected[0])
+        assert t_mpa == expected[1]
+        assert aei == pytest.approx(expected[2])
+
+
+@pytest.mark.parametrize("window, step", [('30D', '1D'), ('90D', None)])
+def test_rider_rolling_record_power_profile(window, step):
+    rider = Rider.from_csv(load_rider())
+    rrpp = rider.rolling_record_power_profile(window=window, step=step)
+    rider.num_threads = 2
+    assert_frame_equal(
+        rider.rolling_record_power_profile(window=window, step=step), rrpp)
+    assert rrpp.shape[0] == rider.power_profile_.shape[0]
+    if step is None:
+        assert rrpp.shape[1] == rider.power_profile_.shape[1]
+
+    window = pd.Timedelta(window)
+    for date in rrpp.columns[::10]:
+        window_end = (date + pd.Timedelta(1, unit='ns') if step is None
+                      else date + pd.Timedelta(days=1))
+        columns = rider.power_profile_.columns
+        mask_date = np.bitwise_and(columns >= window_end - window,
+                                   columns < window_end)
+        if not np.count_nonzero(mask_date):
+            assert rrpp[date].isnull().all()
+            continue
+        rider_window = Rider()
+        rider_window.power_profile_ = rider.power_profile_.loc[:, mask_date]
+        expected = rider_window.record_power_profile()
+        rpp = rrpp[date].unstack(level=0).iloc[:expected.shape[0]]
+        assert_frame_equal(rpp[expected.columns], expected,
+                           check_names=False)
+
+
+
+@pytest.mark.parametrize("backend", ['cython', 'numpy'])
+def test_rider_rolling_record_power_profile_ties(backend):
+    # the power of the activities is tied: the channels should come from the
+    # same activity than in the record power-profile, i.e. the first one
+    durations = pd.timedelta_range('00:00:01', periods=5, freq='s')
+    dates = pd.to_datetime(['2014-05-07 10:00', '2014-05-08 10:00'])
+    power = np.array([[300., 300.], [250., 260.], [200., 200.],
+                      [190., 185.], [180., 180.]])
+    cadence = np.array([[80., 90.]] * 5)
+    rider = Rider()
+    rider.power_profile_ = pd.concat(
+        {'cadence': pd.DataFrame(cadence, index=durations, columns=dates),
+         'power': pd.DataFrame(power, index=durations, columns=dates)})
+    expected = rider.record_power_profile(
+        range_dates=('2014-05-07', '2014-05-09'))
+    assert (expected['cadence'] == [80., 90., 80., 80., 80.]).all()
+
+    set_backend(backend)
+    try:
+        rrpp = rider.rolling_record_power_profile(window='3D', step='1D')
+    finally:
+        set_backend('auto')
+    rpp = rrpp[pd.Timestamp('2014-05-08')].unstack(level=0)
+    assert_frame_equal(rpp[expected.columns], expected, check_names=False)
+
+def test_rider_performance_management_chart():
+    rider = Rider(mpa=400)
+    rider.activity_metrics_ = pd.DataFrame(
+        {'training-stress-score': [50., 80., 30., 120.],
+         'training-load-score': [100., 150., 60., 200.]},
+        index=pd.to_datetime(['2014-05-07 10:00', '2014-05-07 18:00',
+                              '2014-05-10 09:00', '2014-05-20 09:00']))
+    chart = rider.performance_management_chart(end_date='2014-05-25')
+    assert chart.index[0] == pd.Timestamp('2014-05-07')
+    assert chart.index[-1] == pd.Timestamp('2014-05-25')
+
+    daily_load = (rider.activity_metrics_['training-stress-score']
+                  .resample('D').sum().reindex(chart.index, fill_value=0.))
+    ctl, atl, expected_chart = 0., 0., []
+    for load in daily_load:
+        tsb = ctl - atl
+        ctl = ctl + (load - ctl) / 42
+        atl = atl + (load - atl) / 7
+        expected_chart.append((ctl, atl, tsb))
+    assert_allclose(chart[['ctl', 'atl', 'tsb']].values, expected_chart)
+
+
+def test_rider_performance_management_chart_update():
+    rider = Rider(mpa=400)
+    rider.add_activities(load_fit()[0], compute_metrics=True)
+    rider.performance_management_chart()
+    rider.add_activities(load_fit()[1], compute_metrics=True)
+    chart = rider.performance_management_chart()
+
+    rider_all = Rider(mpa=400)
+    rider_all.add_activities(load_fit()[:2], compute_metrics=True)
+    assert_frame_equal(chart, rider_all.performance_management_chart())
+
+    rider.delete_activities('11 May 2014')
+    rider_all.delete_activities('11 May 2014')
+    assert_frame_equal(rider.performance_management_chart(),
+                       rider_all.performance_management_chart())
+    assert rider.performance_management_chart().shape == (1, 3)
+
+
+def test_rider_performance_management_chart_error():
+    rider = Rider.from_csv(load_rider())
+    with pytest.raises(ValueError, message='training load of the activities'):
+        rider.performance_management_chart()
+
+
+def test_rider_dtype(tmpdir):
+    filenames = make_fit_archive(str(tmpdir), n_activities=3,
+                                 duration='10min', random_state=0)
+    rider = Rider()
+    rider.add_activities(filenames)
+    rider_32 = Rider(dtype=np.float32)
+    rider_32.add_activities(filenames)
+    assert (rider_32.power_profile_.dtypes == np.float32).all()
+    assert (rider_32.power_profile_.values.nbytes ==
+            rider.power_profile_.values.nbytes // 2)
+    assert_allclose(rider_32.power_profile_.loc['power'],
+                    rider.power_profile_.loc['power'], rtol=1e-6)
+    assert_allclose(rider_32.record_power_profile()['power'],
+                    rider.record_power_profile()['power'], rtol=1e-6)
+    assert_allclose(
+        rider_32.rolling_record_power_profile(window='2D').loc['power'],
+        rider.rolling_record_power_profile(window='2D').loc['power'],
+        rtol=1e-6)
+
+    csv_filename = str(tmpdir.join('rider.csv'))
+    rider_32.to_csv(csv_filename)
+    rider_csv = Rider.from_csv(csv_filename, dtype=np.float32)
+    assert rider_csv.dtype == np.float32
+    assert (rider_csv.power_profile_.dtypes == np.float32).all()
+
+
+def test_rider_dtype_error():
+    rider = Rider(dtype=np.int64)
+    with pytest.raises(ValueError, match='"dtype" should be one of'):
+        rider.add_activities(load_fit()[0])
+
+
+def test_rider_distance_profile(tmpdir):
+    filenames = make_fit_archive(str(tmpdir), n_activities=3,
+                                 duration='10min', random_state=0)
+    rider = Rider()
+    rider.add_activities(filenames[:2], compute_distance_profile=True)
+    rider.add_activities(filenames[2:], compute_distance_profile=True)
+    assert rider.distance_profile_.shape[1] == 3
+    expected = pd.concat([activity_distance_profile(bikeread(f))
+                          for f in filenames], axis=1)
+    assert_frame_equal(rider.distance_profile_, expected)
+    assert_series_equal(rider.record_distance_profile(),
+                        expected.min(axis=1))
+
+    date = rider.distance_profile_.columns[0]
+    day = date.strftime('%Y-%m-%d')
+    assert_series_equal(rider.record_distance_profile((day, day)),
+                        expected.iloc[:, :1].min(axis=1))
+    rider.delete_activities(date.strftime('%d %B %Y'))
+    assert_frame_equal(rider.distance_profile_, expected.iloc[:, 1:])
+
+
+def test_rider_distance_profile_error():
+    rider = Rider()
+    rider.add_activities(load_fit()[0])
+    assert rider.distance_profile_ is None
+    with pytest.raises(ValueError, match='distance-profile'):
+        rider.record_distance_profile()
+
+
+def test_dump_load_rider_distance_profile(tmpdir):
+    rider = Rider()
+    rider.add_activities(load_fit()[:2], compute_distance_profile=True)
+    # the activities have different distances
+    assert rider.distance_profile_.isnull().any().any()
+    csv_filename = str(tmpdir.join('rider.csv'))
+    csv_filename_dp = str(tmpdir.join('rider_distance_profile.csv'))
+    rider.to_csv(csv_filename, filename_distance_profile=csv_filename_dp)
+    rider2 = Rider.from_csv(csv_filename,
+                            filename_distance_profile=csv_filename_dp)
+    assert_frame_equal(rider.distance_profile_, rider2.distance_profile_)
+    assert_series_equal(rider.record_distance_profile(),
+                        rider2.record_distance_profile())
+
+    rider3 = Rider.from_csv(csv_filename)
+    assert rider3.distance_profile_ is None
+    with pytest.raises(ValueError, match='distance-profile of the activities'):
+        rider3.to_csv(csv_filename, filename_distance_profile=csv_filename_dp)
+
+
+def test_rider_fatigue_profile(tmpdir):
+    filenames = make_fit_archive(str(tmpdir), n_activities=3,
+                                 duration='10min', random_state=0)
+    rider = Rider()
+    rider.add_activities(filenames[:2], compute_fatigue_profile=True)
+    rider.add_activities(filenames[2:], compute_fatigue_profile=True)
+    assert rider.fatigue_profile_.shape[1] == 3
+    activities_fp = [activity_fatigue_profile(bikeread(f))
+                     for f in filenames]
+    record = activities_fp[0]
+    for activity_fp in activities_fp[1:]:
+        record = record.combine(activity_fp, np.fmax)
+    assert_frame_equal(rider.record_fatigue_profile(), record,
+                       check_names=False)
+
+    date = rider.fatigue_profile_.columns[0]
+    day = date.strftime('%Y-%m-%d')
+    assert_frame_equal(rider.record_fatigue_profile((day, day)),
+                       activities_fp[0], check_names=False)
+    rider.delete_activities(date.strftime('%d %B %Y'))
+    assert rider.fatigue_profile_.columns.tolist() == (
+        rider.power_profile_.columns.tolist())
+
+
+def test_rider_fatigue_profile_error():
+    rider = Rider()
+    rider.add_activities(load_fit()[0])
+    assert rider.fatigue_profile_ is None
+    with pytest.raises(ValueError, match='fatigue profile'):
+        rider.record_fatigue_profile()
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_dump_load_rider_fatigue_profile(tmpdir, dtype):
+    rider = Rider(dtype=dtype)
+    rider.add_activities(load_fit()[:2], compute_fatigue_profile=True)
+    csv_filename = str(tmpdir.join('rider.csv'))
+    csv_filename_fp = str(tmpdir.join('rider_fatigue_profile.csv'))
+    rider.to_csv(csv_filename, filename_fatigue_profile=csv_filename_fp)
+    rider2 = Rider.from_csv(csv_filename, dtype=dtype,
+                            filename_fatigue_profile=csv_filename_fp)
+    assert_frame_equal(rider.fatigue_profile_, rider2.fatigue_profile_)
+    assert_frame_equal(rider.record_fatigue_profile(),
+                       rider2.record_fatigue_profile())
+
+    rider3 = Rider.from_csv(csv_filename)
+    assert rider3.fatigue_profile_ is None
+    with pytest.raises(ValueError, match='fatigue profile of the activities'):
+        rider3.to_csv(csv_filename, filename_fatigue_profile=csv_filename_fp)
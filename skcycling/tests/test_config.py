@@ -0,0 +1,179 @@
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import subprocess
+import sys
+
+import pytest
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from numpy.testing import assert_allclose
+
+import skcycling
+from skcycling import get_backend
+from skcycling import get_num_threads
+from skcycling import openmp_info
+from skcycling import set_backend
+from skcycling import set_num_threads
+from skcycling._config import _effective_num_threads
+from skcycling._openmp_helpers import _openmp_max_threads
+from skcycling.datasets import make_activity
+from skcycling.datasets import make_rider
+from skcycling.extraction import activity_power_profile
+
+
+@pytest.fixture
+def reset_num_threads():
+    yield
+    set_num_threads(None)
+
+
+@pytest.fixture
+def reset_backend():
+    yield
+    set_backend('auto')
+
+
+def test_set_num_threads(reset_num_threads):
+    assert get_num_threads() == _openmp_max_threads()
+    set_num_threads(3)
+    assert get_num_threads() == 3
+    assert openmp_info()['num_threads_set'] == 3
+    # the number given to a function takes precedence
+    assert _effective_num_threads(2) == 2
+    set_num_threads(None)
+    assert get_num_threads() == _openmp_max_threads()
+
+
+@pytest.mark.parametrize("num_threads", [0, -1, 1.5, 'auto'])
+def test_set_num_threads_error(num_threads):
+    with pytest.raises(ValueError, match="positive integer"):
+        set_num_threads(num_threads)
+    with pytest.raises(ValueError, match="positive integer"):
+        _effective_num_threads(num_threads)
+
+
+def test_num_threads_worker_process():
+    num_threads = Parallel(n_jobs=2)(
+        delayed(_effective_num_threads)(num_threads)
+        for num_threads in [None, 3])
+    assert num_threads == [1, 3]
+
+
+def test_openmp_info():
+    info = skcycling.openmp_info()
+    assert isinstance(info['openmp_enabled'], bool)
+    assert info['openmp_max_threads'] >= 1
+    assert info['num_threads'] >= 1
+
+
+@pytest.mark.parametrize("num_threads", [1, 2, 4])
+def test_activity_power_profile_num_threads(num_threads):
+    activity = make_activity(duration='10min', random_state=0)
+    expected = activity_power_profile(activity)
+    assert_allclose(activity_power_profile(activity, num_threads=num_threads),
+                    expected)
+    assert np.isfinite(expected).all()
+
+
+def test_set_backend(reset_backend):
+    assert get_backend() == 'cython'
+    set_backend('numpy')
+    assert get_backend() == 'numpy'
+    assert openmp_info()['backend'] == 'numpy'
+    set_backend('cython')
+    assert get_backend() == 'cython'
+
+
+def test_set_backend_error():
+    with pytest.raises(ValueError, match="should be one of"):
+        set_backend('fortran')
+
+
+def test_backend_power_profile(reset_backend):
+    activity = make_activity(duration='10min', random_state=0)
+    activity.iloc[100:110] = np.nan
+    expected = activity_power_profile(activity)
+    set_backend('numpy')
+    power_profile = activity_power_profile(activity)
+    assert_allclose(power_profile, expected)
+
+
+def test_backend_rider(reset_backend):
+    rider = make_rider(n_activities=5, duration='10min', random_state=0)
+    kwargs = {'window': '2D', 'step': '1D'}
+    expected = rider.rolling_record_power_profile(**kwargs)
+    set_backend('numpy')
+    pd.testing.assert_frame_equal(
+        rider.rolling_record_power_profile(**kwargs), expected)
+
+
+def test_backend_extension_not_available():
+    # make the compiled extensions fail to import in a fresh interpreter
+    code = """
+import sys
+import warnings
+for module in ['skcycling.__check_build._check_build',
+               'skcycling._openmp_helpers',
+               'skcycling.extraction._power_profile']:
+    sys.modules[module] = None
+with warnings.catch_warnings(record=True) as record:
+    warnings.simplefilter('always')
+    import skcycling
+assert any('built correctly' in str(w.message) for w in record), record
+assert skcycling.get_backend() == 'numpy'
+assert not skcycling.openmp_info()['openmp_enabled']
+try:
+    skcycling.set_backend('cython')
+except ImportError:
+    pass
+else:
+    raise AssertionError('ImportError not raised')
+from skcycling.datasets import make_activity
+from skcycling.extraction import activity_power_profile
+activity = make_activity(duration='5min', random_state=0)
+print(activity_power_profile(activity[['power']]).shape[0])
+"""
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.decode().strip() == '299'
+
+
+def test_backend_single_extension_not_available():
+    # only some compiled extensions fail to import: they fall back to NumPy
+    # with the "auto" backend while the other extensions are still used
+    code = """
+import sys
+for module in ['skcycling.metrics._w_prime_balance',
+               'skcycling.extraction._effort']:
+    sys.modules[module] = None
+import numpy as np
+import skcycling
+from skcycling._config import _get_kernels
+from skcycling.datasets import make_activity
+from skcycling.extraction import detect_efforts
+from skcycling.metrics import w_prime_balance
+assert skcycling.get_backend() == 'cython'
+assert _get_kernels().__name__ == 'skcycling.extraction._power_profile'
+assert (_get_kernels('extraction._effort').__name__ ==
+        'skcycling.extraction._effort_numpy')
+activity = make_activity(duration='30min', random_state=0)
+efforts = detect_efforts(activity, mpa=400)
+w_bal = w_prime_balance(activity['power'], cp=250, w_prime=20000)
+skcycling.set_backend('numpy')
+assert detect_efforts(activity, mpa=400).equals(efforts)
+assert np.allclose(w_prime_balance(activity['power'], cp=250,
+                                   w_prime=20000), w_bal)
+skcycling.set_backend('cython')
+try:
+    detect_efforts(activity, mpa=400)
+except ImportError as e:
+    assert 'extraction._effort' in str(e), e
+else:
+    raise AssertionError('ImportError not raised')
+print(efforts.shape[0])
+"""
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert int(output.decode().strip()) > 0
@@ -0,0 +1,52 @@
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ('fitparse', 'joblib', 'pandas', 'scipy.signal', 'sklearn')
+
+
+def _imported_modules(statement):
+    """Run an import statement in a fresh interpreter and return the heavy
+    modules imported."""
+    code = ('import sys; {}; print(",".join(m for m in {!r} '
+            'if m in sys.modules))'.format(statement, HEAVY_MODULES))
+    output = subprocess.check_output([sys.executable, '-c', code])
+    output = output.decode().strip()
+    return set(output.split(',')) if output else set()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 5),
+                    reason="lazy loading requires python 3.5 or above")
+@pytest.mark.parametrize(
+    "statement, allowed_modules",
+    [('import skcycling', set()),
+     ('import skcycling.datasets', set()),
+     ('from skcycling.datasets import load_fit', set()),
+     ('from skcycling.utils import validate_filenames', set()),
+     ('from skcycling.metrics import normalized_power_score', set()),
+     ('from skcycling.io import bikeread', {'pandas'}),
+     ('from skcycling.model import strava_power_model', {'pandas'}),
+     ('from skcycling import Rider', {'pandas'})]
+)
+def test_import_heavy_dependencies(statement, allowed_modules):
+    assert _imported_modules(statement) <= allowed_modules
+
+
+@pytest.mark.parametrize(
+    "package",
+    ['skcycling', 'skcycling.datasets', 'skcycling.extraction', 'skcycling.io',
+     'skcycling.metrics', 'skcycling.model', 'skcycling.utils']
+)
+def test_lazy_attributes(package):
+    module = importlib.import_module(package)
+    for name in module.__all__:
+        assert getattr(module, name) is not None
+        assert name in dir(module)
+    with pytest.raises(AttributeError, match='has no attribute'):
+        getattr(module, 'unknown_attribute')
@@ -6,7 +6,13 @@ The :mod:`skcycling.utils` module include utility functions.
 #          Cedric Lemaitre
 # License: BSD 3 clause
 
-from .validation import validate_filenames
+from .._lazy import attach
 
+__all__ = ['StageRecorder',
+           'check_dtype',
+           'validate_filenames']
 
-__all__ = ['validate_filenames']
+__getattr__, __dir__ = attach(
+    __name__,
+    submod_attrs={'instrumentation': ['StageRecorder'],
+                  'validation': ['check_dtype', 'validate_filenames']})
@@ -0,0 +1,202 @@
+"""Utilities to instrument the processing stages."""
+
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+from contextlib import contextmanager
+from timeit import default_timer
+
+import numpy as np
+
+STAGE_METRICS = ('calls', 'seconds', 'samples', 'bytes')
+
+# the recorders currently active. The stages are not timed when it is empty.
+_RECORDERS = []
+
+
+def _data_size(data):
+    """Compute the number of samples and the number of bytes of some data."""
+    if hasattr(data, 'memory_usage'):
+        # pandas DataFrame or Series
+        n_bytes = np.sum(data.memory_usage(index=True))
+    else:
+        n_bytes = np.asarray(data).nbytes
+    return len(data), int(n_bytes)
+
+
+class _Stage(object):
+    """Accumulate the size of the data produced by a stage."""
+
+    def __init__(self):
+        self.n_samples = 0
+        self.n_bytes = 0
+
+    def record(self, data):
+        n_samples, n_bytes = _data_size(data)
+        self.n_samples += n_samples
+        self.n_bytes += n_bytes
+
+
+class _NullStage(object):
+    """Stage used when the instrumentation is disabled."""
+
+    def record(self, data):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+@contextmanager
+def _stage(name):
+    """Time a processing stage and report it to the active recorders.
+
+    The context manager gives an object whose ``record`` method accounts the
+    samples and the bytes of the data produced by the stage. When no recorder
+    is active, nothing is timed and ``record`` does not compute anything.
+    """
+    if not _RECORDERS:
+        yield _NULL_STAGE
+        return
+    stage = _Stage()
+    start = default_timer()
+    try:
+        yield stage
+    finally:
+        elapsed = default_timer() - start
+        for recorder in list(_RECORDERS):
+            recorder._record_stage(name, elapsed, stage.n_samples,
+                                   stage.n_bytes)
+
+
+class StageRecorder(object):
+    """Record the wall time and the data processed by each stage.
+
+    The recorder is a context manager: the stages run within the ``with``
+    block are recorded. The stages instrumented are:
+
+    * ``'io.read_fit'``: decoding of a FIT file;
+    * ``'io.resample'``: resampling of an activity at 1 Hz;
+    * ``'extraction.power_profile'``: maximum mean power of an activity;
+    * ``'extraction.complementary_data'``: data associated with the maximum
+      mean power;
+    * ``'extraction.max_mean'``: maximum mean of several channels of an
+      activity;
+    * ``'extraction.best_efforts'``: best non-overlapping efforts of an
+      activity;
+    * ``'extraction.distance_profile'``: best times over distances of an
+      activity;
+    * ``'extraction.fatigue_profile'``: maximum mean power of an activity
+      after some amounts of work;
+    * ``'extraction.efforts'``: detection of the efforts of an activity;
+    * ``'rider.activity_metrics'``: summary metrics of an activity;
+    * ``'rider.concat'``: concatenation of the power-profiles of new
+      activities;
+    * ``'rider.join'``: join of the new power-profiles to the rider
+      power-profile;
+    * ``'rider.record_power_profile'``: record power-profile of a rider.
+
+    The stages run in other processes (e.g. with ``n_jobs > 1``) are not
+    recorded. When no recorder is active, the instrumentation has a negligible
+    cost.
+
+    Read more in the :ref:`User Guide <instrumentation>`.
+
+    Parameters
+    ----------
+    callback : callable or None, default=None
+        A function called at the end of each stage with the arguments
+        ``(stage, seconds, n_samples, n_bytes)``.
+
+    Attributes
+    ----------
+    stages_ : dict
+        For each stage, a dictionary containing the number of calls, the wall
+        time in seconds, the number of samples, and the number of bytes of the
+        data produced.
+
+    Examples
+    --------
+    >>> from skcycling import Rider
+    >>> from skcycling.datasets import load_fit
+    >>> from skcycling.utils import StageRecorder
+    >>> with StageRecorder() as recorder:
+    ...     rider = Rider()
+    ...     rider.add_activities(load_fit()[:2])
+    >>> recorder.stages_['io.read_fit']['calls']
+    2
+
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.stages_ = {}
+
+    def __enter__(self):
+        _RECORDERS.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _RECORDERS.remove(self)
+        return False
+
+    def _record_stage(self, name, seconds, n_samples, n_bytes):
+        if name not in self.stages_:
+            self.stages_[name] = dict.fromkeys(STAGE_METRICS, 0)
+        metrics = self.stages_[name]
+        metrics['calls'] += 1
+        metrics['seconds'] += seconds
+        metrics['samples'] += n_samples
+        metrics['bytes'] += n_bytes
+        if self.callback is not None:
+            self.callback(name, seconds, n_samples, n_bytes)
+
+    def reset(self):
+        """Forget the stages recorded so far.
+
+        Returns
+        -------
+        self
+        """
+        self.stages_ = {}
+        return self
+
+    def to_dict(self):
+        """Export the metrics of the stages.
+
+        Returns
+        -------
+        stages : dict
+            A copy of ``stages_``.
+        """
+        return {name: dict(metrics) for name, metrics in self.stages_.items()}
+
+    def to_prometheus(self, prefix='skcycling'):
+        """Export the metrics of the stages in the Prometheus text format.
+
+        Each metric is a counter labelled by the stage.
+
+        Parameters
+        ----------
+        prefix : str, default='skcycling'
+            The prefix of the metric names.
+
+        Returns
+        -------
+        text : str
+            The metrics in the Prometheus exposition format.
+        """
+        descriptions = {'calls': 'Number of calls of the stage.',
+                        'seconds': 'Wall time spent in the stage.',
+                        'samples': 'Number of samples produced by the stage.',
+                        'bytes': 'Number of bytes produced by the stage.'}
+        lines = []
+        for metric in STAGE_METRICS:
+            name = '{}_stage_{}_total'.format(prefix, metric)
+            lines.append('# HELP {} {}'.format(name, descriptions[metric]))
+            lines.append('# TYPE {} counter'.format(name))
+            for stage in sorted(self.stages_):
+                lines.append('{}{{stage="{}"}} {}'.format(
+                    name, stage, self.stages_[stage][metric]))
+        return '\n'.join(lines) + '\n'
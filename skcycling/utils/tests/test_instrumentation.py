@@ -0,0 +1,78 @@
+# Authors: Guillaume Lemaitre <g.lemaitre58@gmail.com>
+#          Cedric Lemaitre
+# License: BSD 3 clause
+
+import numpy as np
+import pandas as pd
+
+from skcycling import Rider
+from skcycling.datasets import make_fit_archive
+from skcycling.utils import StageRecorder
+from skcycling.utils.instrumentation import STAGE_METRICS
+from skcycling.utils.instrumentation import _RECORDERS
+from skcycling.utils.instrumentation import _stage
+
+
+def test_stage_recorder_rider(tmpdir):
+    filenames = make_fit_archive(str(tmpdir), n_activities=3,
+                                 duration='5min', random_state=0)
+    calls = []
+    with StageRecorder(callback=lambda *args: calls.append(args)) as recorder:
+        rider = Rider(mpa=400)
+        rider.add_activities(filenames[:2], compute_metrics=True)
+        rider.add_activities(filenames[2:], compute_metrics=True)
+        rider.record_power_profile()
+    assert not _RECORDERS
+
+    stages = recorder.to_dict()
+    assert sorted(stages) == sorted(['io.read_fit', 'io.resample',
+                                     'extraction.power_profile',
+                                     'extraction.complementary_data',
+                                     'rider.activity_metrics', 'rider.concat',
+                                     'rider.join',
+                                     'rider.record_power_profile'])
+    assert stages['io.read_fit']['calls'] == 3
+    assert stages['io.resample']['samples'] == 900
+    assert stages['rider.concat']['calls'] == 2
+    assert stages['rider.join']['calls'] == 1
+    assert all(metrics['seconds'] >= 0 and metrics['bytes'] > 0
+               for metrics in stages.values())
+    assert len(calls) == sum(metrics['calls'] for metrics in stages.values())
+
+    # the activities processed outside of the context are not recorded
+    rider.record_power_profile()
+    assert recorder.stages_['rider.record_power_profile']['calls'] == 1
+
+
+def test_stage_recorder_nested():
+    with StageRecorder() as outer:
+        with _stage('test') as stage:
+            stage.record(np.zeros(10))
+        with StageRecorder() as inner:
+            with _stage('test') as stage:
+                stage.record(pd.Series(np.zeros(5)))
+    assert outer.stages_['test']['calls'] == 2
+    assert outer.stages_['test']['samples'] == 15
+    assert inner.stages_['test']['calls'] == 1
+    assert inner.stages_['test']['samples'] == 5
+    assert inner.reset().stages_ == {}
+
+
+def test_stage_recorder_to_prometheus():
+    with StageRecorder() as recorder:
+        with _stage('io.read_fit') as stage:
+            stage.record(np.zeros(10))
+    text = recorder.to_prometheus(prefix='app')
+    lines = text.splitlines()
+    for metric in STAGE_METRICS:
+        assert '# TYPE app_stage_{}_total counter'.format(metric) in lines
+    assert 'app_stage_calls_total{stage="io.read_fit"} 1' in lines
+    assert 'app_stage_samples_total{stage="io.read_fit"} 10' in lines
+    assert 'app_stage_bytes_total{stage="io.read_fit"} 80' in lines
+    assert text.endswith('\n')
+
+
+def test_stage_disabled():
+    with _stage('test') as stage:
+        stage.record(None)
+    assert not _RECORDERS
@@ -6,7 +6,10 @@ from os.path import dirname, join
 
 import pytest
 
+import numpy as np
+
 from skcycling.datasets import load_fit
+from skcycling.utils import check_dtype
 from skcycling.utils import validate_filenames
 
 filenames = load_fit()
@@ -18,3 +21,17 @@ filenames = load_fit()
      (join(dirname(filenames[0]), '*.fit'), filenames)])
 def test_validate_filenames(filenames, expected_filenames):
     assert list(validate_filenames(filenames)) == expected_filenames
+
+
+@pytest.mark.parametrize(
+    "dtype, expected_dtype",
+    [(None, np.float64), (np.float64, np.float64), ('float32', np.float32),
+     (np.dtype(np.float32), np.float32)])
+def test_check_dtype(dtype, expected_dtype):
+    assert check_dtype(dtype) == expected_dtype
+
+
+@pytest.mark.parametrize("dtype", [np.uint16, np.int64, 'unknown', object])
+def test_check_dtype_error(dtype):
+    with pytest.raises(ValueError, match='"dtype" should be one of'):
+        check_dtype(dtype)
@@ -8,6 +8,12 @@ import glob
 import os
 from itertools import chain
 
+import numpy as np
+
+# the dtypes in which the data can be stored. The integer dtypes cannot
+# represent the missing values and the mean power.
+FLOATING_DTYPES = ('float32', 'float64')
+
 
 def validate_filenames(filenames):
     """Check the filenames and expand in the case of wildcard.
@@ -41,3 +47,36 @@ def validate_filenames(filenames):
                                     for f in filenames])
     else:
         return sorted(glob.glob(os.path.expanduser(filenames)))
+
+
+def check_dtype(dtype):
+    """Check the floating dtype used to store the data.
+
+    Parameters
+    ----------
+    dtype : dtype or None
+        The dtype to check. If None, ``np.float64`` is used.
+
+    Returns
+    -------
+    dtype : numpy.dtype
+        The checked dtype, either ``np.float32`` or ``np.float64``.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from skcycling.utils import check_dtype
+    >>> check_dtype(np.float32)
+    dtype('float32')
+
+    """
+    if dtype is None:
+        return np.dtype(np.float64)
+    try:
+        checked_dtype = np.dtype(dtype)
+    except TypeError:
+        checked_dtype = None
+    if checked_dtype is None or checked_dtype.name not in FLOATING_DTYPES:
+        raise ValueError('"dtype" should be one of {} or None. Got {!r}'
+                         ' instead.'.format(FLOATING_DTYPES, dtype))
+    return checked_dtype